@@ -0,0 +1,202 @@
+"""Cohort rollups over the feedback files and the student wellness dataset.
+
+Both sources are append-only CSV files. ``FileRollups`` remembers how far it
+has read each file (by device and inode, so a rotated feedback file keeps its
+position under its new name) and on ``refresh`` parses only the bytes added
+since, folding each new row into counter tables. Check-in rollups live next
+to the checks themselves, in ``history``.
+"""
+import csv
+import glob
+import io
+import logging
+import os
+import sqlite3
+import threading
+
+import feedback
+import locks
+import scoring
+
+log = logging.getLogger(__name__)
+
+DB_PATH = os.path.join("data", "analytics.db")
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "StudentWelllness.csv")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested (
+    file TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_ratings (
+    rating INTEGER PRIMARY KEY,
+    submissions INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dataset_moods (
+    mood TEXT PRIMARY KEY,
+    students INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dataset_risk (
+    risk TEXT PRIMARY KEY,
+    students INTEGER NOT NULL,
+    sleep_total REAL NOT NULL,
+    sleep_rows INTEGER NOT NULL,
+    screen_total REAL NOT NULL,
+    screen_rows INTEGER NOT NULL
+);
+"""
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class FileRollups:
+    """Incrementally maintained counters for the CSV data sources."""
+
+    def __init__(self, path=DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ----- ingestion -----
+    def refresh(self, feedback_dir=feedback.FEEDBACK_DIR, dataset=DATASET):
+        """Fold rows added since the last refresh into the rollups; returns the count."""
+        return self.ingest_feedback(feedback_dir) + self.ingest_dataset(dataset)
+
+    def ingest_feedback(self, directory=feedback.FEEDBACK_DIR):
+        stem, ext = os.path.splitext(feedback.FEEDBACK_FILE)
+        lock_path = os.path.join(directory, feedback.FEEDBACK_FILE + ".lock")
+        if not os.path.isdir(directory):
+            return 0
+        added = 0
+        # The sink's lock keeps batches whole and stops a rotation mid-scan
+        with locks.file_lock(lock_path):
+            for path in sorted(glob.glob(os.path.join(directory, f"{stem}*{ext}"))):
+                added += self._ingest(path, self._add_feedback, columns=feedback.HEADER)
+        return added
+
+    def ingest_dataset(self, path=DATASET):
+        if not os.path.exists(path):
+            return 0
+        return self._ingest(path, self._add_student)
+
+    def _ingest(self, path, add, columns=None):
+        """Fold new rows of ``path`` in with ``add``.
+
+        Rows are keyed by the file's header, or by ``columns`` for files that
+        may have none (feedback written before the sink added headers).
+        """
+        stat = os.stat(path)
+        file_id = f"{stat.st_dev}:{stat.st_ino}"
+        with self._lock:
+            state = self._conn.execute(
+                "SELECT offset, header FROM ingested WHERE file = ?", (file_id,)
+            ).fetchone()
+            offset, header = (state["offset"], state["header"].split(",")) if state else (0, None)
+            if stat.st_size < offset:
+                offset, header = 0, None  # truncated, or the inode was reused
+            if stat.st_size == offset:
+                return 0
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(stat.st_size - offset)
+            # Only whole lines; a partly written row is picked up next time
+            data = data[:data.rfind(b"\n") + 1]
+            if not data:
+                return 0
+            rows = list(csv.reader(io.StringIO(data.decode("utf-8-sig" if offset == 0 else "utf-8"))))
+            if header is None:
+                header = list(columns or rows[0])
+                if rows and rows[0] == header:
+                    rows = rows[1:]
+
+            self._conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    if len(row) == len(header):
+                        add(dict(zip(header, row)))
+                self._conn.execute(
+                    "INSERT INTO ingested VALUES (?, ?, ?, ?) ON CONFLICT (file) DO UPDATE SET "
+                    "path = excluded.path, offset = excluded.offset, header = excluded.header",
+                    (file_id, path, offset + len(data), ",".join(header)),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        log.info("Ingested %d rows from %s", len(rows), path)
+        return len(rows)
+
+    def _add_feedback(self, row):
+        rating = _number(row.get("rating"))
+        if rating is None:
+            return
+        self._conn.execute(
+            "INSERT INTO feedback_ratings VALUES (?, 1) "
+            "ON CONFLICT (rating) DO UPDATE SET submissions = submissions + 1",
+            (int(rating),),
+        )
+
+    def _add_student(self, row):
+        sleep_hours = _number(row.get("sleep_hours"))
+        screen_time = _number(row.get("screen_time"))
+        risk = scoring.score_entry(
+            row.get("journal_text", ""),
+            scoring.DEFAULTS["sleep_hours"] if sleep_hours is None else sleep_hours,
+            scoring.DEFAULTS["screen_time"] if screen_time is None else screen_time,
+            scoring.DEFAULTS["outdoor_time"],
+            scoring.ACTIVITY_TO_EXERCISE.get(row.get("physical_activity"), scoring.DEFAULTS["exercise"]),
+        )["risk"]
+        self._conn.execute(
+            "INSERT INTO dataset_moods VALUES (?, 1) "
+            "ON CONFLICT (mood) DO UPDATE SET students = students + 1",
+            (row.get("mood") or "unknown",),
+        )
+        self._conn.execute(
+            "INSERT INTO dataset_risk VALUES (?, 1, ?, ?, ?, ?) ON CONFLICT (risk) DO UPDATE SET "
+            "students = students + 1, "
+            "sleep_total = sleep_total + excluded.sleep_total, "
+            "sleep_rows = sleep_rows + excluded.sleep_rows, "
+            "screen_total = screen_total + excluded.screen_total, "
+            "screen_rows = screen_rows + excluded.screen_rows",
+            (risk, sleep_hours or 0, sleep_hours is not None, screen_time or 0, screen_time is not None),
+        )
+
+    # ----- rollups -----
+    def rating_histogram(self):
+        """``{rating: submissions}`` for ratings 1-5, including empty ones."""
+        counts = {rating: 0 for rating in range(1, 6)}
+        counts.update(
+            (row["rating"], row["submissions"])
+            for row in self._query("SELECT rating, submissions FROM feedback_ratings")
+        )
+        return counts
+
+    def dataset_moods(self):
+        return self._query("SELECT mood, students FROM dataset_moods ORDER BY students DESC")
+
+    def dataset_risk_habits(self):
+        """Average sleep and screen time per computed risk band, as ``history.risk_habits``."""
+        return self._query(
+            "SELECT risk, students AS checks, "
+            "sleep_total / NULLIF(sleep_rows, 0) AS sleep_hours, "
+            "screen_total / NULLIF(screen_rows, 0) AS screen_time "
+            "FROM dataset_risk ORDER BY risk"
+        )
@@ -0,0 +1,224 @@
+"""Local cache for the Lottie animations used across the app.
+
+Animations are stored content-addressed on disk (``objects/<sha256>.json``)
+with a small metadata file per URL holding its ETag, so they survive restarts
+and are revalidated with conditional requests over the shared pooled
+``http_client``. Lookups never touch the network: a miss returns ``None``
+and the download happens on a background thread. No animations ship with
+the app; a copy placed in ``assets/lottie`` is returned instead of ``None``
+(see the README there).
+
+With a ``shared`` cache (see ``shared_cache``), every download is also
+published there, and a URL this process has never seen is copied from it
+before falling back, so a fresh worker does not refetch what another already
+has.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+import http_client
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join("data", "cache", "lottie")
+FALLBACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "lottie")
+MAX_AGE = 3600    # seconds before a cached animation is revalidated
+RETRY_AFTER = 60  # seconds before a failed fetch is attempted again
+# Serve every animation from another host, e.g. ``stub_server.py`` for load tests
+BASE_URL_ENV = "NATUREMIND_LOTTIE_BASE_URL"
+
+# Every animation the pages reference
+LOTTIE_URLS = {
+    "welcome": "https://assets5.lottiefiles.com/packages/lf20_yo4lqexz.json",
+    "mood_low": "https://assets4.lottiefiles.com/packages/lf20_yo4lqexz.json",
+    "mood_moderate": "https://assets1.lottiefiles.com/packages/lf20_yo4lqexz.json",
+    "mood_high": "https://assets3.lottiefiles.com/packages/lf20_yo4lqexz.json",
+    "guide_header": "https://assets1.lottiefiles.com/packages/lf20_yo4lqexz.json",
+    "feedback": "https://assets9.lottiefiles.com/packages/lf20_tutvdkg0.json",
+    "confetti": "https://assets10.lottiefiles.com/packages/lf20_obhph3sh.json",
+}
+if os.environ.get(BASE_URL_ENV):
+    LOTTIE_URLS = {
+        name: os.environ[BASE_URL_ENV].rstrip("/") + urlparse(url).path
+        for name, url in LOTTIE_URLS.items()
+    }
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class AnimationCache:
+    """Disk-backed animation store with background fetch and revalidation."""
+
+    def __init__(self, cache_dir=CACHE_DIR, fallback_dir=FALLBACK_DIR,
+                 max_age=MAX_AGE, retry_after=RETRY_AFTER, client=None, workers=4, shared=None):
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.meta_dir = os.path.join(cache_dir, "meta")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.meta_dir, exist_ok=True)
+        self.fallback_dir = fallback_dir
+        self.max_age = max_age
+        self.client = client or http_client.get_client()
+        self.retry_after = retry_after
+        self.shared = shared
+        self._memory = {}      # url -> (content hash, parsed animation)
+        self._inflight = set()
+        self._failed = {}      # url -> time of the last failed fetch
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lottie")
+
+    # ----- lookups (never block on the network) -----
+    def get(self, url):
+        """Cached animation for ``url``, scheduling a fetch when missing or stale."""
+        meta = self._read_meta(url)
+        if meta is None and self.shared is not None:
+            meta = self._from_shared(url)
+        now = time.time()
+        stale = meta is None or now - meta["checked"] > self.max_age
+        if stale and now - self._failed.get(url, 0) > self.retry_after:
+            self.refresh(url)
+        if meta is not None:
+            anim = self._load_object(url, meta["content"])
+            if anim is not None:
+                return anim
+        return self._fallback(url)
+
+    def refresh(self, url):
+        """Fetch ``url`` in the background unless a fetch is already running."""
+        with self._lock:
+            if url in self._inflight:
+                return None
+            self._inflight.add(url)
+        return self._executor.submit(self._fetch_and_release, url)
+
+    def prefetch(self, urls):
+        """Warm the cache for every URL in one parallel batch, in the background."""
+        with self._lock:
+            urls = [u for u in dict.fromkeys(urls) if u not in self._inflight]
+            self._inflight.update(urls)
+        if urls:
+            return self._executor.submit(self._fetch_and_release, urls)
+        return None
+
+    # ----- network -----
+    def _fetch_and_release(self, urls):
+        if isinstance(urls, str):
+            results = {urls: self.fetch(urls)}
+        else:
+            results = self.fetch_many(urls)
+        now = time.time()
+        for url, ok in results.items():
+            if ok:
+                self._failed.pop(url, None)
+            else:
+                self._failed[url] = now
+        with self._lock:
+            self._inflight.difference_update(results)
+        return results
+
+    def fetch(self, url):
+        """Download or revalidate ``url``; returns False if the server could not be used."""
+        try:
+            r = self.client.get(url, headers=self._conditional_headers(url))
+        except requests.RequestException as e:
+            log.warning("Lottie fetch failed for %s: %s", url, e)
+            return False
+        return self._store(url, r)
+
+    def fetch_many(self, urls):
+        """``fetch`` for several URLs in parallel; returns ``{url: ok}``."""
+        responses = self.client.fetch_many(urls, headers=self._conditional_headers)
+        return {url: r is not None and self._store(url, r) for url, r in responses.items()}
+
+    def _conditional_headers(self, url):
+        meta = self._read_meta(url)
+        if meta and meta.get("etag"):
+            return {"If-None-Match": meta["etag"]}
+        return {}
+
+    def _store(self, url, r):
+        meta = self._read_meta(url)
+        if r.status_code == 304 and meta:
+            meta["checked"] = time.time()
+            self._write_meta(url, meta)
+            return True
+        if r.status_code != 200:
+            log.warning("Lottie fetch for %s returned HTTP %s", url, r.status_code)
+            return False
+        try:
+            r.json()
+        except ValueError:
+            log.warning("Lottie fetch for %s returned invalid JSON", url)
+            return False
+
+        meta = self._save(url, r.content, r.headers.get("ETag"), time.time())
+        if self.shared is not None:
+            self.shared.set(url, {"etag": meta["etag"], "checked": meta["checked"], "body": r.text},
+                            ttl=self.max_age)
+        return True
+
+    def _from_shared(self, url):
+        """Copy ``url`` from the shared cache into this cache; its meta or ``None``."""
+        entry = self.shared.get(url)
+        if entry is None:
+            return None
+        return self._save(url, entry["body"].encode(), entry["etag"], entry["checked"])
+
+    # ----- storage -----
+    def _save(self, url, body, etag, checked):
+        content = _sha256(body)
+        path = os.path.join(self.objects_dir, f"{content}.json")
+        if not os.path.exists(path):
+            _write_atomic(path, body)
+        meta = {"url": url, "etag": etag, "content": content, "checked": checked}
+        self._write_meta(url, meta)
+        return meta
+
+    def _meta_path(self, url):
+        return os.path.join(self.meta_dir, f"{_sha256(url.encode())}.json")
+
+    def _read_meta(self, url):
+        try:
+            with open(self._meta_path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, url, meta):
+        _write_atomic(self._meta_path(url), json.dumps(meta).encode())
+
+    def _load_object(self, url, content):
+        cached = self._memory.get(url)
+        if cached and cached[0] == content:
+            return cached[1]
+        try:
+            with open(os.path.join(self.objects_dir, f"{content}.json"), encoding="utf-8") as f:
+                anim = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._memory[url] = (content, anim)
+        return anim
+
+    def _fallback(self, url):
+        name = os.path.basename(urlparse(url).path)
+        try:
+            with open(os.path.join(self.fallback_dir, name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
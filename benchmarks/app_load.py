@@ -0,0 +1,185 @@
+"""Many concurrent students driving the real app, headless, through AppTest.
+
+    python benchmarks/app_load.py [--users 50] [--concurrency 10] [--think 0] [--chat]
+
+Every simulated user runs the whole script in this process, as they would on
+one server: fill in the Welcome form, submit a Mood Check and wait for the
+background analysis, tick a habit and move the stress slider on the Wellness
+Guide, then submit Feedback (``--chat`` then adds one Wellness Chat turn). Lottie
+animations and chat completions are served by ``stub_server`` so nothing
+leaves the machine, and all app data is written to a temporary directory.
+
+AppTest installs a process-wide runtime for the length of each run, so runs
+are serialized here; with ``--concurrency`` users in flight, the time a rerun
+waits for the one before it is part of its latency, as it would be for a
+single server process whose Python work is bound by the GIL.
+
+Reports p50/p95/p99 latency per rerun step, reruns and completed visits per
+second, how often the analysis queue turned a user away, and the resident
+memory each live session adds (Linux ``/proc/self/statm``; includes
+AppTest's own copy of the rendered page).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer
+
+APP = os.path.join(ROOT, "app_py.py")
+JOURNALS = [
+    "Had a great day with friends and went for a long walk in the park",
+    "Exams next week and I can't sleep, everything feels like too much",
+    "Normal day, classes were fine, a bit tired in the afternoon",
+    "Nervous about my presentation but the morning run helped",
+]
+FEEDBACK = ["Love the breathing exercises", "The guide was useful", "Would like more recipes"]
+
+_run_lock = threading.Lock()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def rss_mib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds):
+        with self._lock:
+            self.latencies[step].append(seconds)
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+
+class User:
+    """One student's visit; every rerun is timed under a step name."""
+
+    def __init__(self, n, recorder, think=0.0, chat=False, timeout=60):
+        from streamlit.testing.v1 import AppTest
+
+        self.n = n
+        self.recorder = recorder
+        self.think = think
+        self.chat = chat
+        self.rng = random.Random(n)
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+
+    def step(self, name, action):
+        if self.think:
+            time.sleep(self.rng.uniform(0, 2 * self.think))
+        start = time.perf_counter()
+        with _run_lock:
+            action()
+        self.recorder.add(name, time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(f"user {self.n}, {name}: {self.at.exception[0].message}")
+
+    def click(self, label):
+        return next(b for b in self.at.button if b.label == label).click()
+
+    def visit(self):
+        from views.mood_check import POLL_INTERVAL
+
+        at = self.at
+        self.step("welcome", at.run)
+        at.text_input[0].input(f"Student {self.n}")
+        self.step("welcome submit", self.click("Continue to Mood Check").run)
+
+        at.text_area[0].input(self.rng.choice(JOURNALS))
+        self.step("mood submit", self.click("Analyze My Mood").run)
+        while "analysis_job" not in at.session_state and not at.session_state.mood_analyzed:
+            # Turned away by the analysis queue's backpressure; try again shortly
+            self.recorder.count("queue full")
+            time.sleep(POLL_INTERVAL)
+            self.step("mood submit", self.click("Analyze My Mood").run)
+        submitted = time.perf_counter()
+        while not at.session_state.mood_analyzed:
+            time.sleep(POLL_INTERVAL)
+            self.step("mood poll", at.run)
+        self.recorder.add("analysis wait", time.perf_counter() - submitted)
+
+        self.step("guide", self.click("View Wellness Suggestions").run)
+        self.step("guide habit", at.checkbox[self.rng.randrange(len(at.checkbox))].check().run)
+        self.step("guide stress", at.slider(key="stress_level").set_value(self.rng.randint(1, 10)).run)
+
+        self.step("feedback", self.click("💌 Give Feedback").run)
+        at.slider[0].set_value(self.rng.randint(1, 5))
+        at.text_area[0].input(self.rng.choice(FEEDBACK))
+        self.step("feedback submit", self.click("Submit Feedback").run)
+
+        if self.chat:
+            at.session_state.page = "💬 Wellness Chat"
+            self.step("chat", at.run)
+            self.step("chat reply", at.chat_input[0].set_value("I'm stressed about exams").run)
+
+        self.recorder.count("visits")
+        return self
+
+
+def run(users, concurrency, think=0.0, chat=False):
+    recorder = Recorder()
+    # Load the app's modules once so the memory delta is per session only
+    User(-1, Recorder()).visit()
+    base = rss_mib()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = list(pool.map(lambda n: User(n, recorder, think, chat).visit(), range(users)))
+    elapsed = time.perf_counter() - start
+    per_session = (rss_mib() - base) / users * 1024
+    assert len(sessions) == users
+    return recorder, elapsed, per_session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the app.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean seconds a user pauses before each action")
+    parser.add_argument("--chat", action="store_true", help="also send one Wellness Chat message")
+    args = parser.parse_args(argv)
+
+    with StubServer(delay=0.01, token_delay=0.005) as stub, tempfile.TemporaryDirectory() as data:
+        os.environ["NATUREMIND_LOTTIE_BASE_URL"] = stub.base_url
+        os.environ["NATUREMIND_CHAT_PROVIDER"] = "openai"
+        os.environ["OPENAI_BASE_URL"] = stub.url("/v1")
+        os.chdir(data)
+        recorder, elapsed, per_session = run(args.users, args.concurrency, args.think, args.chat)
+        os.chdir(ROOT)
+        external = [p for p in stub.requests if not p.startswith(("/packages/", "/v1/"))]
+        assert not external, external
+
+    waits = recorder.latencies.pop("analysis wait")
+    everything = [t for values in recorder.latencies.values() for t in values]
+    print(f"{args.users} users, {args.concurrency} at a time: {elapsed:.1f}s, "
+          f"{len(everything) / elapsed:.1f} reruns/s, {recorder.counts['visits'] / elapsed:.2f} visits/s, "
+          f"{recorder.counts['queue full']} queue-full retries")
+    print(f"{'step':<16} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for step, values in [*recorder.latencies.items(), ("all reruns", everything), ("analysis wait", waits)]:
+        print(f"{step:<16} {len(values):>5} " + " ".join(
+            f"{percentile(values, q) * 1e3:>8.0f}" for q in (50, 95, 99)))
+    print(f"memory: {per_session:.0f} KiB RSS per live session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Streaming chat under concurrent load, against the local stub server.
+
+    python benchmarks/chat_load.py [sessions] [turns]
+
+Each session runs ``turns`` chat turns through ``OpenAIProvider`` pointed at
+``stub_server``, with the history going through ``Conversation``. Reports
+time to first chunk (what the user waits for before text appears) against
+time to the full reply, plus the largest prompt sent, which must stay within
+``chat.PROMPT_BUDGET``.
+"""
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat
+from stub_server import StubServer
+
+SYSTEM = chat.SYSTEM_PROMPT.format(companion="Willow", name="Sam", mood="Balanced", risk="Moderate")
+MESSAGE = "I have three exams next week and I keep waking up at night thinking about them. "
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def session(provider, turns):
+    conversation = chat.Conversation()
+    first, total, prompt = [], [], 0
+    for i in range(turns):
+        conversation.add("user", MESSAGE * (1 + i % 4))
+        messages = conversation.messages(SYSTEM)
+        prompt = max(prompt, sum(chat.count_tokens(m["content"]) for m in messages))
+        start = time.perf_counter()
+        parts = []
+        for chunk in provider.stream(messages):
+            if not parts:
+                first.append(time.perf_counter() - start)
+            parts.append(chunk)
+        total.append(time.perf_counter() - start)
+        conversation.add("assistant", "".join(parts))
+    return first, total, prompt
+
+
+def main(sessions=20, turns=30):
+    sessions, turns = int(sessions), int(turns)
+    with StubServer(delay=0.05, token_delay=0.01) as stub:
+        provider = chat.OpenAIProvider(api_key="stub", base_url=stub.url("/v1"))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            results = list(pool.map(lambda _: session(provider, turns), range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    first = [t for r in results for t in r[0]]
+    total = [t for r in results for t in r[1]]
+    print(f"{sessions} sessions x {turns} turns, {len(total) / elapsed:.1f} replies/s")
+    print(f"{'':<14} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for label, values in (("first chunk", first), ("full reply", total)):
+        print(f"{label:<14} {percentile(values, 50) * 1e3:>8.0f} "
+              f"{percentile(values, 95) * 1e3:>8.0f} {statistics.mean(values) * 1e3:>8.0f}")
+    print(f"largest prompt: {max(r[2] for r in results)} tokens (budget {chat.PROMPT_BUDGET})")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,89 @@
+"""Habit history at cohort scale: packed bytes and NumPy vs per-day Python loops.
+
+    python benchmarks/habit_stats.py [students] [days]
+
+Registers ``students`` users with ``HabitStore.record``, fills the rest of
+their history directly in the year files (a random mix of habits, with
+gaps), then times one student's dashboard figures and the cohort figures
+shown on the analytics page against a loop over per-day dicts of booleans,
+the shape the tracker used to keep in session state.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import habits
+
+
+def loop_stats(days):
+    """The per-day version: ``days`` is a list of ``{habit: bool}`` dicts, oldest first."""
+    streak = 0
+    for i, day in enumerate(reversed(days)):
+        done = sum(day.values()) >= habits.DAY_GOAL
+        if not done and i == 0:
+            continue
+        if not done:
+            break
+        streak += 1
+    adherence = {h: sum(day[h] for day in days) / len(days) for h in habits.HABITS}
+    week = sum(sum(day.values()) for day in days[-7:]) / (7 * len(habits.HABITS))
+    return streak, adherence, week
+
+
+def timed(fn, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1e3, result
+
+
+def main(students=10_000, days=365):
+    students, days = int(students), int(days)
+    today = date(2026, 12, 31)
+    start = today - timedelta(days=days - 1)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        store = habits.HabitStore(directory)
+        for i in range(students):
+            store.record(f"student{i}", today, 0)
+        # Each habit kept with its own per-student probability; some days skipped entirely
+        p = rng.uniform(0.2, 0.95, (students, 1, len(habits.HABITS)))
+        ticks = rng.random((students, days, len(habits.HABITS))) < p
+        ticks &= rng.random((students, days, 1)) < 0.85
+        masks = (ticks << np.arange(len(habits.HABITS))).sum(axis=2).astype(np.uint8)
+        table = np.zeros((students, habits.ROW), dtype=np.uint8)
+        table[:, start.timetuple().tm_yday - 1:today.timetuple().tm_yday] = masks
+        table.tofile(os.path.join(directory, f"{today.year}.bin"))
+
+        end = today + timedelta(days=1)
+        one_ms, figures = timed(lambda: habits.summary(store.masks("student7", start, end)))
+        dicts = [dict(zip(habits.HABITS, map(bool, row))) for row in ticks[7]]
+        loop_ms, loop = timed(lambda: loop_stats(dicts))
+        assert figures["streak"] == loop[0] and np.isclose(figures["week"], loop[2])
+
+        def cohort():
+            table = store.cohort(start, end)
+            return habits.streak(table), habits.adherence(table).mean(axis=0), habits.completion(table[:, -7:])
+
+        cohort_ms, _ = timed(cohort)
+        all_dicts = [[dict(zip(habits.HABITS, map(bool, row))) for row in ticks[s]]
+                     for s in range(min(students, 500))]
+        loop_cohort_ms, _ = timed(lambda: [loop_stats(d) for d in all_dicts], repeats=1)
+        size = store.size()
+
+    print(f"{students} students x {days} days: {size / 2**20:.1f} MiB on disk")
+    print(f"{'':<36} {'ms':>9}")
+    print(f"{'one student, per-day dict loop':<36} {loop_ms:>9.2f}")
+    print(f"{'one student, read + summary':<36} {one_ms:>9.2f}")
+    print(f"{'cohort, per-day dict loop (est.)':<36} {loop_cohort_ms * students / len(all_dicts):>9.1f}")
+    print(f"{'cohort, cohort() + streak/adherence':<36} {cohort_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
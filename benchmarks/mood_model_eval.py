@@ -0,0 +1,64 @@
+"""Mood classifier vs the weighted-formula cutoffs: accuracy and latency.
+
+    python benchmarks/mood_model_eval.py [repeats]
+
+Accuracy is measured on StudentWelllness.csv with stratified 5-fold cross
+validation, so every row is predicted by a model that never saw it. The
+formula cannot tell sad from anxious, so both are also compared on the risk
+band each dataset label maps to. Latency is per entry: labelling alone
+(polarity already known) and the full ``score_entry`` call.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import mood_model
+import scoring
+
+
+def per_call_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main(repeats=20_000):
+    repeats = int(repeats)
+    df = pd.read_csv(mood_model.DATASET, encoding="utf-8-sig")
+    X, labels = mood_model.dataset_features(df), df["mood"].tolist()
+    true_risk = [mood_model.LABEL_BANDS[label][1] for label in labels]
+
+    predicted = mood_model.cross_validate(X, labels)
+    model_risk = [mood_model.LABEL_BANDS[label][1] for label in predicted]
+    formula_risk = scoring.score_frame(df)["risk"].tolist()
+
+    def accuracy(predicted, truth):
+        return sum(p == t for p, t in zip(predicted, truth)) / len(truth)
+
+    print(f"{len(df)} labeled rows, 5-fold cross validation")
+    print(f"{'':<12} {'label acc':>10} {'risk acc':>10}")
+    print(f"{'formula':<12} {'—':>10} {accuracy(formula_risk, true_risk):>10.1%}")
+    print(f"{'classifier':<12} {accuracy(predicted, labels):>10.1%} {accuracy(model_risk, true_risk):>10.1%}")
+
+    classifier = mood_model.MoodClassifier.load()
+    text, sleep_hours, screen_time, outdoor_time, exercise = (
+        "Nervous about upcoming exams but went for a walk", 6, 7, 30, "Light"
+    )
+    pol = scoring.polarity(text)
+    score = scoring.weighted_score(pol, sleep_hours, screen_time, outdoor_time, exercise)
+    print(f"\n{'per entry':<26} {'formula us':>11} {'classifier us':>14}")
+    print(f"{'label (polarity known)':<26} "
+          f"{per_call_us(lambda: scoring.classify(score), repeats):>11.2f} "
+          f"{per_call_us(lambda: classifier.classify(pol, sleep_hours, screen_time, exercise, text), repeats):>14.2f}")
+    print(f"{'score_entry':<26} "
+          f"{per_call_us(lambda: scoring.score_entry(text, sleep_hours, screen_time, outdoor_time, exercise), repeats):>11.2f} "
+          f"{per_call_us(lambda: scoring.score_entry(text, sleep_hours, screen_time, outdoor_time, exercise, classifier), repeats):>14.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
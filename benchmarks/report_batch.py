@@ -0,0 +1,74 @@
+"""Weekly report generation: one worker vs a process pool, and incremental reruns.
+
+    python benchmarks/report_batch.py [students] [workers]
+
+Fills a temporary history database and habit store with two weeks of mood
+checks, a week of sleep and 90 days of habits for ``students`` users, then
+times ``reports.generate`` with one worker and with ``workers``, a rerun
+with nothing changed, and a rerun after one more check by one student.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import habits
+import history
+import reports
+import scoring
+
+
+def fill(history_store, habit_store, students, week_ending, rng):
+    start, end = reports.week_of(week_ending)
+    for i in range(students):
+        user = f"student{i}"
+        for day in range(14):
+            night = start - timedelta(days=7 - day)
+            for _ in range(rng.randint(0, 2)):
+                score = rng.uniform(-0.3, 0.9)
+                mood, risk = scoring.classify(score)
+                history_store.record(user, {"mood": mood, "mood_score": score, "risk": risk},
+                                     when=datetime.combine(night, datetime.min.time()) + timedelta(hours=rng.randint(8, 22)))
+            if night >= start and rng.random() < 0.85:
+                history_store.record_sleep(user, night, rng.choice([5, 6, 6.5, 7, 7.5, 8, 9]))
+        for day in range(90):
+            habit_store.record(user, end - timedelta(days=day + 1), rng.getrandbits(len(habits.HABITS)))
+
+
+def timed(**kwargs):
+    started = time.perf_counter()
+    result = reports.generate(**kwargs)
+    return time.perf_counter() - started, result
+
+
+def main(students=200, workers=None):
+    students, workers = int(students), int(workers or os.cpu_count() or 1)
+    week_ending = date(2026, 10, 11)
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        history_store = history.HistoryStore(os.path.join(directory, "history.db"))
+        habit_store = habits.HabitStore(os.path.join(directory, "habits"))
+        fill(history_store, habit_store, students, week_ending, rng)
+        run = dict(week_ending=week_ending, out_dir=os.path.join(directory, "reports"),
+                   history_store=history_store, habit_store=habit_store)
+
+        rows = [("1 worker, --force", *timed(workers=1, force=True, **run))]
+        rows.append((f"{workers} workers, --force", *timed(workers=workers, force=True, **run)))
+        rows.append(("rerun, nothing changed", *timed(workers=workers, **run)))
+        history_store.record("student7", {"mood": "Blooming", "mood_score": 0.5, "risk": "Low"},
+                             when=datetime.combine(week_ending, datetime.min.time()) + timedelta(hours=20))
+        rows.append(("rerun, one student changed", *timed(workers=workers, **run)))
+
+    print(f"{students} students, HTML reports")
+    print(f"{'':<30} {'s':>7} {'rendered':>9} {'per report ms':>14}")
+    for label, seconds, result in rows:
+        per = seconds / result["rendered"] * 1e3 if result["rendered"] else float("nan")
+        print(f"{label:<30} {seconds:>7.2f} {result['rendered']:>9} {per:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,97 @@
+"""Journal search at scale: index build, open, BM25 and similar-entry latency.
+
+    python benchmarks/search_load.py [entries]
+
+Generates ``entries`` journal entries (the bundled ones with words swapped
+in from the rest of the corpus), indexes them in batches of 100k through
+``SearchIndex.add`` so segments are merged along the way, then reopens the
+index from disk and times queries ranging from rare to very common terms.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search
+import storage
+
+QUERIES = [
+    "overwhelmed",
+    "assignments deadlines",
+    "feeling stressed about exams",
+    "tired",
+    "happy friends park walk",
+]
+BATCH = 100_000
+
+
+def rss_mib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def entries(count, seed=0):
+    texts = [t for t in storage.read("journal")["journal_text"].to_pylist() if t]
+    words = sorted({w for t in texts for w in t.split()})
+    rng = random.Random(seed)
+    for i in range(count):
+        text = rng.choice(texts).split()
+        text[rng.randrange(len(text))] = rng.choice(words)
+        yield "checkins", i, " ".join(text) + f" day{rng.randrange(1000)}"
+
+
+def timed_ms(fn, repeats=50):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e3)
+    return times
+
+
+def main(count=1_000_000):
+    count = int(count)
+    with tempfile.TemporaryDirectory() as directory:
+        index = search.SearchIndex(directory)
+        generated = entries(count)
+        start = time.perf_counter()
+        for _ in range(0, count, BATCH):
+            index.add(next(generated) for _ in range(min(BATCH, count - index.count)))
+        build = time.perf_counter() - start
+        stats = index.stats()
+        del index
+
+        base = rss_mib()
+        start = time.perf_counter()
+        index = search.SearchIndex(directory)
+        opened = (time.perf_counter() - start) * 1e3
+        print(f"{stats['documents']} entries in {stats['segments']} segment(s), {stats['terms']} terms, "
+              f"{stats['bytes'] / 2**20:.1f} MiB on disk; built in {build:.1f}s, opened in {opened:.1f} ms")
+
+        print(f"{'query':<32} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for query in QUERIES:
+            matches = sum(len(s.postings(t.encode())[0]) for t in search.tokenize(query)
+                          for s in index.segments)
+            times = timed_ms(lambda: index.search(query))
+            print(f"{query:<32} {matches:>8} {statistics.median(times):>8.1f} {percentile(times, 95):>8.1f}")
+        times = timed_ms(lambda: index.search("overwhelmed assignments", sources=["journal"]))
+        print(f"{'(filtered to another source)':<32} {'':>8} {statistics.median(times):>8.1f} "
+              f"{percentile(times, 95):>8.1f}")
+        text = index.search("overwhelmed")[0].text
+        times = timed_ms(lambda: index.similar(text), repeats=20)
+        print(f"{'similar: ' + text[:23]:<32} {'':>8} {statistics.median(times):>8.1f} "
+              f"{percentile(times, 95):>8.1f}")
+        print(f"RSS after opening and querying: +{rss_mib() - base:.0f} MiB (mapped pages)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,70 @@
+"""Agreement and speed of the lexicon sentiment backend against TextBlob.
+
+    python benchmarks/sentiment_agreement.py [journal_text.csv]
+
+Reports exact/sign/mood-band agreement over the corpus and per-entry cost of
+each backend, so a lexicon change that drifts from TextBlob is visible.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import scoring
+import sentiment
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
+
+
+def main(path="journal_text.csv", repeat=20):
+    texts = pd.read_csv(path, encoding="utf-8-sig")["journal_text"].fillna("").astype(str).tolist()
+
+    reference = sentiment.TextBlobBackend()
+    _, textblob_import = timed(reference.polarity, "warm up")
+    sentiment.tokenize.cache_clear()
+    lexicon_backend, lexicon_load = timed(sentiment.LexiconBackend)
+
+    expected, textblob_time = timed(lambda: [reference.polarity(t) for t in texts])
+    actual, lexicon_time = timed(lambda: [lexicon_backend.polarity(t) for t in texts])
+    _, batch_time = timed(lambda: [lexicon_backend.polarity_many(texts) for _ in range(repeat)])
+
+    n = len(texts)
+    exact = sum(abs(a - e) < 1e-9 for a, e in zip(actual, expected))
+    signs = sum(sign(a) == sign(e) for a, e in zip(actual, expected))
+    bands = sum(
+        scoring.classify(scoring.weighted_score(a, 7, 5, 30, "Moderate"))
+        == scoring.classify(scoring.weighted_score(e, 7, 5, 30, "Moderate"))
+        for a, e in zip(actual, expected)
+    )
+    mae = sum(abs(a - e) for a, e in zip(actual, expected)) / max(n, 1)
+
+    print(f"Corpus: {path} ({n} entries)")
+    print(f"Exact polarity match: {exact}/{n}")
+    print(f"Sign agreement:       {signs}/{n}")
+    print(f"Mood band agreement:  {bands}/{n}")
+    print(f"Mean abs. error:      {mae:.4f}")
+    print()
+    print(f"TextBlob first call:  {textblob_import * 1e3:8.1f} ms (import + lexicon)")
+    print(f"Lexicon load:         {lexicon_load * 1e3:8.1f} ms")
+    print(f"TextBlob per entry:   {textblob_time / n * 1e6:8.1f} us")
+    print(f"Lexicon per entry:    {lexicon_time / n * 1e6:8.1f} us (cold tokenizer cache)")
+    print(f"Lexicon batch/entry:  {batch_time / (n * repeat) * 1e6:8.1f} us (warm cache)")
+
+    for text, a, e in zip(texts, actual, expected):
+        if abs(a - e) >= 1e-9:
+            print(f"  differs: {a:+.3f} vs {e:+.3f}  {text[:60]!r}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
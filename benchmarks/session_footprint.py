@@ -0,0 +1,100 @@
+"""Server memory held per browser session: old dict state vs ``session``.
+
+    python benchmarks/session_footprint.py [sessions]
+
+Builds ``sessions`` copies of a well-used session (an analyzed mood check
+with a journal entry, a chat that filled its token budget, habits ticked and
+a saved meal plan) in both layouts and reports the bytes each session keeps
+alive, measured with ``tracemalloc``. For the new layout the values moved to
+``SessionStore`` are reported separately: they live on disk, not in RSS (the
+meal plan is now saved per user in ``meals.MealPlanStore``, not per session).
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat
+import session
+
+JOURNAL = ("Exams next week and I keep putting off revision. Slept badly, "
+           "too much time on my phone, but a walk by the river helped. ") * 4
+HABITS = ["Morning sunlight", "Hydration (8 glasses)", "30-min exercise",
+          "Healthy meals", "Digital detox", "Quality sleep", "Mindfulness"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Weekend"]
+
+
+def chat_turns():
+    """Turns left after ``Conversation`` compacts a long chat to its budget."""
+    conversation = chat.Conversation()
+    for i in range(40):
+        conversation.add("user", f"Message {i}: I'm worried about my exams and can't focus. " * 3)
+        conversation.add("assistant", f"Reply {i}: Try a short walk outside, then one small task. " * 3)
+        conversation.compact()
+    return conversation.turns, conversation.summary
+
+
+def meal_plan():
+    return [{"Day": day, "Breakfast": "Oatmeal with fruits", "Lunch": "Grilled chicken salad",
+             "Dinner": "Fish with vegetables"} for day in DAYS]
+
+
+def legacy_session(i, turns, summary):
+    """The ``st.session_state`` values the pages used to keep."""
+    return {
+        "chat_history": [dict(t, content=t["content"] + str(i)) for t in turns],
+        "chat_summary": summary + str(i),
+        "quiz_answers": {},
+        "mood_data": {
+            "mood": "Wilting", "mood_score": 0.41 + i * 1e-9, "risk": "Moderate",
+            "mood_color": "#f4a261", "journal_entry": JOURNAL + str(i),
+            "sleep_hours": 6, "screen_time": 8, "outdoor_time": 20, "exercise": "Light",
+        },
+        "habit_tracker": {habit: n % 2 == 0 for n, habit in enumerate(HABITS)},
+        "meal_plan": meal_plan(),
+    }
+
+
+def compact_session(i, turns, summary, store):
+    """The new layout; large values are written to ``store``."""
+    data = session.SessionData()
+    data.mood.update({"mood": "Wilting", "mood_score": 0.41 + i * 1e-9, "risk": "Moderate",
+                      "sleep_hours": 6, "screen_time": 8, "outdoor_time": 20, "exercise": "Light"})
+    data.chat_summary = summary + str(i)
+    store.put(data.key("journal"), JOURNAL + str(i))
+    store.put(data.key("chat"), [dict(t, content=t["content"] + str(i)) for t in turns])
+    return {"session": data}
+
+
+def per_session(build, sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(kept) == sessions
+    return (after - before) / sessions
+
+
+def main(sessions=2_000):
+    sessions = int(sessions)
+    turns, summary = chat_turns()
+    with tempfile.TemporaryDirectory() as directory:
+        store = session.SessionStore(os.path.join(directory, "sessions.db"))
+        legacy = per_session(lambda i: legacy_session(i, turns, summary), sessions)
+        compact = per_session(lambda i: compact_session(i, turns, summary, store), sessions)
+        store.close()
+        on_disk = os.path.getsize(os.path.join(directory, "sessions.db"))
+
+    print(f"{sessions} sessions, chat of {len(turns)} turns + summary, journal of {len(JOURNAL)} chars")
+    print(f"{'':<28} {'bytes/session':>14}")
+    print(f"{'dict session_state (old)':<28} {legacy:>14,.0f}")
+    print(f"{'slotted session model':<28} {compact:>14,.0f}")
+    print(f"{'  + SessionStore on disk':<28} {on_disk / sessions:>14,.0f}")
+    print(f"in memory: {1 - compact / legacy:.0%} smaller")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
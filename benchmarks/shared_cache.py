@@ -0,0 +1,103 @@
+"""Shared cache backends: lookup latency, and generations across server processes.
+
+    python benchmarks/shared_cache.py [workers] [generation_seconds]
+
+First times ``Cache.get``/``set`` on each backend (the Redis protocol against
+``stub_server.RespStub`` over loopback). Then starts ``workers`` processes,
+one after another as a scaled-out deployment would, each asking a
+``SuggestionService`` for every profile with a generator that sleeps like a
+remote call: "per-process" keeps the default per-process tiers (separate
+cache directories, as on separate hosts), the others share one backend.
+"""
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_cache
+import stub_server
+import suggestions
+
+PROFILES = [
+    suggestions.suggestion_key(risk, gender, lifestyle, age, stress)
+    for risk in ("High", "Moderate", "Low")
+    for gender in ("Female", "Male", "Other")
+    for lifestyle in ("Balanced", "Busy")
+    for age, stress in ((19, 8), (22, 4), (30, 2))
+]
+
+
+def latency_us(backend, n=2000):
+    cache = shared_cache.Cache(backend, "bench", 60)
+    value = suggestions.template_suggestions(PROFILES[0])
+    sets, gets = [], []
+    for i in range(n):
+        start = time.perf_counter()
+        cache.set(str(i % 200), value)
+        sets.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        cache.get(str(i % 200))
+        gets.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(sets), statistics.median(gets)
+
+
+def worker(url, cache_dir, seconds, results):
+    def generate(key):
+        time.sleep(seconds)
+        return suggestions.template_suggestions(key)
+
+    shared = shared_cache.Cache(shared_cache.from_url(url), "suggestions", 60) if url else None
+    service = suggestions.SuggestionService(generate, cache_dir=cache_dir, shared=shared)
+    start = time.perf_counter()
+    for key in PROFILES:
+        service.get(key)
+    results.put((service.stats["generated"], time.perf_counter() - start))
+
+
+def deployment(url, workers, seconds):
+    results = multiprocessing.Queue()
+    generated, first, rest = 0, 0.0, []
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(workers):
+            process = multiprocessing.Process(
+                target=worker, args=(url, os.path.join(directory, str(i)), seconds, results)
+            )
+            process.start()
+            n, elapsed = results.get()
+            process.join()
+            generated += n
+            if i:
+                rest.append(elapsed)
+            else:
+                first = elapsed
+    return generated, first, statistics.mean(rest) if rest else 0.0
+
+
+def main(workers=4, seconds=0.02):
+    workers, seconds = int(workers), float(seconds)
+    with tempfile.TemporaryDirectory() as directory, stub_server.RespStub() as redis:
+        backends = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{directory}/shared.db",
+            "redis": redis.url,
+        }
+        print(f"{'backend':<12} {'set us':>8} {'get us':>8}")
+        for name, url in backends.items():
+            backend = shared_cache.from_url(url)
+            set_us, get_us = latency_us(backend)
+            backend.close()
+            print(f"{name:<12} {set_us:>8.1f} {get_us:>8.1f}")
+
+        print(f"\n{workers} workers x {len(PROFILES)} profiles, {seconds}s per generation")
+        print(f"{'cache':<12} {'generations':>12} {'first s':>8} {'later s':>8}")
+        for name, url in (("per-process", None), ("sqlite", backends["sqlite"]), ("redis", redis.url)):
+            generated, first, later = deployment(url, workers, seconds)
+            print(f"{name:<12} {generated:>12} {first:>8.2f} {later:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,77 @@
+"""Rolling sleep statistics: per-night Python loop vs the vectorized ``sleep`` path.
+
+    python benchmarks/sleep_stats.py [years]
+
+Logs ``years`` of nights for one user in a temporary history database, then
+times loading the rows ``sleep.frame`` needs and computing the 7/30/90-night
+means, variability and consistency, against a straightforward loop that
+recomputes every window for every night of the full history.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import history
+import sleep
+
+
+def loop_stats(rows, end, windows=sleep.WINDOWS):
+    """The per-night version: slice and reduce each window in Python."""
+    hours = {date.fromisoformat(r["night"]): r["hours"] for r in rows}
+    first = min(hours)
+    nights = [first + timedelta(days=i) for i in range((end - first).days)]
+    out = []
+    for i, night in enumerate(nights):
+        row = {"night": night}
+        for w in windows:
+            values = [hours[n] for n in nights[max(0, i - w + 1):i + 1] if n in hours]
+            mean = sum(values) / len(values) if values else float("nan")
+            std = (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5 if values else float("nan")
+            row[f"mean_{w}"] = mean
+            row[f"consistency_{w}"] = 100 * len(values) / w * min(1, max(0, 1 - std / sleep.SPREAD_LIMIT))
+        out.append(row)
+    return out
+
+
+def timed(fn, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1e3, result
+
+
+def main(years=10):
+    years = int(years)
+    rng = random.Random(0)
+    end = date.today() + timedelta(days=1)
+    with tempfile.TemporaryDirectory() as directory:
+        store = history.HistoryStore(os.path.join(directory, "history.db"))
+        for i in range(years * 365):
+            if rng.random() < 0.8:
+                store.record_sleep("sam", end - timedelta(days=i + 1), rng.choice([5, 6, 6.5, 7, 7.5, 8, 9]))
+        all_rows = [dict(r) for r in store.sleep_nights("sam", date.min, end)]
+
+        def vectorized():
+            rows = store.sleep_nights("sam", sleep.history_start(end), end)
+            return sleep.frame([dict(r) for r in rows], end)
+
+        vector_ms, stats = timed(vectorized)
+        loop_ms, loop = timed(lambda: loop_stats(all_rows, end), repeats=1)
+        store.close()
+
+    assert np.allclose(stats["mean_30"], [row["mean_30"] for row in loop[-len(stats):]], equal_nan=True)
+    print(f"{len(all_rows)} nights logged over {years} years")
+    print(f"{'':<34} {'ms':>8}")
+    print(f"{'loop over the full history':<34} {loop_ms:>8.1f}")
+    print(f"{'sleep.frame (query + rolling)':<34} {vector_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
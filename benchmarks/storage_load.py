@@ -0,0 +1,84 @@
+"""Load time and memory: CSV parsing vs the Parquet storage layer.
+
+    python benchmarks/storage_load.py [rows]
+
+Builds a synthetic wellness dataset of ``rows`` rows (the bundled rows
+repeated with varied hours), writes it both as CSV and through ``storage``,
+then loads it each way in a fresh interpreter and reports how much resident
+memory the loaded result holds (Linux ``/proc/self/statm``).
+"""
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = f"""
+import os, sys, time
+sys.path.insert(0, {ROOT!r})
+import pandas as pd
+import pyarrow.parquet as pq
+import storage
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+base = rss()
+start = time.perf_counter()
+"""
+REPORT = """
+elapsed = time.perf_counter() - start
+print(elapsed, rss() - base, len(result))
+"""
+
+MODES = {
+    "pandas read_csv (old path)": "result = pd.read_csv(CSV, encoding='utf-8-sig')",
+    "arrow CSV import path": "result = storage.read_dataset_csv(CSV).to_pandas()",
+    "parquet, all columns": "result = pq.read_table(PARQUET, memory_map=True).to_pandas()",
+    "parquet, 3 columns": (
+        "result = pq.read_table(PARQUET, columns=['sleep_hours', 'screen_time', 'mood'], "
+        "memory_map=True).to_pandas()"
+    ),
+    "parquet, 3 columns, arrow only": (
+        "result = pq.read_table(PARQUET, columns=['sleep_hours', 'screen_time', 'mood'], "
+        "memory_map=True)"
+    ),
+}
+
+
+def build(rows, directory):
+    with open(storage.DATASETS["wellness"], encoding="utf-8-sig") as f:
+        header, *lines = f.read().splitlines()
+    rng = random.Random(0)
+    csv_path = os.path.join(directory, "wellness.csv")
+    with open(csv_path, "w", encoding="utf-8-sig") as f:
+        f.write(header + "\n")
+        for i in range(rows):
+            text, _, _, activity, mood = lines[i % len(lines)].rsplit(",", 4)
+            f.write(f"{text},{rng.randint(3, 10)},{rng.randint(1, 14)},{activity},{mood}\n")
+    parquet_path = os.path.join(directory, "wellness.parquet")
+    storage._write(storage.read_dataset_csv(csv_path), parquet_path)
+    return csv_path, parquet_path
+
+
+def main(rows=1_000_000):
+    rows = int(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, parquet_path = build(rows, directory)
+        print(f"{rows} rows: CSV {os.path.getsize(csv_path) / 2**20:.1f} MiB, "
+              f"Parquet {os.path.getsize(parquet_path) / 2**20:.1f} MiB")
+        print(f"{'':<32} {'load s':>8} {'RSS MiB':>9}")
+        for label, code in MODES.items():
+            script = SETUP + f"CSV, PARQUET = {csv_path!r}, {parquet_path!r}\n" + code + REPORT
+            out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+            elapsed, rss, _ = out.stdout.split()
+            print(f"{label:<32} {float(elapsed):>8.3f} {float(rss):>9.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,69 @@
+"""A classroom opening the Wellness Guide at once: generations with and without the service.
+
+    python benchmarks/suggestion_load.py [students] [generation_seconds]
+
+Every student requests suggestions concurrently from a handful of distinct
+profiles, against a generator that sleeps like a remote (LLM) call. "direct"
+calls the generator per request; "cold" goes through a fresh
+``SuggestionService`` (coalescing only); "warm" repeats with the disk tier
+filled, as after a restart.
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import suggestions
+
+PROFILES = [
+    suggestions.suggestion_key(risk, gender, "Balanced", age, stress)
+    for risk in ("High", "Moderate", "Low")
+    for gender in ("Female", "Male")
+    for age, stress in ((19, 8), (22, 4))
+]
+
+
+def slow_generator(seconds, calls):
+    lock = threading.Lock()
+
+    def generate(key):
+        with lock:
+            calls[0] += 1
+        time.sleep(seconds)
+        return suggestions.template_suggestions(key)
+    return generate
+
+
+def run(get, students):
+    rng = random.Random(0)
+    keys = [rng.choice(PROFILES) for _ in range(students)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=students) as pool:
+        list(pool.map(get, keys))
+    return time.perf_counter() - start
+
+
+def main(students=200, seconds=0.5):
+    students, seconds = int(students), float(seconds)
+    print(f"{students} students, {len(PROFILES)} distinct profiles, {seconds}s per generation")
+    print(f"{'':<8} {'generations':>12} {'wall s':>8}")
+
+    calls = [0]
+    elapsed = run(slow_generator(seconds, calls), students)
+    print(f"{'direct':<8} {calls[0]:>12} {elapsed:>8.2f}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ("cold", "warm"):
+            calls = [0]
+            service = suggestions.SuggestionService(slow_generator(seconds, calls), cache_dir=cache_dir)
+            elapsed = run(service.get, students)
+            print(f"{label:<8} {calls[0]:>12} {elapsed:>8.2f}   {service.stats}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,52 @@
+"""Stylesheet payload per rerun: inline f-string CSS vs the linked static theme.
+
+    python benchmarks/theme_payload.py [reruns]
+
+"Before" rebuilds the stylesheet and sends it inline on every rerun, as the
+app used to. "After" sends the cached ``<link>`` tag for the compiled file.
+Sizes are the serialized Markdown element each rerun puts on the wire.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.proto.Markdown_pb2 import Markdown
+
+import theme
+
+
+def element_bytes(body):
+    return Markdown(body=body, allow_html=True).ByteSize()
+
+
+def per_rerun_us(fn, reruns):
+    start = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    return (time.perf_counter() - start) / reruns * 1e6
+
+
+def main(reruns=1000):
+    reruns = int(reruns)
+    print(f"{'theme':<8} {'inline bytes':>12} {'linked bytes':>12} {'inline us':>10} {'linked us':>10}")
+    for name, palette in theme.THEMES.items():
+        def inline():
+            return f"<style>\n{theme.STYLESHEET.format(**palette)}\n</style>"
+
+        def linked():
+            return theme.theme_markup(name, True)
+
+        print(
+            f"{name:<8} {element_bytes(inline()):>12} {element_bytes(linked()):>12} "
+            f"{per_rerun_us(inline, reruns):>10.1f} {per_rerun_us(linked, reruns):>10.2f}"
+        )
+    inline_total = element_bytes(theme.theme_markup(theme.THEME, False)) * reruns
+    linked_total = element_bytes(theme.theme_markup(theme.THEME, True)) * reruns
+    print(f"\nOver {reruns} reruns of the {theme.THEME!r} theme: "
+          f"{inline_total / 1024:.0f} KiB inline vs {linked_total / 1024:.0f} KiB linked")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,179 @@
+"""Wellness chat: streaming providers and a token-bounded conversation.
+
+Providers share one interface, ``stream(messages, max_tokens)``, which yields
+the reply text chunk by chunk:
+
+- ``OpenAIProvider`` streams chat completions. Point ``OPENAI_BASE_URL`` at
+  ``stub_server.py`` (``http://127.0.0.1:8765/v1``) to run it offline.
+- ``MockProvider`` generates canned replies in-process for development.
+
+``Conversation`` keeps the prompt under a fixed token budget by folding the
+oldest turns into a short running summary.
+"""
+import os
+import re
+import time
+
+PROVIDER_ENV = "NATUREMIND_CHAT_PROVIDER"
+MODEL_ENV = "NATUREMIND_CHAT_MODEL"
+DEFAULT_MODEL = "gpt-4o-mini"
+PLACEHOLDER_KEYS = {"", "OPENAI_API_KEY", "your-api-key-here"}
+
+PROMPT_BUDGET = 1500   # tokens for system prompt + summary + recent turns
+REPLY_TOKENS = 400
+SUMMARY_BUDGET = 300
+
+_STATEMENT = re.compile(r" (?=(?:Student|Companion): )")
+
+COMPANIONS = {"female": "Willow", "male": "Rowan"}
+
+SYSTEM_PROMPT = (
+    "You are {companion}, the NatureMind wellness companion for students. "
+    "Be warm, brief and practical; suggest small nature-based habits. "
+    "You are not a therapist: if the student mentions self-harm or a crisis, "
+    "encourage them to contact local emergency services or a counselor. "
+    "Student: {name}. Latest mood check: {mood} (burnout risk: {risk})."
+)
+
+
+def count_tokens(text):
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _first_sentence(text, limit=120):
+    sentence = re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1] + "…"
+
+
+# ========= Conversation ========
+class Conversation:
+    """Chat turns plus a running summary of the turns that no longer fit.
+
+    Works on plain lists/strings so it can wrap ``st.session_state`` values.
+    """
+
+    def __init__(self, turns=None, summary="", budget=PROMPT_BUDGET,
+                 summary_budget=SUMMARY_BUDGET):
+        self.turns = turns if turns is not None else []
+        self.summary = summary
+        self.budget = budget
+        self.summary_budget = summary_budget
+
+    def add(self, role, content):
+        self.turns.append({"role": role, "content": content})
+
+    def messages(self, system):
+        """Prompt messages within the budget, compacting old turns first."""
+        self.compact(count_tokens(system))
+        messages = [{"role": "system", "content": system}]
+        if self.summary:
+            messages.append({"role": "system", "content": self._summary_prompt()})
+        return messages + list(self.turns)
+
+    def _summary_prompt(self):
+        return f"Summary of the earlier conversation: {self.summary}" if self.summary else ""
+
+    def compact(self, reserved=0):
+        """Fold the oldest turns into the summary until the prompt fits."""
+        def size():
+            return reserved + count_tokens(self._summary_prompt()) + sum(
+                count_tokens(t["content"]) for t in self.turns
+            )
+
+        # Always keep the latest turn, even if it alone exceeds the budget
+        while len(self.turns) > 1 and size() > self.budget:
+            turn = self.turns.pop(0)
+            speaker = "Student" if turn["role"] == "user" else "Companion"
+            self.summary = f"{self.summary} {speaker}: {_first_sentence(turn['content'])}".strip()
+        while count_tokens(self.summary) > self.summary_budget:
+            # Drop the oldest summarized statement
+            parts = _STATEMENT.split(self.summary, maxsplit=1)
+            self.summary = parts[1] if len(parts) > 1 else ""
+
+
+# ========= Providers ========
+class ChatProvider:
+    name = None
+
+    def stream(self, messages, max_tokens=REPLY_TOKENS):
+        """Yield the assistant reply in chunks."""
+        raise NotImplementedError
+
+
+class OpenAIProvider(ChatProvider):
+    name = "openai"
+
+    def __init__(self, api_key=None, model=None, base_url=None, timeout=30):
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=1)
+        self.model = model or os.environ.get(MODEL_ENV, DEFAULT_MODEL)
+
+    def stream(self, messages, max_tokens=REPLY_TOKENS):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class MockProvider(ChatProvider):
+    """Offline replies streamed word by word, with an optional per-word delay."""
+    name = "mock"
+
+    REPLIES = {
+        ("exam", "test", "assignment", "deadline"): (
+            "Deadlines can feel heavy. Try splitting the next task into 25-minute "
+            "blocks with a short walk outside between them."
+        ),
+        ("sleep", "tired", "insomnia"): (
+            "Rest matters a lot. A screen-free half hour before bed and some "
+            "morning sunlight can help reset your sleep rhythm."
+        ),
+        ("stress", "anxious", "overwhelmed", "nervous"): (
+            "That sounds stressful. Let's try box breathing together: in for 4, "
+            "hold for 4, out for 4, hold for 4."
+        ),
+    }
+    DEFAULT = (
+        "Thanks for sharing. What is one small thing, like a walk or a glass of "
+        "water, that could make the next hour a little better?"
+    )
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+
+    def reply(self, messages):
+        text = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "").lower()
+        for keywords, reply in self.REPLIES.items():
+            if any(k in text for k in keywords):
+                return reply
+        return self.DEFAULT
+
+    def stream(self, messages, max_tokens=REPLY_TOKENS):
+        for i, word in enumerate(self.reply(messages).split(" ")[:max_tokens]):
+            if self.delay:
+                time.sleep(self.delay)
+            yield word if i == 0 else " " + word
+
+
+def api_key(secrets=None):
+    """OpenAI key from Streamlit secrets or the environment, ignoring placeholders."""
+    key = (secrets or {}).get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY", "")
+    return None if key in PLACEHOLDER_KEYS else key
+
+
+def get_provider(secrets=None):
+    """Provider named by ``NATUREMIND_CHAT_PROVIDER``, else OpenAI when a key is set."""
+    key = api_key(secrets)
+    name = os.environ.get(PROVIDER_ENV) or ("openai" if key or os.environ.get("OPENAI_BASE_URL") else "mock")
+    if name == "openai":
+        return OpenAIProvider(api_key=key or "stub")
+    if name == "mock":
+        return MockProvider()
+    raise ValueError(f"Unknown chat provider: {name!r}")
@@ -0,0 +1,98 @@
+"""Card components for the pages.
+
+Each helper returns an HTML fragment memoized on its inputs, so a rerun with
+the same risk level, name or colours reuses the markup it built last time.
+``show`` sends a whole group of fragments as a single markdown element,
+e.g. the schedule card and all of its routine items.
+"""
+from functools import lru_cache
+from html import escape
+
+import streamlit as st
+
+from theme import accent_color
+
+
+def show(*fragments):
+    """Render ``fragments`` as one element."""
+    st.markdown("".join(fragments), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def suggestion_card(title, text="", items=(), kind="suggestion-card"):
+    """Card with an ``<h4>`` title, an optional paragraph and bullet items.
+
+    ``title`` and ``items`` may contain trusted markup; ``text`` is escaped.
+    """
+    body = f"<h4>{title}</h4>"
+    if text:
+        body += f"<p>{escape(text)}</p>"
+    if items:
+        body += "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+    return f'<div class="{kind}">{body}</div>'
+
+
+@lru_cache(maxsize=256)
+def result_card(title, value, color=None):
+    """Big-number card; ``color`` tints the title and the left border."""
+    border = f' style="border-left-color: {color}"' if color else ""
+    return (
+        f'<div class="result-card"{border}>'
+        f'<h3 style="color:{color or accent_color}">{escape(title)}</h3>'
+        f'<p style="font-size:24px; margin-bottom:0;">{escape(str(value))}</p>'
+        f"</div>"
+    )
+
+
+@lru_cache(maxsize=64)
+def card_row(*cards):
+    """Lay cards out side by side, as ``st.columns`` would."""
+    return '<div class="card-row">' + "".join(cards) + "</div>"
+
+
+@lru_cache(maxsize=64)
+def routine(items):
+    """Time/activity rows for a tuple of ``(time, activity)`` pairs."""
+    return "".join(
+        f'<div class="routine-item">'
+        f'<div class="routine-time">{escape(time)}</div>'
+        f'<div class="routine-activity">{escape(activity)}</div>'
+        f"</div>"
+        for time, activity in items
+    )
+
+
+def chat_bubble(role, content):
+    """Chat bubble for a ``user`` or ``assistant`` turn; ``content`` is escaped.
+
+    Not cached: use it for text that is still streaming in.
+    """
+    kind = "user-message" if role == "user" else "bot-message"
+    text = escape(content).replace("\n", "<br>")
+    return f'<div class="chat-message {kind}">{text}</div>'
+
+
+@lru_cache(maxsize=256)
+def chat_message(role, content):
+    """``chat_bubble`` for a finished turn, memoized across reruns."""
+    return chat_bubble(role, content)
+
+
+@lru_cache(maxsize=256)
+def dashboard_card(risk, age, lifestyle, mood_color, mood_score):
+    return (
+        '<div class="result-card">'
+        '<div style="display: flex; justify-content: space-between; align-items: center;">'
+        "<div>"
+        "<h3>Your Wellness Dashboard</h3>"
+        f"<p>Risk Level: <strong>{escape(str(risk))}</strong></p>"
+        f"<p>Age: <strong>{escape(str(age))}</strong> | "
+        f"Lifestyle: <strong>{escape(str(lifestyle))}</strong></p>"
+        "</div>"
+        '<div style="text-align: right;">'
+        f'<p style="font-size: 24px; margin: 0; color: {mood_color}">{mood_score:.1f}/10</p>'
+        "<p>Wellness Score</p>"
+        "</div>"
+        "</div>"
+        "</div>"
+    )
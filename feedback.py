@@ -0,0 +1,143 @@
+"""Buffered, lock-safe feedback writer.
+
+Submissions are queued and written in batches by one background thread per
+process. Each batch is appended under an exclusive file lock, so several
+server processes can share the same directory, and the active file is
+rotated by size or by day.
+"""
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+from datetime import date, datetime
+
+from locks import file_lock
+
+log = logging.getLogger(__name__)
+
+FEEDBACK_DIR = "data"
+FEEDBACK_FILE = "feedback.csv"
+HEADER = ["name", "date", "rating", "feedback"]
+
+
+class FeedbackSink:
+    """Queue rows and append them to ``directory/filename`` in batches.
+
+    The active file is rotated to ``feedback-YYYY-MM-DD[-N].csv`` once it
+    reaches ``max_bytes`` or when it was last written on an earlier day.
+    With ``fsync`` every batch is forced to disk before it is acknowledged.
+    """
+
+    def __init__(self, directory=FEEDBACK_DIR, filename=FEEDBACK_FILE,
+                 max_bytes=5 * 1024 * 1024, rotate_daily=True,
+                 batch_size=200, flush_interval=0.5, fsync=True):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.lock_path = self.path + ".lock"
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._queue = queue.Queue()
+        self._pending = []  # rows from a failed write, retried first
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, rating, feedback, when=None):
+        """Queue one feedback row; returns immediately."""
+        if self._closed:
+            raise RuntimeError("FeedbackSink is closed")
+        when = when or datetime.now()
+        self._queue.put([name, when.strftime("%Y-%m-%d"), rating, feedback])
+
+    def flush(self):
+        """Block until every queued row has been written (or has failed)."""
+        self._queue.join()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._pending:
+                    self._write_batch([])
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write_batch([row for row in batch if row is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, rows):
+        rows = self._pending + rows
+        if not rows:
+            return
+        try:
+            self._append(rows)
+            self._pending = []
+        except OSError:
+            log.exception("Could not write %d feedback rows; will retry", len(rows))
+            self._pending = rows
+
+    def _append(self, rows):
+        with file_lock(self.lock_path):
+            self._rotate_if_needed()
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(HEADER)
+                writer.writerows(rows)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+    def _rotate_if_needed(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        last_written = date.fromtimestamp(stat.st_mtime)
+        if stat.st_size < self.max_bytes and not (
+            self.rotate_daily and last_written < date.today()
+        ):
+            return
+        stem, ext = os.path.splitext(os.path.basename(self.path))
+        target = os.path.join(self.directory, f"{stem}-{last_written.isoformat()}{ext}")
+        n = 1
+        while os.path.exists(target):
+            n += 1
+            target = os.path.join(self.directory, f"{stem}-{last_written.isoformat()}-{n}{ext}")
+        os.replace(self.path, target)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    """The process-wide sink, started on first use and flushed at exit."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = FeedbackSink()
+            atexit.register(_sink.close)
+        return _sink
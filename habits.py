@@ -0,0 +1,218 @@
+"""Daily habit history packed one byte per user per day.
+
+Bit ``i`` of a day's byte is ``HABITS[i]``. Each calendar year is one file
+under ``data/habits/`` holding a 366-byte row per user (indexed by day of
+the year); ``users.txt`` lists the users, one per line, in row order:
+
+    data/habits/users.txt
+    data/habits/2026.bin    # row * 366 + day of year -> habit bits
+
+Ticking a habit rewrites one byte in place and a new user appends a line,
+so a year for 10,000 students is 3.6 MB. ``masks`` reads one user's row
+slice; ``cohort`` maps a whole year file as a ``users x days`` array. The
+statistics below work on such arrays with bit operations and NumPy
+reductions, never a loop over days or users.
+"""
+import os
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+import locks
+
+HABITS_DIR = os.path.join("data", "habits")
+HABITS = [
+    "Morning sunlight", "Hydration (8 glasses)", "30-min exercise", "Healthy meals",
+    "Digital detox", "Quality sleep", "Mindfulness",
+]
+ALL = (1 << len(HABITS)) - 1
+DAY_GOAL = 5        # habits that make a day count towards the streak
+ROW = 366           # bytes per user per year file
+
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class HabitStore:
+    """Per-user daily habit bytes in one file per year, shared by processes."""
+
+    def __init__(self, path=HABITS_DIR):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._users_path = os.path.join(path, "users.txt")
+        self._rows = {}
+        self._users_size = 0
+        self._lock = threading.Lock()
+        self._reload_users()
+
+    def _reload_users(self):
+        """Pick up users appended by other processes since the last read."""
+        try:
+            size = os.path.getsize(self._users_path)
+        except OSError:
+            return
+        if size == self._users_size:
+            return
+        with open(self._users_path, "rb") as f:
+            f.seek(self._users_size)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]  # ignore a line still being written
+        for name in data.decode().splitlines():
+            self._rows[name] = len(self._rows)
+        self._users_size += len(data)
+
+    def _row(self, user, create=False):
+        with self._lock:
+            if user not in self._rows:
+                self._reload_users()
+            if user not in self._rows and create:
+                with locks.file_lock(self._users_path + ".lock"):
+                    self._reload_users()
+                    if user not in self._rows:
+                        with open(self._users_path, "ab") as f:
+                            f.write(user.replace("\n", " ").encode() + b"\n")
+                        self._reload_users()
+            return self._rows.get(user)
+
+    def _year_path(self, year):
+        return os.path.join(self.path, f"{year}.bin")
+
+    def names(self):
+        """Every user, in row order (the rows of ``cohort``)."""
+        with self._lock:
+            self._reload_users()
+            return list(self._rows)
+
+    @property
+    def users(self):
+        with self._lock:
+            self._reload_users()
+            return len(self._rows)
+
+    def record(self, user, day, mask):
+        """Set ``user``'s habits for ``day`` to the bits of ``mask``."""
+        offset = self._row(user, create=True) * ROW + day.timetuple().tm_yday - 1
+        path = self._year_path(day.year)
+        if not os.path.exists(path):
+            open(path, "ab").close()
+        # seek + write rather than os.pwrite, which Windows lacks
+        with open(path, "r+b", buffering=0) as f:
+            f.seek(offset)
+            f.write(bytes([mask & ALL]))
+
+    def day(self, user, day):
+        return int(self.masks(user, day, day + timedelta(days=1))[0])
+
+    def masks(self, user, start, end):
+        """``user``'s habit bytes for ``start <= day < end`` (0 where unrecorded)."""
+        out = np.zeros(max(0, (end - start).days), dtype=np.uint8)
+        row = self._row(user)
+        if row is None:
+            return out
+        pos = 0
+        for year in range(start.year, end.year + 1):
+            first = max(start, date(year, 1, 1))
+            last = min(end, date(year + 1, 1, 1))
+            if first >= last:
+                continue
+            n = (last - first).days
+            try:
+                with open(self._year_path(year), "rb") as f:
+                    f.seek(row * ROW + first.timetuple().tm_yday - 1)
+                    data = f.read(n)
+            except FileNotFoundError:
+                data = b""
+            out[pos:pos + len(data)] = np.frombuffer(data, dtype=np.uint8)
+            pos += n
+        return out
+
+    def cohort(self, start, end):
+        """Every user's bytes for ``start <= day < end`` as a ``users x days`` array."""
+        users = self.users
+        out = np.zeros((users, max(0, (end - start).days)), dtype=np.uint8)
+        pos = 0
+        for year in range(start.year, end.year + 1):
+            first = max(start, date(year, 1, 1))
+            last = min(end, date(year + 1, 1, 1))
+            if first >= last:
+                continue
+            n = (last - first).days
+            path = self._year_path(year)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size:
+                # The file ends at the last byte written, usually inside the last row
+                rows = min(users, -(-size // ROW))
+                flat = np.memmap(path, dtype=np.uint8, mode="r")[:rows * ROW]
+                if len(flat) < rows * ROW:
+                    flat = np.concatenate([flat, np.zeros(rows * ROW - len(flat), dtype=np.uint8)])
+                begin = first.timetuple().tm_yday - 1
+                out[:rows, pos:pos + n] = flat.reshape(rows, ROW)[:, begin:begin + n]
+            pos += n
+        return out
+
+    def size(self):
+        """Bytes on disk: the user list plus every year file."""
+        return sum(e.stat().st_size for e in os.scandir(self.path) if not e.name.endswith(".lock"))
+
+
+# ========= Statistics ========
+def count(masks):
+    """Habits done per day."""
+    if hasattr(np, "bitwise_count"):  # NumPy 2
+        return np.bitwise_count(masks)
+    return POPCOUNT[masks]
+
+
+def bits(masks):
+    """``(..., days, habits)`` 0/1 array of the individual habits."""
+    return (masks[..., None] >> np.arange(len(HABITS), dtype=np.uint8)) & 1
+
+
+def _trailing(met):
+    """Run of True at the end of the last axis, where the last day (today)
+    only extends a run: a day that is not done yet does not break it."""
+    if not met.shape[-1]:
+        return np.zeros(met.shape[:-1], dtype=np.int64)
+    past = met[..., :-1]
+    run = np.where(past.all(axis=-1), past.shape[-1], np.argmin(past[..., ::-1], axis=-1))
+    return run + met[..., -1]
+
+
+def streak(masks, goal=DAY_GOAL):
+    """Days in a row with at least ``goal`` habits, ending today, per row."""
+    return _trailing(count(masks) >= goal)
+
+
+def habit_streaks(masks):
+    """Days in a row each habit was done, ending today: ``(..., habits)``."""
+    return _trailing(np.moveaxis(bits(masks).astype(bool), -1, -2))
+
+
+def adherence(masks):
+    """Share of days each habit was done, per row: ``(..., habits)``."""
+    days = masks.shape[-1]
+    if not days:
+        return np.zeros(masks.shape[:-1] + (len(HABITS),))
+    return np.stack([(masks >> i & 1).sum(axis=-1, dtype=np.int32) for i in range(len(HABITS))],
+                    axis=-1) / days
+
+
+def completion(masks):
+    """Share of all habit ticks done over the days, per row."""
+    days = masks.shape[-1]
+    return count(masks).sum(axis=-1, dtype=np.int64) / (days * len(HABITS)) if days else 0.0
+
+
+def history_start(today, days=90):
+    return today - timedelta(days=days - 1)
+
+
+def summary(masks):
+    """Dashboard figures for one user's bytes ending today."""
+    return {
+        "streak": int(streak(masks)),
+        "habit_streaks": habit_streaks(masks).tolist(),
+        "week": completion(masks[-7:]),
+        "adherence_30": adherence(masks[-30:]).tolist(),
+        "adherence": adherence(masks).tolist(),
+    }
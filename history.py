@@ -0,0 +1,322 @@
+"""Persistent mood-check history.
+
+Every analysis from the Mood Check page is appended to an embedded SQLite
+database (WAL mode) indexed on ``(user, created_at)``, so dashboard figures
+are answered with indexed range queries rather than by rescanning a file.
+
+Cohort rollups (moods per day, sleep and screen time per risk band) are
+kept in their own tables and updated by a trigger on every insert, so
+reading them costs the same however many checks have been recorded.
+
+Sleep is kept per user and night in ``sleep_nights``: nights logged on the
+Sleep tab, plus the "hours slept" of each mood check for nights that were
+not logged explicitly (filled in by another trigger).
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, time, timedelta
+
+DB_PATH = os.path.join("data", "history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mood_checks (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    mood TEXT NOT NULL,
+    mood_score REAL NOT NULL,
+    risk TEXT NOT NULL,
+    sleep_hours REAL,
+    screen_time REAL,
+    outdoor_time REAL,
+    exercise TEXT,
+    journal_entry TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mood_checks_user_time ON mood_checks (user, created_at);
+"""
+
+# Created together with a one-off backfill from the existing checks
+ROLLUPS = [
+    """CREATE TABLE daily_moods (
+        day TEXT NOT NULL,
+        mood TEXT NOT NULL,
+        checks INTEGER NOT NULL,
+        PRIMARY KEY (day, mood)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE risk_habits (
+        risk TEXT PRIMARY KEY,
+        checks INTEGER NOT NULL,
+        sleep_total REAL NOT NULL,
+        sleep_checks INTEGER NOT NULL,
+        screen_total REAL NOT NULL,
+        screen_checks INTEGER NOT NULL
+    )""",
+    """INSERT INTO daily_moods
+        SELECT substr(created_at, 1, 10), mood, COUNT(*) FROM mood_checks GROUP BY 1, 2""",
+    """INSERT INTO risk_habits
+        SELECT risk, COUNT(*), TOTAL(sleep_hours), COUNT(sleep_hours),
+               TOTAL(screen_time), COUNT(screen_time)
+        FROM mood_checks GROUP BY risk""",
+    """CREATE TRIGGER mood_checks_rollup AFTER INSERT ON mood_checks BEGIN
+        INSERT INTO daily_moods VALUES (substr(NEW.created_at, 1, 10), NEW.mood, 1)
+            ON CONFLICT (day, mood) DO UPDATE SET checks = checks + 1;
+        INSERT INTO risk_habits VALUES (
+            NEW.risk, 1,
+            IFNULL(NEW.sleep_hours, 0), NEW.sleep_hours IS NOT NULL,
+            IFNULL(NEW.screen_time, 0), NEW.screen_time IS NOT NULL
+        ) ON CONFLICT (risk) DO UPDATE SET
+            checks = checks + 1,
+            sleep_total = sleep_total + excluded.sleep_total,
+            sleep_checks = sleep_checks + excluded.sleep_checks,
+            screen_total = screen_total + excluded.screen_total,
+            screen_checks = screen_checks + excluded.screen_checks;
+    END""",
+]
+
+SLEEP = [
+    """CREATE TABLE sleep_nights (
+        user TEXT NOT NULL,
+        night TEXT NOT NULL,
+        hours REAL NOT NULL,
+        quality INTEGER,
+        issues TEXT,
+        source TEXT NOT NULL,
+        revision INTEGER NOT NULL,
+        PRIMARY KEY (user, night)
+    ) WITHOUT ROWID""",
+    """INSERT INTO sleep_nights
+        SELECT user, substr(created_at, 1, 10), AVG(sleep_hours), NULL, NULL, 'check-in', 1
+        FROM mood_checks WHERE sleep_hours IS NOT NULL GROUP BY 1, 2""",
+    """CREATE TRIGGER mood_checks_sleep AFTER INSERT ON mood_checks
+    WHEN NEW.sleep_hours IS NOT NULL BEGIN
+        INSERT INTO sleep_nights VALUES (
+            NEW.user, substr(NEW.created_at, 1, 10), NEW.sleep_hours, NULL, NULL, 'check-in',
+            (SELECT IFNULL(MAX(revision), 0) + 1 FROM sleep_nights WHERE user = NEW.user)
+        ) ON CONFLICT (user, night) DO UPDATE SET
+            hours = excluded.hours,
+            revision = excluded.revision
+        WHERE source = 'check-in';
+    END""",
+]
+
+# Trigger whose presence marks each set of statements as applied
+MIGRATIONS = [("mood_checks_rollup", ROLLUPS), ("mood_checks_sleep", SLEEP)]
+
+COLUMNS = [
+    "mood", "mood_score", "risk", "sleep_hours", "screen_time",
+    "outdoor_time", "exercise", "journal_entry",
+]
+
+
+def _stamp(value):
+    """ISO timestamp for a date or datetime (dates mean midnight)."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    return value.isoformat(timespec="seconds")
+
+
+class HistoryStore:
+    """Thread-safe handle on the history database, shared per process."""
+
+    def __init__(self, path=DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self._conn.close()
+
+    def _migrate(self):
+        # IMMEDIATE so no check can be inserted between a backfill and its trigger
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for trigger, statements in MIGRATIONS:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (trigger,)
+                ).fetchone()
+                if not exists:
+                    for statement in statements:
+                        self._conn.execute(statement)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def record(self, user, mood_data, when=None):
+        """Append one analysis (a ``mood_data`` dict) and return its row id."""
+        row = [_stamp(when or datetime.now())] + [mood_data.get(c) for c in COLUMNS]
+        with self._lock:
+            cur = self._conn.execute(
+                f"INSERT INTO mood_checks (user, created_at, {', '.join(COLUMNS)}) "
+                f"VALUES (?, ?{', ?' * len(COLUMNS)})",
+                [user] + row,
+            )
+            return cur.lastrowid
+
+    def between(self, user, start, end):
+        """Checks by ``user`` with ``start <= created_at < end``, oldest first."""
+        return self._query(
+            "SELECT * FROM mood_checks WHERE user = ? AND created_at >= ? AND created_at < ? "
+            "ORDER BY created_at",
+            (user, _stamp(start), _stamp(end)),
+        )
+
+    def since(self, last_id, limit=-1):
+        """Checks by any user with ``id > last_id``, in insertion order."""
+        return self._query(
+            "SELECT * FROM mood_checks WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)
+        )
+
+    def daily(self, user, start, end):
+        """Per-day averages (``day``, ``checks``, ``mood_score``, ``sleep_hours``)."""
+        return self._query(
+            "SELECT substr(created_at, 1, 10) AS day, COUNT(*) AS checks, "
+            "AVG(mood_score) AS mood_score, AVG(sleep_hours) AS sleep_hours "
+            "FROM mood_checks WHERE user = ? AND created_at >= ? AND created_at < ? "
+            "GROUP BY day ORDER BY day",
+            (user, _stamp(start), _stamp(end)),
+        )
+
+    def streak(self, user, today=None):
+        """Consecutive days with a check-in, ending today or yesterday."""
+        today = today or date.today()
+        expected = today
+        streak = 0
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT DISTINCT substr(created_at, 1, 10) FROM mood_checks "
+                "WHERE user = ? AND created_at < ? ORDER BY created_at DESC",
+                (user, _stamp(today + timedelta(days=1))),
+            )
+            # Walk back through the index and stop at the first gap
+            for (day,) in cur:
+                day = date.fromisoformat(day)
+                if streak == 0 and day == today - timedelta(days=1):
+                    expected = day
+                if day != expected:
+                    break
+                streak += 1
+                expected -= timedelta(days=1)
+        return streak
+
+    def progress(self, user, today=None):
+        """Dashboard figures for the last 7 days against the 7 before them.
+
+        Returns ``streak``, ``checked_in_today``, ``days_this_week``,
+        ``score_this_week``, ``score_last_week`` and ``improvement`` (a
+        fraction, or ``None`` when there is nothing to compare against).
+        """
+        today = today or date.today()
+        week_start = today - timedelta(days=6)
+        last_week_start = week_start - timedelta(days=7)
+        days = self.daily(user, last_week_start, today + timedelta(days=1))
+
+        this_week = [d for d in days if d["day"] >= week_start.isoformat()]
+        last_week = [d for d in days if d["day"] < week_start.isoformat()]
+
+        def mean_score(rows):
+            checks = sum(r["checks"] for r in rows)
+            if not checks:
+                return None
+            return sum(r["mood_score"] * r["checks"] for r in rows) / checks
+
+        score_this_week = mean_score(this_week)
+        score_last_week = mean_score(last_week)
+        improvement = None
+        if score_this_week is not None and score_last_week:
+            improvement = (score_this_week - score_last_week) / abs(score_last_week)
+
+        return {
+            "streak": self.streak(user, today),
+            "checked_in_today": any(d["day"] == today.isoformat() for d in this_week),
+            "days_this_week": len(this_week),
+            "score_this_week": score_this_week,
+            "score_last_week": score_last_week,
+            "improvement": improvement,
+        }
+
+    # ----- sleep -----
+    def record_sleep(self, user, night, hours, quality=None, issues=()):
+        """Log one night (the date it ended), replacing any earlier entry for it."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sleep_nights VALUES (?, ?, ?, ?, ?, 'log', "
+                "(SELECT IFNULL(MAX(revision), 0) + 1 FROM sleep_nights WHERE user = ?)) "
+                "ON CONFLICT (user, night) DO UPDATE SET hours = excluded.hours, "
+                "quality = excluded.quality, issues = excluded.issues, "
+                "source = excluded.source, revision = excluded.revision",
+                (user, night.isoformat(), hours, quality, json.dumps(list(issues)), user),
+            )
+
+    def sleep_nights(self, user, start, end):
+        """Nights with ``start <= night < end``, oldest first."""
+        return self._query(
+            "SELECT night, hours, quality, issues, source FROM sleep_nights "
+            "WHERE user = ? AND night >= ? AND night < ? ORDER BY night",
+            (user, start.isoformat(), end.isoformat()),
+        )
+
+    def last_logged_night(self, user):
+        """The most recent night logged on the Sleep tab, or ``None``."""
+        rows = self._query(
+            "SELECT night, hours, quality, issues FROM sleep_nights "
+            "WHERE user = ? AND source = 'log' ORDER BY night DESC LIMIT 1",
+            (user,),
+        )
+        if not rows:
+            return None
+        return dict(rows[0], issues=json.loads(rows[0]["issues"] or "[]"))
+
+    def sleep_version(self, user):
+        """Revision of ``user``'s latest sleep write; a cache key for derived data."""
+        return self._query(
+            "SELECT IFNULL(MAX(revision), 0) FROM sleep_nights WHERE user = ?", (user,)
+        )[0][0]
+
+    # ----- every user -----
+    def checks_between(self, start, end):
+        """Checks by every user with ``start <= created_at < end``, by user and time."""
+        return self._query(
+            "SELECT user, created_at, mood, mood_score, risk FROM mood_checks "
+            "WHERE created_at >= ? AND created_at < ? ORDER BY user, created_at",
+            (_stamp(start), _stamp(end)),
+        )
+
+    def nights_between(self, start, end):
+        """Sleep of every user with ``start <= night < end``, by user and night."""
+        return self._query(
+            "SELECT user, night, hours FROM sleep_nights "
+            "WHERE night >= ? AND night < ? ORDER BY user, night",
+            (start.isoformat(), end.isoformat()),
+        )
+
+    # ----- cohort rollups -----
+    def mood_distribution(self, start, end):
+        """Checks per ``day`` and ``mood`` across all users, ``start <= day < end``."""
+        return self._query(
+            "SELECT day, mood, checks FROM daily_moods WHERE day >= ? AND day < ? "
+            "ORDER BY day, mood",
+            (start.isoformat(), end.isoformat()),
+        )
+
+    def risk_habits(self):
+        """Average sleep and screen time per risk band across all users."""
+        return self._query(
+            "SELECT risk, checks, "
+            "sleep_total / NULLIF(sleep_checks, 0) AS sleep_hours, "
+            "screen_total / NULLIF(screen_checks, 0) AS screen_time "
+            "FROM risk_habits ORDER BY risk"
+        )
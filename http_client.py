@@ -0,0 +1,82 @@
+"""Shared HTTP client for external assets.
+
+One keep-alive ``requests.Session`` per process with a sized connection pool,
+retries with exponential backoff on connection errors and 429/5xx responses,
+and a cap on how many requests are in flight at once. ``fetch_many`` fetches
+a batch of URLs in parallel over the pooled connections.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+POOL_SIZE = 10
+MAX_CONCURRENCY = 8
+TIMEOUT = (2, 5)  # (connect, read) seconds
+RETRIES = 2
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    def __init__(self, pool_size=POOL_SIZE, max_concurrency=MAX_CONCURRENCY,
+                 timeout=TIMEOUT, retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="http")
+
+    def get(self, url, headers=None, timeout=None):
+        """GET ``url`` over the pool; waits for a free slot when saturated."""
+        with self._slots:
+            return self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+
+    def fetch_many(self, urls, headers=None, timeout=None):
+        """GET every URL in parallel and return ``{url: response or None}``.
+
+        ``headers`` is either one dict for all requests or a callable taking
+        the URL and returning its headers. Failed requests map to ``None``.
+        """
+        urls = list(dict.fromkeys(urls))
+
+        def fetch(url):
+            h = headers(url) if callable(headers) else headers
+            try:
+                return self.get(url, headers=h, timeout=timeout)
+            except requests.RequestException as e:
+                log.warning("GET %s failed: %s", url, e)
+                return None
+
+        return dict(zip(urls, self._executor.map(fetch, urls)))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
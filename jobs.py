@@ -0,0 +1,119 @@
+"""Bounded background job queue for work that must not block a script run.
+
+``JobQueue.submit`` hands the call to a small thread pool and returns a
+``Job`` handle immediately; pages keep only the job id in session state and
+poll it on later reruns. At most ``workers + max_pending`` jobs are admitted
+at once; beyond that ``submit`` raises ``QueueFull`` straight away so the
+page can ask the user to retry instead of piling up work. Every job has a
+deadline: a job still queued then is cancelled, and one still running is
+reported as timed out and its eventual result discarded (threads cannot be
+killed, so its slot frees up only when it returns).
+"""
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+WORKERS = 4
+MAX_PENDING = 16
+TIMEOUT = 15     # seconds from submission until a job is given up on
+RETAIN = 300     # seconds a finished, uncollected job is kept
+
+PENDING, RUNNING, DONE, FAILED, TIMED_OUT = "pending", "running", "done", "failed", "timed out"
+
+
+class QueueFull(Exception):
+    """Raised by ``submit`` when every worker is busy and the backlog is full."""
+
+
+class Job:
+    def __init__(self, job_id, timeout):
+        self.id = job_id
+        self.future = None
+        self.submitted = time.monotonic()
+        self.deadline = self.submitted + timeout
+        self.started = None
+        self.finished = None
+
+    @property
+    def status(self):
+        if self.future.done():
+            if self.future.cancelled():
+                return TIMED_OUT
+            if self.finished > self.deadline:
+                return TIMED_OUT
+            return FAILED if self.future.exception() else DONE
+        if time.monotonic() > self.deadline:
+            self.future.cancel()  # only succeeds if it never started
+            return TIMED_OUT
+        return RUNNING if self.started else PENDING
+
+    def result(self):
+        """The return value once ``status`` is ``DONE``; re-raises on failure."""
+        status = self.status
+        if status == TIMED_OUT:
+            raise TimeoutError(f"job {self.id} exceeded its deadline")
+        if status not in (DONE, FAILED):
+            raise RuntimeError(f"job {self.id} is still {status}")
+        return self.future.result()
+
+
+class JobQueue:
+    def __init__(self, workers=WORKERS, max_pending=MAX_PENDING, timeout=TIMEOUT, retain=RETAIN):
+        self.timeout = timeout
+        self.retain = retain
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, timeout=None, **kwargs):
+        """Start ``fn(*args, **kwargs)`` in the background and return its ``Job``."""
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull("analysis queue is full")
+        self._prune()
+        job = Job(f"job-{next(self._ids)}", timeout or self.timeout)
+
+        def run():
+            job.started = time.monotonic()
+            try:
+                if job.started > job.deadline:
+                    raise TimeoutError(f"{job.id} expired before it started")
+                return fn(*args, **kwargs)
+            except Exception:
+                log.exception("Job %s failed", job.id)
+                raise
+            finally:
+                job.finished = time.monotonic()
+
+        try:
+            job.future = self._executor.submit(run)
+        except BaseException:
+            self._slots.release()
+            raise
+        job.future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        """The job with ``job_id``, or ``None`` if unknown or already collected."""
+        return self._jobs.get(job_id)
+
+    def pop(self, job_id):
+        """Forget a job once its result has been collected."""
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retain
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.deadline < cutoff]:
+                del self._jobs[job_id]
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
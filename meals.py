@@ -0,0 +1,162 @@
+"""Weekly meal plans: templates and a per-user store of changed cells.
+
+A plan is a ``{(day, meal): dish}`` grid over ``DAYS`` x ``MEALS``.
+``TEMPLATES`` holds ready-made weeks per nutrition branch (the same
+``female``/``default`` split as ``suggestions.NUTRITION_PLANS``).
+``MealPlanStore`` keeps one row per user and cell in ``data/meals.db``;
+``save`` is given only the cells that differ from what is stored (see
+``diff``), so editing one dish writes one row. ``meal_plan_users`` records
+who has saved at all, so a plan cleared on purpose stays empty instead of
+falling back to a template.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import suggestions
+
+DB_PATH = os.path.join("data", "meals.db")
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Weekend"]
+MEALS = ["Breakfast", "Lunch", "Dinner"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meal_plans (
+    user TEXT NOT NULL,
+    day TEXT NOT NULL,
+    meal TEXT NOT NULL,
+    dish TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user, day, meal)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meal_plan_users (
+    user TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _week(*days):
+    """Plan from one ``(breakfast, lunch, dinner)`` tuple per day in ``DAYS``."""
+    return {(day, meal): dish for day, dishes in zip(DAYS, days) for meal, dish in zip(MEALS, dishes)}
+
+
+# Template name -> plan, per nutrition branch; the first one is the default grid
+TEMPLATES = {
+    "female": {
+        "Balanced week": _week(
+            ("Greek yogurt with berries and nuts", "Salmon salad with quinoa", "Grilled chicken and roasted veg"),
+            ("Oatmeal with fruits", "Lentil soup with whole-grain bread", "Tofu stir-fry with brown rice"),
+            ("Spinach and feta omelette", "Chickpea and avocado wrap", "Baked cod with sweet potato"),
+            ("Chia pudding with mango", "Turkey and hummus salad", "Vegetable curry with rice"),
+            ("Whole-grain toast with avocado", "Quinoa bowl with roasted veggies", "Shrimp with couscous"),
+            ("Berry smoothie bowl", "Mediterranean mezze plate", "Homemade veggie pizza"),
+        ),
+        "Vegetarian": _week(
+            ("Overnight oats with seeds", "Caprese salad with beans", "Halloumi and vegetable skewers"),
+            ("Yogurt parfait with granola", "Falafel with tabbouleh", "Mushroom risotto"),
+            ("Scrambled eggs with spinach", "Black bean burrito bowl", "Paneer tikka with rice"),
+            ("Banana pancakes", "Minestrone with bread", "Stuffed peppers with lentils"),
+            ("Peanut butter toast and fruit", "Egg salad sandwich", "Vegetable lasagne"),
+            ("Shakshuka", "Pea and mint soup", "Sweet potato and chickpea curry"),
+        ),
+        "Exam week": _week(
+            ("Oatmeal with walnuts and blueberries", "Tuna and bean salad", "Salmon with broccoli and rice"),
+            ("Eggs on whole-grain toast", "Chicken and avocado wrap", "Beef and vegetable stir-fry"),
+            ("Yogurt with seeds and honey", "Lentil and feta salad", "Baked trout with potatoes"),
+            ("Berry and spinach smoothie", "Quinoa and roasted chickpeas", "Turkey meatballs with pasta"),
+            ("Peanut butter banana toast", "Sardines on rye with salad", "Chicken curry with brown rice"),
+            ("Veggie omelette", "Soup and wholemeal sandwich", "Grilled fish tacos"),
+        ),
+    },
+    "default": {
+        "Balanced week": _week(
+            ("Oatmeal with protein powder and banana", "Chicken rice bowl", "Lean beef with sweet potato"),
+            ("Eggs and whole-grain toast", "Tuna pasta salad", "Salmon with quinoa and greens"),
+            ("Greek yogurt with granola", "Turkey and veggie wrap", "Chicken stir-fry with noodles"),
+            ("Protein smoothie with oats", "Bean chili with rice", "Pork tenderloin with vegetables"),
+            ("Peanut butter toast and fruit", "Grilled chicken salad", "Fish with roasted potatoes"),
+            ("Veggie omelette", "Burrito bowl", "Homemade burgers with salad"),
+        ),
+        "Vegetarian": _week(
+            ("Oats with nuts and seeds", "Lentil dal with rice", "Tofu and vegetable stir-fry"),
+            ("Cottage cheese with fruit", "Chickpea salad sandwich", "Bean enchiladas"),
+            ("Eggs with beans on toast", "Quinoa and black bean bowl", "Paneer curry with naan"),
+            ("Protein smoothie", "Falafel wrap", "Vegetable and tempeh noodles"),
+            ("Yogurt with granola", "Halloumi salad", "Mushroom and lentil bolognese"),
+            ("Breakfast burrito", "Minestrone with bread", "Veggie pizza"),
+        ),
+        "Exam week": _week(
+            ("Oatmeal with walnuts and banana", "Chicken and avocado wrap", "Salmon with brown rice"),
+            ("Eggs and spinach on toast", "Tuna and bean salad", "Beef chili with rice"),
+            ("Greek yogurt with berries", "Turkey sandwich and soup", "Chicken pasta with vegetables"),
+            ("Peanut butter smoothie", "Lentil and quinoa bowl", "Baked cod with potatoes"),
+            ("Whole-grain cereal with milk", "Egg fried rice with veggies", "Pork and vegetable stir-fry"),
+            ("Veggie omelette", "Sardines on toast with salad", "Grilled chicken tacos"),
+        ),
+    },
+}
+
+
+def templates(gender):
+    """Templates for the nutrition branch of ``gender``."""
+    return TEMPLATES[suggestions.nutrition_branch(gender)]
+
+
+def diff(stored, plan):
+    """Cells of ``plan`` that differ from ``stored``, as ``{(day, meal): dish}``."""
+    return {cell: dish for cell, dish in plan.items() if stored.get(cell, "") != dish}
+
+
+class MealPlanStore:
+    """Thread-safe per-user meal plans, shared per process."""
+
+    def __init__(self, path=DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def plan(self, user):
+        """``user``'s stored cells, or ``None`` if they never saved a plan."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, meal, dish FROM meal_plans WHERE user = ?", (user,)
+            ).fetchall()
+            saved = rows or self._conn.execute(
+                "SELECT 1 FROM meal_plan_users WHERE user = ?", (user,)
+            ).fetchone()
+        return {(day, meal): dish for day, meal, dish in rows} if saved else None
+
+    def save(self, user, changes):
+        """Write ``{(day, meal): dish}`` cells in one transaction; empty dishes are removed."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO meal_plans VALUES (?, ?, ?, ?, ?) ON CONFLICT (user, day, meal) "
+                    "DO UPDATE SET dish = excluded.dish, updated_at = excluded.updated_at",
+                    [(user, day, meal, dish, now) for (day, meal), dish in changes.items() if dish],
+                )
+                self._conn.executemany(
+                    "DELETE FROM meal_plans WHERE user = ? AND day = ? AND meal = ?",
+                    [(user, day, meal) for (day, meal), dish in changes.items() if not dish],
+                )
+                self._conn.execute(
+                    "INSERT INTO meal_plan_users VALUES (?, ?) ON CONFLICT (user) "
+                    "DO UPDATE SET updated_at = excluded.updated_at",
+                    (user, now),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(changes)
@@ -0,0 +1,275 @@
+"""Timing spans for the rerun hot path.
+
+    with metrics.span("lottie"):
+        anim = cache.get(url)
+
+Every span feeds a process-wide histogram, served in the Prometheus text
+format at ``http://127.0.0.1:9464/metrics`` by ``MetricsServer`` (set
+``NATUREMIND_METRICS_PORT`` to move it, or to ``off``). Spans opened while a
+script run is being traced with ``rerun()`` are also collected into that
+run's ``Rerun``. Finished runs are written one JSON object per line to
+``data/logs/reruns.jsonl`` and can be shown in the sidebar debug panel;
+``ui.fragment`` and ``ui.poll`` trace each partial rerun the same way.
+
+Spans on other threads (background jobs, prefetches) only reach the
+histograms.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+rerun_log = logging.getLogger("naturemind.reruns")
+
+PORT_ENV = "NATUREMIND_METRICS_PORT"
+DEFAULT_PORT = 9464
+LOG_PATH = os.path.join("data", "logs", "reruns.jsonl")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "naturemind_span_seconds": "Time spent in an instrumented section.",
+    "naturemind_rerun_seconds": "Time for a full script run, by page.",
+    "naturemind_cache_hits_total": "Shared cache lookups that found a value.",
+    "naturemind_cache_misses_total": "Shared cache lookups that found nothing.",
+    "naturemind_cache_sets_total": "Values written to the shared cache.",
+    "naturemind_cache_errors_total": "Shared cache calls that failed.",
+}
+
+_local = threading.local()
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += seconds
+        self.count += 1
+
+
+class Counter:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+class Registry:
+    """Histograms and counters keyed by ``(metric, label, value)``; thread-safe."""
+
+    def __init__(self):
+        self._metrics = {}   # key -> Histogram or Counter
+        self._lock = threading.Lock()
+
+    def observe(self, metric, label, value, seconds):
+        with self._lock:
+            key = (metric, label, value)
+            histogram = self._metrics.get(key)
+            if histogram is None:
+                histogram = self._metrics[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, metric, label, value, amount=1):
+        with self._lock:
+            key = (metric, label, value)
+            counter = self._metrics.get(key)
+            if counter is None:
+                counter = self._metrics[key] = Counter()
+            counter.count += amount
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(
+                (key, list(h.counts), h.sum, h.count) if isinstance(h, Histogram) else (key, None, 0, h.count)
+                for key, h in self._metrics.items()
+            )
+        lines = []
+        metric_seen = None
+        for (metric, label, value), counts, total, count in items:
+            if metric != metric_seen:
+                kind = "counter" if counts is None else "histogram"
+                lines += [f"# HELP {metric} {HELP.get(metric, '')}", f"# TYPE {metric} {kind}"]
+                metric_seen = metric
+            labels = f'{label}="{_escape(value)}"'
+            if counts is None:
+                lines.append(f"{metric}{{{labels}}} {count}")
+                continue
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+# ========= Spans ========
+class Rerun:
+    """Breakdown of one script run: ``(name, depth, seconds)`` per span."""
+
+    __slots__ = ("page", "session", "started", "seconds", "spans", "_depth")
+
+    def __init__(self, page, session=None):
+        self.page = page
+        self.session = session
+        self.started = time.time()
+        self.seconds = None
+        self.spans = []
+        self._depth = 0
+
+    def to_dict(self):
+        return {
+            "time": datetime.fromtimestamp(self.started).isoformat(timespec="milliseconds"),
+            "session": self.session,
+            "page": self.page,
+            "ms": round(self.seconds * 1e3, 3),
+            "spans": [{"name": n, "depth": d, "ms": round(s * 1e3, 3)} for n, d, s in self.spans],
+        }
+
+
+def current():
+    """The ``Rerun`` being traced on this thread, if any."""
+    return getattr(_local, "rerun", None)
+
+
+@contextmanager
+def span(name):
+    """Time the block into the ``name`` histogram and the current ``Rerun``."""
+    run = current()
+    if run is not None:
+        index = len(run.spans)
+        run.spans.append((name, run._depth, 0.0))
+        run._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        REGISTRY.observe("naturemind_span_seconds", "span", name, seconds)
+        if run is not None:
+            run._depth -= 1
+            run.spans[index] = (name, run._depth, seconds)
+
+
+def timed(name):
+    """Decorator form of ``span``."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def rerun(page, session=None):
+    """Trace one script run on this thread; logs it when the block exits.
+
+    The block may end with Streamlit's rerun/stop control flow exceptions;
+    the run is still recorded.
+    """
+    run = _local.rerun = Rerun(page, session)
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.seconds = time.perf_counter() - start
+        _local.rerun = None
+        REGISTRY.observe("naturemind_rerun_seconds", "page", page, run.seconds)
+        if rerun_log.handlers:
+            rerun_log.info(json.dumps(run.to_dict()))
+
+
+# ========= Export ========
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """Serves ``REGISTRY`` at ``/metrics`` from a daemon thread."""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def configure_log(path=LOG_PATH, max_bytes=10 * 2**20, backups=3):
+    """Write finished reruns to ``path`` as JSON lines (rotated by size)."""
+    if rerun_log.handlers:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                   encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    rerun_log.addHandler(handler)
+    rerun_log.setLevel(logging.INFO)
+    rerun_log.propagate = False
+
+
+def start_server(port=None):
+    """Start the ``/metrics`` endpoint; ``None`` if disabled or the port is taken."""
+    port = port or os.environ.get(PORT_ENV, DEFAULT_PORT)
+    if str(port).lower() == "off":
+        return None
+    try:
+        server = MetricsServer(port=int(port)).start()
+    except OSError as e:
+        log.warning("Metrics endpoint not started on port %s: %s", port, e)
+        return None
+    log.info("Serving metrics at %s", server.url)
+    return server
@@ -0,0 +1,217 @@
+"""Trained mood classifier, a learned replacement for the ``scoring`` cutoffs.
+
+    python mood_model.py train [--data StudentWelllness.csv] [--out models/mood-classifier.json]
+
+A multinomial logistic regression (numpy only, CPU) over the journal
+polarity, sleep, screen time, exercise and a small hashed bag of journal
+words, fit on the labeled rows of ``StudentWelllness.csv``. The model is
+stored as plain JSON, so loading it never unpickles anything.
+
+Predicted dataset labels (happy/neutral/sad/anxious) map onto the app's mood
+bands through ``LABEL_BANDS``; the weighted ``mood_score`` is unchanged.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import zlib
+
+import numpy as np
+
+import scoring
+
+log = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(ROOT, "models", "mood-classifier.json")
+DATASET = os.path.join(ROOT, "StudentWelllness.csv")
+MODE_ENV = "NATUREMIND_SCORING"
+
+NUMERIC = ["polarity", "sleep_hours", "screen_time", "exercise"]
+HASH_BUCKETS = 64
+WORD = re.compile(r"[a-z']+")
+
+# Dataset label -> (app mood, risk)
+LABEL_BANDS = {
+    "happy": scoring.MOOD_BANDS[0][1:],
+    "neutral": scoring.MOOD_BANDS[1][1:],
+    "sad": scoring.FALLBACK_BAND,
+    "anxious": scoring.FALLBACK_BAND,
+}
+
+
+def _bucket(word):
+    return zlib.crc32(word.encode()) % HASH_BUCKETS
+
+
+def features(polarity, sleep_hours, screen_time, exercise, text=""):
+    """Feature vector for one entry; ``exercise`` is a level name."""
+    x = np.zeros(len(NUMERIC) + HASH_BUCKETS)
+    x[:4] = polarity, sleep_hours, screen_time, scoring.EXERCISE_SCORES[exercise]
+    for word in set(WORD.findall(text.lower())):
+        x[len(NUMERIC) + _bucket(word)] = 1.0
+    return x
+
+
+def dataset_features(df, text_column="journal_text", polarity=None):
+    """``features`` for every row of a dataset frame, with ``scoring`` defaults.
+
+    Pass ``polarity`` when it has already been computed for ``df``.
+    """
+    texts = df[text_column].fillna("").astype(str)
+    X = np.zeros((len(df), len(NUMERIC) + HASH_BUCKETS))
+    X[:, 0] = scoring.polarities(texts) if polarity is None else polarity
+    X[:, 1] = scoring._factor(df, "sleep_hours")
+    X[:, 2] = scoring._factor(df, "screen_time")
+    X[:, 3] = scoring.exercise_levels(df).map(scoring.EXERCISE_SCORES).to_numpy(dtype="float64")
+    for i, text in enumerate(texts):
+        for word in set(WORD.findall(text.lower())):
+            X[i, len(NUMERIC) + _bucket(word)] = 1.0
+    return X
+
+
+def _softmax(z):
+    z = z - z.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class MoodClassifier:
+    def __init__(self, classes, mean, scale, weights, bias, metrics=None):
+        self.classes = list(classes)
+        self.mean = np.asarray(mean, dtype="float64")
+        self.scale = np.asarray(scale, dtype="float64")
+        self.weights = np.asarray(weights, dtype="float64")
+        self.bias = np.asarray(bias, dtype="float64")
+        self.metrics = metrics or {}
+
+    @classmethod
+    def fit(cls, X, y, epochs=500, learning_rate=0.5, l2=1e-3):
+        """Full-batch gradient descent on the L2-regularized softmax loss."""
+        classes = sorted(set(y))
+        target = np.eye(len(classes))[[classes.index(label) for label in y]]
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        Z = (X - mean) / scale
+        weights = np.zeros((X.shape[1], len(classes)))
+        bias = np.zeros(len(classes))
+        for _ in range(epochs):
+            error = (_softmax(Z @ weights + bias) - target) / len(Z)
+            weights -= learning_rate * (Z.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+        return cls(classes, mean, scale, weights, bias)
+
+    def predict_proba(self, X):
+        return _softmax(((X - self.mean) / self.scale) @ self.weights + self.bias)
+
+    def predict(self, x):
+        """``(label, probability)`` for one feature vector."""
+        p = self.predict_proba(x)
+        i = int(p.argmax())
+        return self.classes[i], float(p[i])
+
+    def classify(self, polarity, sleep_hours, screen_time, exercise, text=""):
+        """``(mood, risk)`` in the app's bands, like ``scoring.classify``."""
+        label, _ = self.predict(features(polarity, sleep_hours, screen_time, exercise, text))
+        return LABEL_BANDS[label]
+
+    def classify_frame(self, df, text_column="journal_text", polarity=None):
+        """``(moods, risks)`` arrays for every row of ``df``."""
+        labels = np.asarray(self.classes)[self.predict_proba(
+            dataset_features(df, text_column, polarity)).argmax(axis=1)]
+        moods = np.array([LABEL_BANDS[label][0] for label in labels], dtype=object)
+        risks = np.array([LABEL_BANDS[label][1] for label in labels], dtype=object)
+        return moods, risks
+
+    # ----- serialization -----
+    def to_dict(self):
+        return {
+            "classes": self.classes,
+            "features": NUMERIC + [f"word_{i}" for i in range(HASH_BUCKETS)],
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "weights": self.weights.tolist(),
+            "bias": self.bias.tolist(),
+            "metrics": self.metrics,
+        }
+
+    def save(self, path=MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if len(data["features"]) != len(NUMERIC) + HASH_BUCKETS:
+            raise ValueError(f"{path} was trained with a different feature layout")
+        return cls(data["classes"], data["mean"], data["scale"], data["weights"],
+                   data["bias"], data.get("metrics"))
+
+
+def load_default(path=MODEL_PATH):
+    """The model the app should use, or ``None`` for the formula fallback.
+
+    ``NATUREMIND_SCORING=formula`` forces the fallback, as does a missing or
+    incompatible model file.
+    """
+    if os.environ.get(MODE_ENV, "model") == "formula":
+        return None
+    try:
+        return MoodClassifier.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        log.warning("Mood classifier unavailable, using the formula: %s", e)
+        return None
+
+
+def load_dataset(path=DATASET):
+    import pandas as pd
+
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    return dataset_features(df), df["mood"].tolist()
+
+
+def cross_validate(X, y, folds=5, seed=0, **fit_args):
+    """Stratified k-fold predictions; returns the predicted label per row."""
+    rng = np.random.default_rng(seed)
+    fold_of = np.empty(len(y), dtype=int)
+    for label in sorted(set(y)):
+        rows = np.flatnonzero(np.asarray(y) == label)
+        fold_of[rng.permutation(rows)] = np.arange(len(rows)) % folds
+    predicted = [None] * len(y)
+    for k in range(folds):
+        train, test = fold_of != k, fold_of == k
+        model = MoodClassifier.fit(X[train], [y[i] for i in np.flatnonzero(train)], **fit_args)
+        for i, p in zip(np.flatnonzero(test), model.predict_proba(X[test])):
+            predicted[i] = model.classes[int(p.argmax())]
+    return predicted
+
+
+def train(data=DATASET, out=MODEL_PATH, folds=5):
+    X, y = load_dataset(data)
+    predicted = cross_validate(X, y, folds)
+    accuracy = float(np.mean([p == t for p, t in zip(predicted, y)]))
+    model = MoodClassifier.fit(X, y)
+    model.metrics = {"rows": len(y), "cv_folds": folds, "cv_accuracy": round(accuracy, 4)}
+    model.save(out)
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the mood classifier.")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--data", default=DATASET)
+    parser.add_argument("--out", default=MODEL_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args(argv)
+    model = train(args.data, args.out, args.folds)
+    print(f"Saved {args.out}: {model.metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""Weekly wellness reports, one per student, rendered across a process pool.
+
+    python reports.py [--week-ending 2026-10-11] [--format html pdf] [--workers 8]
+
+Covers the 7 days ending on ``--week-ending`` (default: today) for every
+student with a mood check, a night of sleep or a habit ticked in that week:
+mood score per day against the week before, risk band changes, sleep and
+habit adherence, and the routine recommended for their latest risk band.
+Reports go to ``data/reports/<week-ending>/`` with an ``index.html``.
+
+The parent process reads everything from the stores in a few bulk queries
+and hands each worker a batch of small per-student payloads; workers load
+the HTML template and fonts once (``_init_worker``) and reuse one matplotlib
+figure for all the charts of their batches. A manifest keeps a fingerprint
+of each student's payload, so a rerun only renders the students whose data
+(or the report version) changed; ``--force`` renders everyone.
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import string
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from html import escape
+
+import habits
+import history
+import suggestions
+
+log = logging.getLogger(__name__)
+
+REPORTS_DIR = os.path.join("data", "reports")
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "report.html")
+MANIFEST = "manifest.json"
+VERSION = 1          # bump when the report layout changes, to regenerate everything
+FORMATS = ("html", "pdf")
+BATCH = 16           # students per task sent to a worker
+HABIT_DAYS = 90      # history loaded for habit streaks
+
+# Print-friendly colours (the app's palettes are dark)
+INK = "#1f2d24"
+ACCENT = "#2f9e7f"
+MUTED = "#9fb3a6"
+WARNING = "#e0607e"
+
+
+# ========= Gathering (parent process) ========
+def week_of(end):
+    """``(start, end)`` dates of the 7 days ending on ``end``, end exclusive."""
+    stop = end + timedelta(days=1)
+    return stop - timedelta(days=7), stop
+
+
+def gather(history_store, habit_store, week_ending, users=None):
+    """JSON-serializable payload per active student, keyed by user."""
+    start, end = week_of(week_ending)
+    checks, nights, masks = defaultdict(list), defaultdict(list), {}
+    for row in history_store.checks_between(start - timedelta(days=7), end):
+        checks[row["user"]].append([row["created_at"], row["mood"], row["mood_score"], row["risk"]])
+    for row in history_store.nights_between(start, end):
+        nights[row["user"]].append([row["night"], row["hours"]])
+    table = habit_store.cohort(end - timedelta(days=HABIT_DAYS), end)
+    for name, row in zip(habit_store.names(), table):
+        if row[-7:].any():
+            masks[name] = row.tolist()
+
+    this_week = start.isoformat()
+    active = {u for u, rows in checks.items() if rows[-1][0] >= this_week} | set(nights) | set(masks)
+    if users:
+        active &= set(users)
+    return {
+        user: {
+            "user": user,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "checks": checks.get(user, []),
+            "nights": nights.get(user, []),
+            "habits": masks.get(user, []),
+        }
+        for user in sorted(active)
+    }
+
+
+def fingerprint(payload, formats):
+    data = json.dumps([VERSION, sorted(formats), payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def report_name(user):
+    """File stem for ``user``: readable, and unique even when names only differ in symbols."""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", user).strip("-")[:40] or "student"
+    return f"{slug}-{hashlib.sha256(user.encode()).hexdigest()[:8]}"
+
+
+# ========= Summaries ========
+def summarize(payload):
+    """Figures shown in a report, computed from a ``gather`` payload."""
+    import numpy as np
+
+    import sleep
+
+    start = date.fromisoformat(payload["start"])
+    end = date.fromisoformat(payload["end"])
+    days = [start + timedelta(days=i) for i in range((end - start).days)]
+    this_week = [c for c in payload["checks"] if c[0] >= payload["start"]]
+    last_week = [c for c in payload["checks"] if c[0] < payload["start"]]
+
+    by_day = defaultdict(list)
+    for created_at, _, score, _ in this_week:
+        by_day[created_at[:10]].append(score)
+    daily = [float(np.mean(by_day[d.isoformat()])) if by_day[d.isoformat()] else None for d in days]
+
+    def mean_score(rows):
+        return float(np.mean([c[2] for c in rows])) if rows else None
+
+    # Risk band transitions this week, starting from where last week ended
+    changes = []
+    previous = last_week[-1][3] if last_week else None
+    for created_at, _, _, risk in this_week:
+        if risk != previous:
+            changes.append((created_at, previous, risk))
+            previous = risk
+    latest_risk = (this_week or last_week)[-1][3] if payload["checks"] else None
+
+    hours = sleep.nightly([{"night": n, "hours": h} for n, h in payload["nights"]], start, end)
+    sleep_stats = sleep.rolling(hours, windows=(7,)).iloc[-1]
+
+    masks = np.array(payload["habits"] or [0] * 7, dtype=np.uint8)
+    return {
+        "user": payload["user"],
+        "days": days,
+        "daily_scores": daily,
+        "checks": len(this_week),
+        "score": mean_score(this_week),
+        "last_score": mean_score(last_week),
+        "risk_changes": changes,
+        "risk": latest_risk,
+        "routine": suggestions.ROUTINES.get(latest_risk, suggestions.ROUTINES["Low"]),
+        "sleep_hours": [None if np.isnan(h) else float(h) for h in hours],
+        "sleep_mean": None if np.isnan(sleep_stats["mean_7"]) else float(sleep_stats["mean_7"]),
+        "sleep_consistency": None if np.isnan(sleep_stats["consistency_7"]) else float(sleep_stats["consistency_7"]),
+        "habit_week": float(habits.completion(masks[-7:])),
+        "habit_streak": int(habits.streak(masks)),
+        "habit_adherence": habits.adherence(masks[-7:]).tolist(),
+    }
+
+
+# ========= Rendering (worker processes) ========
+_worker = {}
+
+
+def _init_worker():
+    """Load what every report shares once per worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+    from matplotlib.figure import Figure
+
+    matplotlib.rcParams.update({
+        "font.family": "DejaVu Sans",
+        "font.size": 9,
+        "axes.edgecolor": MUTED,
+        "axes.labelcolor": INK,
+        "xtick.color": INK,
+        "ytick.color": INK,
+        "axes.spines.top": False,
+        "axes.spines.right": False,
+        "svg.fonttype": "none",   # text stays text; the page's font renders it
+        "pdf.fonttype": 42,
+    })
+    font_manager.findfont("DejaVu Sans")  # builds or loads the font cache now, not mid-batch
+    with open(TEMPLATE, encoding="utf-8") as f:
+        _worker["template"] = string.Template(f.read())
+    chart = Figure(figsize=(7.2, 2.6))
+    page = Figure(figsize=(8.27, 11.69))  # A4
+    _worker["chart"] = Charts(chart)
+    _worker["page"] = Charts(page, rect=(0.03, 0.58, 0.94, 0.22))
+
+
+class Charts:
+    """Mood score per day and hours slept per night, side by side in ``rect``.
+
+    The axes, ticks and artists are built once per worker; ``update`` only
+    swaps in a report's data, which is most of the cost saved per report.
+    """
+
+    def __init__(self, fig, rect=(0, 0, 1, 1)):
+        left, bottom, width, height = rect
+        self.fig = fig
+        x = range(7)
+
+        self.mood = fig.add_axes((left + 0.07 * width, bottom + 0.18 * height, 0.38 * width, 0.68 * height))
+        (self.scores,) = self.mood.plot(x, [float("nan")] * 7, marker="o", color=ACCENT)
+        self.last_week = self.mood.axhline(0, color=MUTED, linestyle="--", linewidth=1, label="last week")
+        self.legend = self.mood.legend(frameon=False, loc="lower right")
+        self.mood.set_xticks(list(x))
+        self.mood.set_xlim(-0.5, 6.5)
+        self.mood.set_title("Mood score", loc="left", color=INK)
+        self.mood.set_ylim(-0.5, 1)
+
+        self.rest = fig.add_axes((left + 0.57 * width, bottom + 0.18 * height, 0.38 * width, 0.68 * height))
+        self.hours = self.rest.bar(x, [0] * 7, color=ACCENT)
+        self.rest.axhline(7, color=MUTED, linestyle="--", linewidth=1)
+        self.rest.set_xticks(list(x))
+        self.rest.set_xlim(-0.5, 6.5)
+        self.rest.set_title("Hours slept", loc="left", color=INK)
+        self.rest.set_ylim(0, 12)
+
+    def update(self, report):
+        labels = [d.strftime("%a") for d in report["days"]]
+        self.mood.set_xticklabels(labels)
+        self.rest.set_xticklabels(labels)
+        self.scores.set_ydata([s if s is not None else float("nan") for s in report["daily_scores"]])
+        shown = report["last_score"] is not None
+        self.last_week.set_visible(shown)
+        self.legend.set_visible(shown)
+        if shown:
+            self.last_week.set_ydata([report["last_score"]] * 2)
+        for bar, h in zip(self.hours, report["sleep_hours"]):
+            bar.set_height(h or 0)
+            bar.set_color(ACCENT if (h or 0) >= 7 else WARNING)
+
+
+def chart_svg(report):
+    charts = _worker["chart"]
+    charts.update(report)
+    out = io.StringIO()
+    charts.fig.savefig(out, format="svg")
+    svg = out.getvalue()
+    return svg[svg.index("<svg"):]
+
+
+def _fmt(value, pattern, missing="—"):
+    return missing if value is None else pattern.format(value)
+
+
+def _card(label, value, note=""):
+    return (f'<div class="card"><div class="label">{label}</div><div class="value">{value}</div>'
+            f'<div class="note">{note}</div></div>')
+
+
+def _risk_lines(report):
+    if not report["risk_changes"]:
+        if report["risk"] is None:
+            return ["No mood check yet."]
+        return [f"No change this week: {report['risk']}."]
+    return [
+        f"{datetime.fromisoformat(when):%a %d %b}: "
+        f"{'first check' if before is None else before} → {after}"
+        for when, before, after in report["risk_changes"]
+    ]
+
+
+def render_html(report, generated):
+    delta = None
+    if report["score"] is not None and report["last_score"] is not None:
+        delta = report["score"] - report["last_score"]
+    cards = "".join([
+        _card("Mood score", _fmt(report["score"], "{:.2f}"),
+              _fmt(delta, "{:+.2f} vs last week · ", "") + f"{report['checks']} checks"),
+        _card("Risk band", escape(report["risk"] or "—")),
+        _card("Sleep", _fmt(report["sleep_mean"], "{:.1f} h"),
+              f"{_fmt(report['sleep_consistency'], '{:.0f}%')} consistent"),
+        _card("Habits", f"{report['habit_week']:.0%}", f"{report['habit_streak']}-day streak"),
+    ])
+    habit_rows = "".join(
+        f"<tr><td>{escape(name)}</td><td>{share:.0%}</td></tr>"
+        for name, share in zip(habits.HABITS, report["habit_adherence"])
+    )
+    start, last = report["days"][0], report["days"][-1]
+    return _worker["template"].substitute(
+        title=f"Weekly wellness report: {escape(report['user'])}",
+        period=f"{start:%a %d %b} – {last:%a %d %b %Y}",
+        cards=cards,
+        chart=chart_svg(report),
+        risk="<ul>" + "".join(f"<li>{escape(line)}</li>" for line in _risk_lines(report)) + "</ul>",
+        habits=f"<table><tr><th>Habit</th><th>Days done</th></tr>{habit_rows}</table>",
+        routine_risk=escape(report["risk"] or "Low"),
+        routine="<table>" + "".join(
+            f"<tr><td>{escape(t)}</td><td>{escape(a)}</td></tr>" for t, a in report["routine"]
+        ) + "</table>",
+        generated=generated,
+    )
+
+
+def render_pdf(report, path):
+    """One A4 page: summary text, the charts, habits and the routine."""
+    charts = _worker["page"]
+    fig = charts.fig
+    for text in fig.texts[:]:
+        text.remove()
+    start, last = report["days"][0], report["days"][-1]
+    fig.text(0.07, 0.95, f"Weekly wellness report: {report['user']}", fontsize=15, weight="bold", color=INK)
+    fig.text(0.07, 0.925, f"{start:%a %d %b} – {last:%a %d %b %Y}", color=MUTED)
+    summary = [
+        f"Mood score {_fmt(report['score'], '{:.2f}')} (last week {_fmt(report['last_score'], '{:.2f}')}),"
+        f" {report['checks']} checks; risk band {report['risk'] or '—'}",
+        f"Sleep {_fmt(report['sleep_mean'], '{:.1f} h')} a night,"
+        f" {_fmt(report['sleep_consistency'], '{:.0f}%')} consistent",
+        f"Habits {report['habit_week']:.0%} done this week, {report['habit_streak']}-day streak",
+    ]
+    for i, line in enumerate(summary):
+        fig.text(0.07, 0.885 - i * 0.022, line, color=INK)
+    charts.update(report)
+
+    y = 0.55
+    for title, lines in (
+        ("Risk band", _risk_lines(report)),
+        ("Habits (days done this week)",
+         [f"{name}: {share:.0%}" for name, share in zip(habits.HABITS, report["habit_adherence"])]),
+        (f"Recommended routine ({report['risk'] or 'Low'} risk)", [f"{t}  {a}" for t, a in report["routine"]]),
+    ):
+        fig.text(0.07, y, title, weight="bold", color=INK)
+        y -= 0.022
+        for line in lines:
+            fig.text(0.09, y, line, color=INK)
+            y -= 0.019
+        y -= 0.012
+    fig.savefig(path, format="pdf")
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def render_batch(payloads, directory, formats):
+    """Render every payload of one batch; returns ``[(user, files)]``."""
+    generated = datetime.now().isoformat(timespec="minutes")
+    done = []
+    for payload in payloads:
+        report = summarize(payload)
+        stem = os.path.join(directory, report_name(payload["user"]))
+        files = []
+        if "html" in formats:
+            _write_atomic(stem + ".html", render_html(report, generated))
+            files.append(stem + ".html")
+        if "pdf" in formats:
+            tmp = f"{stem}.pdf.{os.getpid()}.tmp"
+            render_pdf(report, tmp)
+            os.replace(tmp, stem + ".pdf")
+            files.append(stem + ".pdf")
+        done.append((payload["user"], [os.path.basename(f) for f in files]))
+    return done
+
+
+# ========= Driver ========
+def _load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(directory, week_ending, manifest):
+    rows = "".join(
+        f"<tr><td>{escape(user)}</td><td>"
+        + " ".join(f'<a href="{escape(name)}">{name.rsplit(".", 1)[1].upper()}</a>' for name in entry["files"])
+        + "</td></tr>"
+        for user, entry in sorted(manifest.items())
+    )
+    _write_atomic(os.path.join(directory, "index.html"), (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f"<title>Weekly reports, week ending {week_ending}</title></head><body>"
+        f"<h1>Weekly reports, week ending {week_ending}</h1>"
+        f"<table><tr><th>Student</th><th>Report</th></tr>{rows}</table></body></html>"
+    ))
+
+
+def generate(week_ending, out_dir=REPORTS_DIR, formats=("html",), workers=None, force=False,
+             users=None, history_store=None, habit_store=None):
+    """Render the week's reports; returns ``{"students", "rendered", "unchanged", "removed", ...}``.
+
+    Reports of students no longer active that week are removed, unless
+    ``users`` narrows the run to some students.
+    """
+    started = time.perf_counter()
+    history_store = history_store or history.HistoryStore()
+    habit_store = habit_store or habits.HabitStore()
+    directory = os.path.join(out_dir, week_ending.isoformat())
+    os.makedirs(directory, exist_ok=True)
+
+    payloads = gather(history_store, habit_store, week_ending, users)
+    manifest = _load_manifest(directory)
+    prints = {user: fingerprint(payload, formats) for user, payload in payloads.items()}
+    todo = [p for user, p in payloads.items()
+            if force or manifest.get(user, {}).get("fingerprint") != prints[user]]
+    stale = [] if users else [user for user in manifest if user not in payloads]
+    for user in stale:
+        for name in manifest.pop(user)["files"]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+    if todo:
+        batches = [todo[i:i + BATCH] for i in range(0, len(todo), BATCH)]
+        workers = min(workers or os.cpu_count() or 1, len(batches))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(render_batch, batch, directory, tuple(formats)) for batch in batches]
+            for future in as_completed(futures):
+                for user, files in future.result():
+                    manifest[user] = {"fingerprint": prints[user], "files": files}
+    if todo or stale:
+        _write_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=1))
+        write_index(directory, week_ending, manifest)
+
+    return {
+        "students": len(payloads),
+        "rendered": len(todo),
+        "unchanged": len(payloads) - len(todo),
+        "removed": len(stale),
+        "seconds": time.perf_counter() - started,
+        "directory": directory,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate weekly wellness reports per student.")
+    parser.add_argument("--week-ending", type=date.fromisoformat, default=date.today(),
+                        help="last day of the week to report (default: today)")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["html"])
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--out", default=REPORTS_DIR)
+    parser.add_argument("--user", action="append", help="only this student (repeatable)")
+    parser.add_argument("--force", action="store_true", help="render even unchanged reports")
+    args = parser.parse_args(argv)
+
+    result = generate(args.week_ending, args.out, args.format, args.workers, args.force, args.user)
+    print(f"{result['students']} students: {result['rendered']} rendered, {result['unchanged']} unchanged, "
+          f"{result['removed']} removed in {result['seconds']:.1f}s -> {result['directory']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Mood scoring engine shared by the Mood Check form and batch rescoring.
+
+Single entries go through ``score_entry``; whole datasets go through
+``score_frame`` (vectorized) or the ``score_csv`` streaming CLI:
+
+    python scoring.py StudentWelllness.csv -o scored.csv [--model]
+
+The mood and risk labels come from the cutoffs below unless a trained
+``mood_model.MoodClassifier`` is passed in; ``mood_score`` is always the
+weighted formula.
+"""
+import argparse
+import sys
+
+import sentiment
+
+# ========= Weights & Thresholds ========
+EXERCISE_SCORES = {"None": 0, "Light": 0.3, "Moderate": 0.7, "Intense": 1.0}
+
+# Values used when a dataset has no column for a factor (same as the form defaults)
+DEFAULTS = {
+    "sleep_hours": 7,
+    "screen_time": 5,
+    "outdoor_time": 30,
+    "exercise": "Moderate",
+}
+
+# StudentWelllness.csv records movement as Yes/No
+ACTIVITY_TO_EXERCISE = {"Yes": "Moderate", "No": "None"}
+
+# (lower bound, mood, risk) - a score must be strictly above the bound
+MOOD_BANDS = [
+    (0.4, "Blooming", "Low"),
+    (0.1, "Balanced(Work on youself dude!)", "Moderate"),
+]
+FALLBACK_BAND = ("Needs Care", "High")
+
+OUTPUT_COLUMNS = ["mood_score", "mood", "risk"]
+
+
+# ========= Single Entry ========
+def polarity(text):
+    return sentiment.get_backend().polarity(text)
+
+
+def weighted_score(polarity, sleep_hours, screen_time, outdoor_time, exercise):
+    sleep_score = min(sleep_hours / 8, 1.0)
+    screen_score = 1 - min(screen_time / 10, 1.0)
+    exercise_score = EXERCISE_SCORES[exercise]
+    nature_score = min(outdoor_time / 120, 1.0)
+
+    return (
+        0.4 * polarity +  # Journal sentiment
+        0.2 * sleep_score +
+        0.15 * nature_score +
+        0.15 * exercise_score -
+        0.1 * (1 - screen_score)
+    )
+
+
+def classify(mood_score):
+    """Return ``(mood, risk)`` for a weighted score."""
+    for bound, mood, risk in MOOD_BANDS:
+        if mood_score > bound:
+            return mood, risk
+    return FALLBACK_BAND
+
+
+def score_entry(journal_entry, sleep_hours, screen_time, outdoor_time, exercise, classifier=None):
+    """Score one check-in exactly as the Mood Check form does."""
+    pol = polarity(journal_entry)
+    mood_score = weighted_score(pol, sleep_hours, screen_time, outdoor_time, exercise)
+    if classifier is None:
+        mood, risk = classify(mood_score)
+    else:
+        mood, risk = classifier.classify(pol, sleep_hours, screen_time, exercise, journal_entry)
+    return {"mood_score": mood_score, "mood": mood, "risk": risk}
+
+
+# ========= Batch ========
+# numpy/pandas are imported inside the batch functions so that the app's
+# single-entry path does not pay for them.
+def polarities(texts):
+    """Polarity for a Series of texts, analysing each distinct text once."""
+    import pandas as pd
+
+    texts = texts.fillna("").astype(str)
+    unique = pd.unique(texts)
+    lookup = dict(zip(unique, sentiment.get_backend().polarity_many(unique)))
+    return texts.map(lookup).to_numpy(dtype="float64")
+
+
+def _factor(df, column, dtype="float64"):
+    import numpy as np
+
+    if column in df:
+        return df[column].to_numpy(dtype=dtype)
+    return np.full(len(df), DEFAULTS[column], dtype=dtype)
+
+
+def exercise_levels(df):
+    """Exercise level per row, derived from ``exercise`` or ``physical_activity``."""
+    import pandas as pd
+
+    if "exercise" in df:
+        return df["exercise"]
+    if "physical_activity" in df:
+        return df["physical_activity"].map(ACTIVITY_TO_EXERCISE).fillna(DEFAULTS["exercise"])
+    return pd.Series(DEFAULTS["exercise"], index=df.index)
+
+
+def score_frame(df, text_column="journal_text", classifier=None):
+    """Vectorized ``score_entry`` over a DataFrame.
+
+    Missing factor columns fall back to ``DEFAULTS``. The arithmetic is
+    applied in the same order as ``weighted_score`` so each row matches the
+    single-entry path bit for bit.
+    """
+    import numpy as np
+    import pandas as pd
+
+    pol = polarities(df[text_column])
+    sleep_score = np.minimum(_factor(df, "sleep_hours") / 8, 1.0)
+    screen_score = 1 - np.minimum(_factor(df, "screen_time") / 10, 1.0)
+    exercise_score = exercise_levels(df).map(EXERCISE_SCORES).to_numpy(dtype="float64")
+    nature_score = np.minimum(_factor(df, "outdoor_time") / 120, 1.0)
+
+    mood_score = (
+        0.4 * pol +
+        0.2 * sleep_score +
+        0.15 * nature_score +
+        0.15 * exercise_score -
+        0.1 * (1 - screen_score)
+    )
+
+    if classifier is None:
+        conditions = [mood_score > bound for bound, _, _ in MOOD_BANDS]
+        mood = np.select(conditions, [m for _, m, _ in MOOD_BANDS], FALLBACK_BAND[0])
+        risk = np.select(conditions, [r for _, _, r in MOOD_BANDS], FALLBACK_BAND[1])
+    else:
+        mood, risk = classifier.classify_frame(df, text_column, polarity=pol)
+
+    return pd.DataFrame(
+        {"mood_score": mood_score, "mood": mood, "risk": risk}, index=df.index
+    )
+
+
+def score_csv(src, dst, text_column="journal_text", chunksize=50_000, classifier=None):
+    """Stream ``src`` through ``score_frame`` in chunks and write ``dst``.
+
+    Source columns named like a scored column (e.g. the labeled ``mood`` of
+    StudentWelllness.csv) are kept as ``label_<name>`` next to the
+    predictions. Returns the number of rows written.
+    """
+    import pandas as pd
+
+    rows = 0
+    reader = pd.read_csv(src, chunksize=chunksize, encoding="utf-8-sig")
+    for i, chunk in enumerate(reader):
+        scored = score_frame(chunk, text_column=text_column, classifier=classifier)
+        labels = {c: f"label_{c}" for c in OUTPUT_COLUMNS if c in chunk}
+        out = chunk.rename(columns=labels).join(scored)
+        out.to_csv(dst, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        rows += len(out)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score journal datasets in bulk.")
+    parser.add_argument("input", help="CSV with a journal text column")
+    parser.add_argument("-o", "--output", default="-", help="output CSV (default: stdout)")
+    parser.add_argument("--text-column", default="journal_text")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--model", nargs="?", const="", metavar="PATH",
+                        help="label with the trained classifier (default model if no PATH)")
+    args = parser.parse_args(argv)
+
+    classifier = None
+    if args.model is not None:
+        import mood_model
+        classifier = mood_model.MoodClassifier.load(args.model or mood_model.MODEL_PATH)
+
+    dst = sys.stdout if args.output == "-" else args.output
+    rows = score_csv(args.input, dst, text_column=args.text_column, chunksize=args.chunksize,
+                     classifier=classifier)
+    print(f"Scored {rows} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+"""Full-text search over journal entries.
+
+    python search.py index                                # index new entries
+    python search.py query overwhelmed assignments [--source checkins]
+    python search.py similar "can't keep up with deadlines"
+
+Entries come from the mood-check history (``checkins``) and the two bundled
+datasets (``wellness``, ``journal``). The index is a list of immutable
+segments under ``data/search/``, each a directory of ``.npy`` arrays opened
+with ``mmap_mode="r"``, so loading costs the same however large it is:
+
+- ``terms`` (sorted, fixed-width bytes) and ``offsets`` delimit each term's
+  postings in ``docs`` (global document ids) and ``tfs`` (term counts);
+- ``lengths``, ``norms``, ``sources``, ``refs``, ``text`` and
+  ``text_offsets`` describe each document of the segment.
+
+``update`` indexes only the entries added since its last run (the manifest
+keeps a high-water mark per source) as one new segment and folds all
+segments into one once there are more than ``MAX_SEGMENTS``; a dataset is
+not read at all while its files are unchanged. ``search``
+ranks with BM25. ``similar`` ranks by the cosine between the query's TF-IDF
+vector and each document's length-normalized log-tf vector, reusing the
+same postings plus the per-document ``norms`` instead of storing a separate
+vector per document.
+"""
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+
+import history
+import locks
+
+log = logging.getLogger(__name__)
+
+INDEX_DIR = os.path.join("data", "search")
+MANIFEST = "manifest.json"
+SOURCES = ["checkins", "wellness", "journal"]
+MAX_SEGMENTS = 8
+MAX_TERM = 32     # bytes; longer tokens are not indexed
+K1, B = 1.2, 0.75
+
+WORD = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been but by can could did do does
+for from had has have he her him his how i i'm if in into is it it's its just me more
+my no not of on or our out she so some than that the their them then there they this
+to too up us very was we were what when which who will with would you your
+""".split())
+
+Hit = namedtuple("Hit", "doc source ref score text")
+
+_ARRAYS = ["terms", "offsets", "docs", "tfs", "lengths", "norms", "sources", "refs",
+           "text", "text_offsets"]
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords; used for documents and queries."""
+    return [
+        t for t in WORD.findall((text or "").lower())
+        if len(t) > 1 and t not in STOPWORDS and len(t.encode()) <= MAX_TERM
+    ]
+
+
+# ========= Segments ========
+class Segment:
+    """One immutable, memory-mapped slice of the index (documents ``base`` to ``base + count``)."""
+
+    def __init__(self, path, base, count, tokens):
+        self.path = path
+        self.base = base
+        self.count = count
+        self.tokens = tokens
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+
+    def postings(self, term):
+        """``(docs, tfs)`` for an encoded ``term``; empty arrays when absent."""
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            return self.docs[start:end], self.tfs[start:end]
+        return self.docs[:0], self.tfs[:0]
+
+    def document_text(self, local):
+        return bytes(self.text[self.text_offsets[local]:self.text_offsets[local + 1]]).decode()
+
+
+def _save(path, arrays):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), array)
+    os.replace(tmp, path)
+
+
+def _postings_arrays(vocab, term_ids, local_docs, tfs, base):
+    """Sort ``(term, doc, tf)`` triples by term and doc and build the term offsets."""
+    terms = np.array(list(vocab), dtype=f"S{MAX_TERM}")
+    order = np.argsort(terms, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    term_ids = rank[term_ids]
+    postings = np.lexsort((local_docs, term_ids))
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(term_ids, minlength=len(terms)), out=offsets[1:])
+    return {
+        "terms": terms[order],
+        "offsets": offsets,
+        "docs": (local_docs[postings] + base).astype(np.int32),
+        "tfs": tfs[postings],
+    }
+
+
+def build_segment(path, base, entries):
+    """Write ``entries`` (``(source, ref, text)``) as a segment; returns ``(count, tokens)``."""
+    vocab = {}
+    term_ids, local_docs, tfs = [], [], []
+    sources, refs, texts = [], [], []
+    for i, (source, ref, text) in enumerate(entries):
+        for term, tf in Counter(tokenize(text)).items():
+            term_ids.append(vocab.setdefault(term, len(vocab)))
+            local_docs.append(i)
+            tfs.append(tf)
+        sources.append(SOURCES.index(source))
+        refs.append(ref)
+        texts.append(text.encode())
+    count = len(texts)
+    if not count:
+        return 0, 0
+
+    local_docs = np.array(local_docs, dtype=np.int64)
+    tfs = np.minimum(np.array(tfs, dtype=np.int64), np.iinfo(np.uint16).max).astype(np.uint16)
+    lengths = np.bincount(local_docs, weights=tfs, minlength=count)
+    norms = np.sqrt(np.bincount(local_docs, weights=(1 + np.log(tfs)) ** 2, minlength=count))
+    text_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in texts], out=text_offsets[1:])
+    arrays = _postings_arrays(vocab, np.array(term_ids, dtype=np.int64), local_docs, tfs, base)
+    arrays.update(
+        lengths=lengths.astype(np.int32),
+        norms=norms.astype(np.float32),
+        sources=np.array(sources, dtype=np.uint8),
+        refs=np.array(refs, dtype=np.int64),
+        text=np.frombuffer(b"".join(texts), dtype=np.uint8),
+        text_offsets=text_offsets,
+    )
+    _save(path, arrays)
+    return count, int(lengths.sum())
+
+
+def merge_segments(path, segments):
+    """Write one segment holding every document of ``segments`` (contiguous, in order)."""
+    vocab = np.unique(np.concatenate([s.terms for s in segments]))
+    term_ids = np.concatenate([
+        np.repeat(np.searchsorted(vocab, s.terms), np.diff(s.offsets)) for s in segments
+    ])
+    docs = np.concatenate([s.docs for s in segments])
+    order = np.lexsort((docs, term_ids))
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=offsets[1:])
+    text_offsets = [np.zeros(1, dtype=np.int64)]
+    shift = 0
+    for s in segments:
+        text_offsets.append(s.text_offsets[1:] + shift)
+        shift += int(s.text_offsets[-1])
+    _save(path, {
+        "terms": vocab,
+        "offsets": offsets,
+        "docs": docs[order],
+        "tfs": np.concatenate([s.tfs for s in segments])[order],
+        "lengths": np.concatenate([s.lengths for s in segments]),
+        "norms": np.concatenate([s.norms for s in segments]),
+        "sources": np.concatenate([s.sources for s in segments]),
+        "refs": np.concatenate([s.refs for s in segments]),
+        "text": np.concatenate([s.text for s in segments]),
+        "text_offsets": np.concatenate(text_offsets),
+    })
+
+
+# ========= Index ========
+class SearchIndex:
+    """The segments listed in ``manifest.json``; reloads when another process updates it."""
+
+    def __init__(self, path=INDEX_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.manifest = {"generation": 0, "segments": [], "watermarks": {}, "stamps": {}}
+        self.segments = []
+        self._reload()
+
+    # ----- state -----
+    @property
+    def count(self):
+        return sum(s.count for s in self.segments)
+
+    @property
+    def tokens(self):
+        return sum(s.tokens for s in self.segments)
+
+    def _manifest_path(self):
+        return os.path.join(self.path, MANIFEST)
+
+    def _reload(self):
+        try:
+            stamp = os.stat(self._manifest_path()).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if stamp == self._stamp:
+            return
+        with open(self._manifest_path(), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.segments = [
+            Segment(os.path.join(self.path, s["name"]), s["base"], s["count"], s["tokens"])
+            for s in manifest["segments"]
+        ]
+        self.manifest = manifest
+        self._stamp = stamp
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._manifest_path())
+        self._reload()
+
+    # ----- writes -----
+    def add(self, entries, watermarks=None):
+        """Index ``entries`` (``(source, ref, text)``) as a new segment; returns how many."""
+        with self._lock, locks.file_lock(os.path.join(self._ensure_dir(), ".lock")):
+            self._reload()
+            added = self._add(entries, watermarks)
+            if len(self.segments) > MAX_SEGMENTS:
+                self._merge()
+            return added
+
+    def _record_stamps(self, stamps):
+        """Remember the ``storage.stamp`` of datasets that are fully indexed."""
+        with self._lock, locks.file_lock(os.path.join(self._ensure_dir(), ".lock")):
+            self._reload()
+            manifest = dict(self.manifest)
+            manifest["stamps"] = dict(manifest.get("stamps", {}), **stamps)
+            self._write_manifest(manifest)
+
+    def _ensure_dir(self):
+        os.makedirs(self.path, exist_ok=True)
+        return self.path
+
+    def _add(self, entries, watermarks):
+        manifest = dict(self.manifest)
+        generation = manifest["generation"] + 1
+        base = self.count
+        name = f"segment-{generation:06d}"
+        count, tokens = build_segment(os.path.join(self.path, name), base, entries)
+        manifest["generation"] = generation
+        manifest["watermarks"] = dict(manifest["watermarks"], **(watermarks or {}))
+        if count:
+            manifest["segments"] = manifest["segments"] + [
+                {"name": name, "base": base, "count": count, "tokens": tokens}
+            ]
+        self._write_manifest(manifest)
+        return count
+
+    def _merge(self):
+        manifest = dict(self.manifest)
+        generation = manifest["generation"] + 1
+        name = f"segment-{generation:06d}"
+        old = [s.path for s in self.segments]
+        merge_segments(os.path.join(self.path, name), self.segments)
+        manifest.update(generation=generation, segments=[
+            {"name": name, "base": 0, "count": self.count, "tokens": self.tokens}
+        ])
+        self._write_manifest(manifest)
+        for path in old:
+            # Readers in other processes keep their mappings after the unlink
+            shutil.rmtree(path, ignore_errors=True)
+
+    def update(self, store=None, batch=100_000):
+        """Index mood checks and dataset rows added since the last update."""
+        import storage
+
+        store = store or history.HistoryStore()
+        added = 0
+        marks = self.manifest["watermarks"]
+        last = marks.get("checkins", 0)
+        while True:
+            rows = store.since(last, batch)
+            if not rows:
+                break
+            last = rows[-1]["id"]
+            added += self.add(
+                (("checkins", row["id"], row["journal_entry"]) for row in rows if row["journal_entry"]),
+                {"checkins": last},
+            )
+        for name in storage.DATASETS:
+            # Only read a dataset's text when its files changed since it was indexed
+            stamp = storage.stamp(name)
+            if self.manifest.get("stamps", {}).get(name) == stamp:
+                continue
+            done = marks.get(name, 0)
+            texts = storage.read(name, columns=["journal_text"])["journal_text"].to_pylist()
+            if len(texts) > done:
+                added += self.add(
+                    ((name, i, text) for i, text in enumerate(texts[done:], done) if text),
+                    {name: len(texts)},
+                )
+            self._record_stamps({name: stamp})
+        return added
+
+    # ----- reads -----
+    def _segment_of(self, doc):
+        return self.segments[int(np.searchsorted([s.base for s in self.segments], doc, "right")) - 1]
+
+    def document(self, doc, score=0.0):
+        segment = self._segment_of(doc)
+        local = doc - segment.base
+        return Hit(int(doc), SOURCES[segment.sources[local]], int(segment.refs[local]),
+                   float(score), segment.document_text(local))
+
+    def _accumulate(self, weighted_terms, weigh, sources=None):
+        """Sum ``weigh(segment, docs, tfs, term_weight)`` per document over the terms.
+
+        Returns ``(docs, scores)`` for every document that matched.
+        """
+        codes = [SOURCES.index(s) for s in sources] if sources else None
+        parts_docs, parts_scores = [], []
+        for term, weight in weighted_terms:
+            for segment in self.segments:
+                docs, tfs = segment.postings(term)
+                if not len(docs):
+                    continue
+                if codes is not None:
+                    keep = np.isin(segment.sources[docs - segment.base], codes)
+                    docs, tfs = docs[keep], tfs[keep]
+                parts_docs.append(docs)
+                parts_scores.append(weigh(segment, docs, tfs.astype(np.float32), weight))
+        if not parts_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        docs = np.concatenate(parts_docs)
+        scores = np.concatenate(parts_scores)
+        if len(parts_docs) == 1:
+            return docs, scores
+        if len(docs) > self.count // 8:
+            # Dense accumulator: cheaper than sorting when most documents match
+            totals = np.zeros(self.count, dtype=np.float32)
+            for d, s in zip(parts_docs, parts_scores):
+                totals[d] += s  # doc ids are unique within one term's postings
+            matched = np.flatnonzero(totals)
+            return matched, totals[matched]
+        unique, inverse = np.unique(docs, return_inverse=True)
+        return unique, np.bincount(inverse, weights=scores).astype(np.float32)
+
+    def _top(self, docs, scores, k):
+        if len(docs) > k:
+            best = np.argpartition(-scores, k)[:k]
+            docs, scores = docs[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return [self.document(int(docs[i]), scores[i]) for i in order]
+
+    def _df(self, term):
+        return sum(len(s.postings(term)[0]) for s in self.segments)
+
+    def search(self, query, k=10, sources=None):
+        """Top ``k`` documents for ``query`` by BM25, optionally only from ``sources``."""
+        self._reload()
+        n = self.count
+        if not n:
+            return []
+        avgdl = self.tokens / n
+        weighted = []
+        for term in dict.fromkeys(tokenize(query)):
+            term = term.encode()
+            df = self._df(term)
+            if df:
+                weighted.append((term, math.log(1 + (n - df + 0.5) / (df + 0.5))))
+
+        def bm25(segment, docs, tfs, idf):
+            lengths = segment.lengths[docs - segment.base]
+            return idf * tfs * (K1 + 1) / (tfs + K1 * (1 - B + B * lengths / avgdl))
+
+        return self._top(*self._accumulate(weighted, bm25, sources), k)
+
+    def similar(self, text, k=10, sources=None, exclude=None):
+        """Top ``k`` documents most like ``text``; ``exclude`` skips one doc id."""
+        self._reload()
+        n = self.count
+        if not n:
+            return []
+        weighted = []
+        for term, tf in Counter(tokenize(text)).items():
+            term = term.encode()
+            df = self._df(term)
+            if df:
+                idf = math.log((n + 1) / (df + 1)) + 1
+                weighted.append((term, (1 + math.log(tf)) * idf))
+        norm = math.sqrt(sum(w * w for _, w in weighted)) or 1.0
+
+        def cosine(segment, docs, tfs, weight):
+            return weight * (1 + np.log(tfs)) / (segment.norms[docs - segment.base] * norm)
+
+        docs, scores = self._accumulate(weighted, cosine, sources)
+        if exclude is not None:
+            keep = docs != exclude
+            docs, scores = docs[keep], scores[keep]
+        return self._top(docs, scores, k)
+
+    def stats(self):
+        return {
+            "documents": self.count,
+            "segments": len(self.segments),
+            "terms": sum(len(s.terms) for s in self.segments),
+            "bytes": sum(os.path.getsize(p) for s in self.segments
+                         for p in glob.glob(os.path.join(s.path, "*.npy"))),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search journal entries.")
+    parser.add_argument("command", choices=["index", "query", "similar", "info"])
+    parser.add_argument("text", nargs="*")
+    parser.add_argument("--source", action="append", choices=SOURCES)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--path", default=INDEX_DIR)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.path)
+    if args.command == "index":
+        print(f"Indexed {index.update()} new entries; {index.stats()}")
+        return
+    if args.command == "info":
+        print(index.stats())
+        return
+    find = index.search if args.command == "query" else index.similar
+    for hit in find(" ".join(args.text), args.k, args.source):
+        print(f"{hit.score:7.3f}  {hit.source}:{hit.ref:<8} {hit.text}")
+
+
+if __name__ == "__main__":
+    main()
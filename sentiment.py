@@ -0,0 +1,196 @@
+"""Sentiment backends used by the scoring engine.
+
+Two backends share the ``SentimentBackend`` interface:
+
+- ``TextBlobBackend`` builds a ``TextBlob`` per entry (the original behaviour).
+- ``LexiconBackend`` scores with TextBlob's pattern lexicon precompiled into a
+  flat JSON dict. The lexicon is loaded once per process, tokenization is
+  memoized and textblob itself is never imported on the hot path.
+
+The active backend is chosen with the ``NATUREMIND_SENTIMENT`` environment
+variable (``textblob`` by default, or ``lexicon``).
+"""
+import json
+import os
+import re
+from functools import lru_cache
+
+BACKEND_ENV = "NATUREMIND_SENTIMENT"
+DEFAULT_BACKEND = "textblob"
+LEXICON_CACHE = os.path.join("data", "cache", "sentiment-lexicon.json")
+
+NEGATIONS = ("no", "not", "n't", "never")
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+
+
+class SentimentBackend:
+    """Interface: polarity in [-1.0, 1.0] for one text or a batch of texts."""
+    name = None
+
+    def polarity(self, text):
+        raise NotImplementedError
+
+    def polarity_many(self, texts):
+        """Polarity for each text, analysing duplicate texts only once."""
+        texts = list(texts)
+        lookup = {t: self.polarity(t) for t in dict.fromkeys(texts)}
+        return [lookup[t] for t in texts]
+
+
+class TextBlobBackend(SentimentBackend):
+    name = "textblob"
+
+    def polarity(self, text):
+        from textblob import TextBlob
+        return TextBlob(text).sentiment.polarity
+
+
+class LexiconBackend(SentimentBackend):
+    """Port of pattern's ``Sentiment.assessments`` over a precompiled lexicon."""
+    name = "lexicon"
+
+    def __init__(self, lexicon=None):
+        lexicon = lexicon or load_lexicon()
+        self.words = lexicon["words"]
+        self.emoticons = {face.lower(): p for face, p in lexicon["emoticons"].items()}
+        self.rejoin = compile_emoticons(lexicon["emoticons"])
+
+    def polarity(self, text):
+        scores = [p for p, _ in self.assess(tokenize(text, self.rejoin))]
+        return sum(scores) / float(len(scores) or 1)
+
+    def assess(self, tokens):
+        """Return ``(polarity, negated)`` per assessed chunk of ``tokens``."""
+        words = self.words
+        a = []      # [polarity, intensity, negated]
+        m = None    # Preceding modifier ("really good")
+        n = None    # Preceding negation ("not good")
+        for w in tokens:
+            entry = words.get(w)
+            if entry is not None:
+                p, i, is_modifier = entry
+                if m is None:
+                    a.append([p, i, False])
+                else:
+                    a[-1][0] = max(-1.0, min(p * a[-1][1], 1.0))
+                    a[-1][1] = i
+                if n is not None:
+                    a[-1][1] = 1.0 / a[-1][1]
+                    a[-1][2] = True
+                m = w if is_modifier else None
+                n = w if w in NEGATIONS else None
+            else:
+                if w in NEGATIONS:
+                    n = w
+                elif n and len(w.strip("'")) > 1:
+                    n = None
+                if n is not None and m is not None and m.endswith("ly"):
+                    a[-1][2] = True
+                    n = None
+                elif m and len(w) > 2:
+                    m = None
+                if w == "!" and a:
+                    a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, 1.0))
+                if w == "(!)":
+                    a.append([0.0, 1.0, False])
+                if not w.isalpha() and len(w) <= 5 and w not in PUNCTUATION:
+                    p = self.emoticons.get(w)
+                    if p is not None:
+                        a.append([p, 1.0, False])
+        # "not good" = slightly bad, "not bad" = slightly good
+        return [(p * -0.5 if negated else p, negated) for p, _, negated in a]
+
+
+# ========= Tokenization ========
+_CONTRACTIONS = re.compile(r"('d|'m|'s|'ll|'re|'ve|n't)")
+_QUOTES = str.maketrans({q: f" {q} " for q in "“”‘’'\""})
+_LEADING = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING = _LEADING + (".",)
+_SARCASM = re.compile(r"\( ?\! ?\)")
+
+
+def compile_emoticons(faces):
+    """Regex that glues emoticons split by the tokenizer back together."""
+    spaced = (r" ?".join(re.escape(c) for c in face) for face in faces)
+    return re.compile(r"(%s)($|\s)" % "|".join(spaced))
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text, emoticons=None):
+    """Lowercased tokens with punctuation split off, as pattern's tokenizer.
+
+    ``emoticons`` is a pattern from ``compile_emoticons``; matching faces
+    such as ``: )`` are kept as a single token.
+    """
+    text = _CONTRACTIONS.sub(r" \1", text).translate(_QUOTES)
+    tokens = []
+    for t in text.split():
+        tail = []
+        while t.startswith(_LEADING):
+            tokens.append(t[0])
+            t = t[1:]
+        while t.endswith(_TRAILING):
+            if t.endswith("..."):
+                tail.append("...")
+                t = t[:-3].rstrip(".")
+            else:
+                tail.append(t[-1])
+                t = t[:-1]
+        if t:
+            tokens.append(t)
+        tokens.extend(reversed(tail))
+    text = _SARCASM.sub("(!)", " ".join(tokens))
+    if emoticons is not None:
+        text = emoticons.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), text)
+    return tuple(w.lower() for w in text.split())
+
+
+# ========= Lexicon ========
+def compile_lexicon():
+    """Flatten textblob's pattern lexicon to ``{word: [p, i, is_modifier]}``.
+
+    Uses the POS-averaged scores that TextBlob applies to plain strings, so
+    the result is the same table its analyzer consults.
+    """
+    from textblob._text import EMOTICONS
+    from textblob.en import sentiment as pattern_sentiment
+
+    pattern_sentiment.load()
+    words = {
+        w: [pos[None][0], pos[None][2], "RB" in pos]
+        for w, pos in dict.items(pattern_sentiment)
+    }
+    emoticons = {face: p for (_, p), faces in EMOTICONS.items() for face in faces}
+    return {"words": words, "emoticons": emoticons}
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(path=LEXICON_CACHE):
+    """Load the compiled lexicon, compiling and caching it on first use."""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    lexicon = compile_lexicon()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    return lexicon
+
+
+# ========= Backend Selection ========
+BACKENDS = {
+    TextBlobBackend.name: TextBlobBackend,
+    LexiconBackend.name: LexiconBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_backend(name=None):
+    """Process-wide backend instance, ``NATUREMIND_SENTIMENT`` by default."""
+    name = name or os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown sentiment backend: {name!r}") from None
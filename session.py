@@ -0,0 +1,123 @@
+"""Compact per-session state and the store for its large values.
+
+``st.session_state`` lives in server memory for every open browser tab, so it
+only holds small, fixed-shape objects: ``MoodData`` and ``SessionData`` use
+``__slots__`` (no per-instance ``__dict__``) and keep numbers and short
+labels. Values that grow with use (the journal text and the chat turns)
+are written to ``SessionStore``, an SQLite table keyed by
+``<session id>/<name>``, and read back only on the page that shows them.
+
+Stored values expire after ``TTL`` seconds without a write, since Streamlit
+gives no signal when a session ends.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from theme import RISK_COLORS, accent_color
+
+DB_PATH = os.path.join("data", "sessions.db")
+TTL = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_values (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_session_values_updated ON session_values (updated_at);
+"""
+
+NOT_ANALYZED = "Not analyzed yet"
+EXERCISE_LEVELS = ["None", "Light", "Moderate", "Intense"]
+
+
+class MoodData:
+    """The latest mood check; the journal text is kept in ``SessionStore``."""
+
+    __slots__ = ("mood", "mood_score", "risk", "sleep_hours", "screen_time",
+                 "outdoor_time", "exercise")
+
+    def __init__(self, mood=NOT_ANALYZED, mood_score=0.0, risk=NOT_ANALYZED,
+                 sleep_hours=7, screen_time=5, outdoor_time=30, exercise="Moderate"):
+        self.mood = mood
+        self.mood_score = mood_score
+        self.risk = risk
+        self.sleep_hours = sleep_hours
+        self.screen_time = screen_time
+        self.outdoor_time = outdoor_time
+        self.exercise = exercise
+
+    @property
+    def mood_color(self):
+        return RISK_COLORS.get(self.risk, accent_color)
+
+    def update(self, values):
+        """Copy the matching keys of a ``mood_data``-style dict; others are ignored."""
+        for name in self.__slots__:
+            if name in values:
+                setattr(self, name, values[name])
+
+
+class SessionData:
+    """Per-session identifiers and small flags."""
+
+    __slots__ = ("id", "mood", "chat_summary")
+
+    def __init__(self, session_id=None):
+        self.id = session_id or uuid.uuid4().hex
+        self.mood = MoodData()
+        self.chat_summary = ""
+
+    def key(self, name):
+        """``SessionStore`` key of one of this session's large values."""
+        return f"{self.id}/{name}"
+
+
+class SessionStore:
+    """Thread-safe key/value store for large session values, shared per process."""
+
+    def __init__(self, path=DB_PATH, ttl=TTL):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.prune()
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM session_values WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, key, value):
+        """Store any JSON-serializable ``value`` under ``key``; returns ``key``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO session_values VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                "SET value = excluded.value, updated_at = excluded.updated_at",
+                (key, json.dumps(value), time.time()),
+            )
+        return key
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM session_values WHERE key = ?", (key,))
+
+    def prune(self):
+        """Drop values not written for ``ttl`` seconds; returns how many."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM session_values WHERE updated_at < ?", (time.time() - self.ttl,)
+            ).rowcount
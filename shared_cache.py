@@ -0,0 +1,433 @@
+"""Caches shared by every Streamlit server process of a deployment.
+
+    NATUREMIND_CACHE_URL=sqlite:///data/cache/shared.db   # processes on one host
+    NATUREMIND_CACHE_URL=redis://cache.internal:6379/0    # processes on any host
+
+With the variable unset each process keeps its own caches, as before. When
+it is set, the Lottie animation cache and the Wellness Guide suggestion
+cache read and write through the shared store, so a new worker starts warm
+and a value is computed once per deployment instead of once per process.
+
+A backend stores bytes under string keys with a TTL and stays within a size
+bound:
+
+- ``MemoryBackend``: per process, least recently used entries evicted past
+  ``max_bytes`` (``memory://``, mostly for tests and benchmarks);
+- ``SQLiteBackend``: one WAL database file; a trigger keeps the total size,
+  and the least recently used entries are evicted past ``max_bytes``;
+- ``RedisBackend``: any server speaking the Redis protocol (RESP). Eviction
+  is the server's ``maxmemory`` policy; set it to ``allkeys-lru``.
+
+``Cache`` puts one namespace on a backend: keys are prefixed and versioned,
+values are JSON (tuples come back as lists), and hits, misses and errors
+are counted, both in ``Cache.stats`` and in the ``/metrics`` counters. A
+backend that cannot be reached is logged and treated as a miss; the caller
+computes the value itself.
+"""
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlparse
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+URL_ENV = "NATUREMIND_CACHE_URL"
+PREFIX = "naturemind"
+MAX_BYTES = 256 * 2**20
+TOUCH_AFTER = 60  # seconds between last-use updates of a SQLite entry
+
+# Errors that mean "no cache right now", not a bug in the caller
+UNAVAILABLE = (OSError, sqlite3.Error, EOFError)
+
+
+class RedisError(Exception):
+    """Error reply from the Redis server."""
+
+
+# ========= Backends ========
+class MemoryBackend:
+    """In-process LRU byte store bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()   # key -> (expires, value), least recent first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (time.time() + ttl, value)
+            self._bytes += len(key) + len(value)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._pop(key)
+
+    def _pop(self, key):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "evictions": self.evictions}
+
+    def close(self):
+        pass
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_used ON cache_entries (used);
+CREATE TABLE IF NOT EXISTS cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    evictions INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_size VALUES (0, 0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes + NEW.size, entries = entries + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_update AFTER UPDATE OF size ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes - OLD.size, entries = entries - 1;
+END;
+"""
+
+
+class SQLiteBackend:
+    """Byte store in one SQLite file, shared by the processes of a host.
+
+    Last use is recorded at most every ``TOUCH_AFTER`` seconds per entry, so
+    reads rarely write. Past ``max_bytes``, expired entries go first, then
+    the least recently used until a tenth of the budget is free again.
+    """
+
+    def __init__(self, path, max_bytes=MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SQLITE_SCHEMA)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires, used FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires, used = row
+            if expires <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ? AND expires <= ?", (key, now))
+                return None
+            if now - used > TOUCH_AFTER:
+                self._conn.execute("UPDATE cache_entries SET used = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache_entries VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                "SET value = excluded.value, size = excluded.size, expires = excluded.expires, "
+                "used = excluded.used",
+                (key, value, len(key) + len(value), now + ttl, now),
+            )
+            (size,) = self._conn.execute("SELECT bytes FROM cache_size").fetchone()
+            if size > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM cache_entries WHERE expires <= ?", (now,))
+            # Keep the most recently used entries that fit in 90% of the budget
+            evicted = self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "  SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used DESC, key) AS kept"
+                "                   FROM cache_entries) WHERE kept > ?)",
+                (int(self.max_bytes * 0.9),),
+            ).rowcount
+            self._conn.execute("UPDATE cache_size SET evictions = evictions + ?", (evicted,))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix=""):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def stats(self):
+        with self._lock:
+            size, entries, evictions = self._conn.execute(
+                "SELECT bytes, entries, evictions FROM cache_size"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "evictions": evictions}
+
+    def close(self):
+        self._conn.close()
+
+
+class RedisBackend:
+    """Minimal Redis protocol (RESP2) client with a small connection pool.
+
+    Only the commands the cache needs: ``GET``, ``SET ... PX``, ``DEL``,
+    ``SCAN`` and ``INFO``. ``stub_server.RespStub`` is a local stand-in.
+    """
+
+    def __init__(self, host="127.0.0.1", port=6379, db=0, password=None, timeout=0.5, pool_size=8):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    # ----- protocol -----
+    def _connect(self):
+        sock = socket.create_connection(self.address, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                self._call(conn, "AUTH", self.password)
+            if self.db:
+                self._call(conn, "SELECT", self.db)
+        except BaseException:
+            self._close(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        conn[1].close()
+        conn[0].close()
+
+    def _call(self, conn, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts += [b"$%d\r\n" % len(arg), arg, b"\r\n"]
+        conn[0].sendall(b"".join(parts))
+        return self._read(conn[1])
+
+    def _read(self, f):
+        line = f.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = f.read(n + 2)
+            if len(data) != n + 2:
+                raise EOFError("Redis connection closed")
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read(f) for _ in range(n)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def command(self, *args):
+        """Run one command on a pooled connection and return the decoded reply."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            reply = self._call(conn, *args)
+        except RedisError:
+            self._release(conn)
+            raise
+        except BaseException:
+            self._close(conn)
+            raise
+        self._release(conn)
+        return reply
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._close(conn)
+
+    # ----- backend -----
+    def get(self, key):
+        return self.command("GET", key)
+
+    def set(self, key, value, ttl):
+        self.command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    def delete(self, key):
+        self.command("DEL", key)
+
+    def clear(self, prefix=""):
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", prefix + "*", "COUNT", 500)
+            if keys:
+                self.command("DEL", *keys)
+            if cursor in (b"0", "0"):
+                return
+
+    def stats(self):
+        info = {}
+        for section in ("keyspace", "stats", "memory"):
+            for line in self.command("INFO", section).decode().splitlines():
+                name, _, value = line.partition(":")
+                info[name] = value
+        keyspace = dict(part.split("=") for part in info.get(f"db{self.db}", "keys=0").split(","))
+        return {
+            "entries": int(keyspace["keys"]),
+            "bytes": int(info.get("used_memory", 0)),
+            "evictions": int(info.get("evicted_keys", 0)),
+        }
+
+    def close(self):
+        while True:
+            try:
+                self._close(self._pool.get_nowait())
+            except queue.Empty:
+                return
+
+
+def from_url(url):
+    """Backend for ``memory://``, ``sqlite:///<path>`` or ``redis://[:password@]host[:port][/db]``.
+
+    ``?max_mb=`` sets the size bound of the memory and SQLite backends.
+    """
+    parsed = urlparse(url)
+    options = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+    max_bytes = int(float(options.get("max_mb", MAX_BYTES / 2**20)) * 2**20)
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_bytes)
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(unquote(parsed.path[1:]), max_bytes)
+    if parsed.scheme == "redis":
+        return RedisBackend(
+            parsed.hostname or "127.0.0.1", parsed.port or 6379,
+            db=int(parsed.path.strip("/") or 0),
+            password=unquote(parsed.password) if parsed.password else None,
+            timeout=float(options.get("timeout", 0.5)),
+        )
+    raise ValueError(f"Unsupported cache URL: {url!r}")
+
+
+def from_env():
+    """Backend configured by ``NATUREMIND_CACHE_URL``, or ``None`` when unset."""
+    url = os.environ.get(URL_ENV)
+    return from_url(url) if url else None
+
+
+# ========= Namespaced cache ========
+class Cache:
+    """JSON values under ``<PREFIX>:<namespace>:v<version>:`` keys of ``backend``.
+
+    Bump ``version`` when the cached values change shape.
+    """
+
+    def __init__(self, backend, namespace, ttl, version=1):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.prefix = f"{PREFIX}:{namespace}:v{version}:"
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    def _count(self, result):
+        self.stats[result] += 1
+        metrics.REGISTRY.inc(f"naturemind_cache_{result}_total", "cache", self.namespace)
+
+    def get(self, key, default=None):
+        try:
+            with metrics.span(f"cache.{self.namespace}"):
+                raw = self.backend.get(self.prefix + key)
+            value = default if raw is None else json.loads(raw)
+        except (*UNAVAILABLE, RedisError, ValueError) as e:
+            log.warning("Shared cache %s unavailable: %s", self.namespace, e)
+            self._count("errors")
+            return default
+        self._count("misses" if raw is None else "hits")
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable ``value``; returns False if the backend failed."""
+        try:
+            self.backend.set(self.prefix + key, json.dumps(value, separators=(",", ":")).encode(),
+                             self.ttl if ttl is None else ttl)
+        except (*UNAVAILABLE, RedisError) as e:
+            log.warning("Shared cache %s unavailable: %s", self.namespace, e)
+            self._count("errors")
+            return False
+        self._count("sets")
+        return True
+
+    def delete(self, key):
+        try:
+            self.backend.delete(self.prefix + key)
+        except (*UNAVAILABLE, RedisError) as e:
+            log.warning("Shared cache %s unavailable: %s", self.namespace, e)
+
+    def clear(self):
+        """Drop every entry of this namespace and version."""
+        try:
+            self.backend.clear(self.prefix)
+        except (*UNAVAILABLE, RedisError) as e:
+            log.warning("Shared cache %s unavailable: %s", self.namespace, e)
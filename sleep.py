@@ -0,0 +1,76 @@
+"""Rolling sleep statistics over a user's nightly entries.
+
+``frame`` turns ``HistoryStore.sleep_nights`` rows into one row per calendar
+night (``NaN`` where nothing was recorded) with, for every window in
+``WINDOWS``, the rolling mean, the night-to-night standard deviation
+(variability) and a 0-100 consistency score. Each column is one pandas
+rolling-window pass over the whole series, not a loop over nights.
+
+Consistency multiplies how many of the window's nights were recorded by how
+steady they were: logging every night with the same hours scores 100, and a
+standard deviation of ``SPREAD_LIMIT`` hours or more scores 0.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+WINDOWS = (7, 30, 90)
+TARGET_HOURS = 7
+SPREAD_LIMIT = 2.0  # hours of standard deviation that count as no consistency
+
+
+def history_start(end, days=max(WINDOWS)):
+    """First night to load so the ``days`` nights before ``end`` get full windows."""
+    return end - timedelta(days=days + max(WINDOWS) - 1)
+
+
+def nightly(rows, start, end):
+    """Hours per night for ``start <= night < end``, ``NaN`` for missing nights."""
+    index = pd.date_range(start, end - timedelta(days=1), freq="D", name="night")
+    if not rows:
+        return pd.Series(np.nan, index=index, name="hours")
+    hours = pd.Series(
+        [row["hours"] for row in rows],
+        index=pd.to_datetime([row["night"] for row in rows]),
+        dtype="float64",
+        name="hours",
+    )
+    return hours.reindex(index)
+
+
+def rolling(hours, windows=WINDOWS):
+    """``mean_<w>``, ``std_<w>`` and ``consistency_<w>`` columns next to ``hours``."""
+    columns = {"hours": hours}
+    recorded = hours.notna().astype("float64")
+    for w in windows:
+        window = hours.rolling(w, min_periods=1)
+        std = window.std(ddof=0)
+        coverage = recorded.rolling(w, min_periods=1).sum() / w
+        columns[f"mean_{w}"] = window.mean()
+        columns[f"std_{w}"] = std
+        columns[f"consistency_{w}"] = 100 * coverage * (1 - std / SPREAD_LIMIT).clip(0, 1)
+    return pd.DataFrame(columns)
+
+
+def frame(rows, end, days=max(WINDOWS)):
+    """Rolling statistics for the ``days`` nights before ``end``.
+
+    ``rows`` should reach back to ``history_start(end, days)``.
+    """
+    stats = rolling(nightly(rows, history_start(end, days), end))
+    return stats.iloc[-days:]
+
+
+def summary(stats, windows=WINDOWS):
+    """Latest ``mean``, ``std``, ``consistency`` and ``nights`` recorded per window."""
+    latest = stats.iloc[-1]
+    return {
+        w: {
+            "mean": latest[f"mean_{w}"],
+            "std": latest[f"std_{w}"],
+            "consistency": latest[f"consistency_{w}"],
+            "nights": int(stats["hours"].iloc[-w:].notna().sum()),
+        }
+        for w in windows
+    }
@@ -0,0 +1,77 @@
+"""Import-time profile of the app's startup and of each page.
+
+    python app_py.py --profile-startup [--top N]
+
+Each phase is imported in a fresh interpreter under ``python -X importtime``
+so the numbers are cold-start costs. Page phases are measured on top of the
+startup imports and only count what the page itself adds.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules app_py.py imports at the top, then what each page imports lazily
+STARTUP = ["streamlit", "views"]
+PAGES = {
+    "Welcome": ["streamlit_lottie"],
+    "Mood Check": ["streamlit_lottie", "scoring", "textblob"],
+    "Wellness Guide": ["streamlit_lottie", "pandas", "altair", "habits", "sleep"],
+    "Wellness Chat": ["openai"],
+    "Feedback": ["streamlit_lottie"],
+    "Cohort Analytics": ["pandas", "altair", "habits"],
+    "Journal Search": ["numpy", "search"],
+}
+
+MARKER = "--profile-phase--"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importtime(before, modules):
+    """``[(self_us, cumulative_us, depth, module)]`` for ``modules`` after ``before``."""
+    code = "; ".join(
+        [f"import {m}" for m in before]
+        + [f"import sys; sys.stderr.write({MARKER!r} + '\\n')"]
+        + [f"import {m}" for m in modules]
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    _, _, measured = proc.stderr.partition(MARKER)
+    rows = []
+    for match in LINE.finditer(measured):
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def report(name, rows, top):
+    roots = [r for r in rows if r[2] == 0]
+    total = sum(r[1] for r in roots)
+    print(f"{name:<16} {total / 1000:8.1f} ms  ({len(rows)} modules)")
+    for self_us, cumulative_us, _, module in sorted(roots, reverse=True, key=lambda r: r[1])[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import cost of startup and pages.")
+    parser.add_argument("--top", type=int, default=5, help="modules listed per phase")
+    args = parser.parse_args(argv)
+
+    print("Cold import cost (python -X importtime)\n")
+    startup = report("Startup", importtime([], STARTUP), args.top)
+    for page, modules in PAGES.items():
+        page_cost = report(page, importtime(STARTUP, modules), args.top)
+        print(f"{'':<16} {(startup + page_cost) / 1000:8.1f} ms  first render total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Session defaults and the per-process resources shared by every page."""
+import streamlit as st
+
+import analytics
+import chat
+import history
+import jobs
+import meals
+import metrics
+import session
+import shared_cache
+import suggestions
+
+
+def init_session_state(default_page):
+    """Fill in session defaults; only does work on a session's first run."""
+    if st.session_state.get("initialized"):
+        return
+    if 'page' not in st.session_state:
+        st.session_state.page = default_page
+    if 'mood_analyzed' not in st.session_state:
+        st.session_state.mood_analyzed = False
+    if 'gender' not in st.session_state:
+        st.session_state.gender = None
+    if 'chat_gender' not in st.session_state:
+        st.session_state.chat_gender = "female"
+    if 'session' not in st.session_state:
+        st.session_state.session = session.SessionData()
+    st.session_state.initialized = True
+
+
+@st.cache_resource
+def get_cache_backend():
+    """Cross-process cache from ``NATUREMIND_CACHE_URL``; ``None`` when unset."""
+    return shared_cache.from_env()
+
+
+def shared(namespace, ttl):
+    """A ``shared_cache.Cache`` namespace, or ``None`` without a shared backend."""
+    backend = get_cache_backend()
+    return None if backend is None else shared_cache.Cache(backend, namespace, ttl)
+
+
+@st.cache_resource
+def get_history():
+    return history.HistoryStore()
+
+
+@st.cache_resource
+def get_habits():
+    import habits
+
+    return habits.HabitStore()
+
+
+@st.cache_resource
+def get_jobs():
+    return jobs.JobQueue()
+
+
+@st.cache_resource
+def get_meal_plans():
+    return meals.MealPlanStore()
+
+
+@st.cache_resource
+def get_metrics_server():
+    """Start the rerun log and the ``/metrics`` endpoint once per process."""
+    metrics.configure_log()
+    return metrics.start_server()
+
+
+@st.cache_resource
+def get_search_index():
+    import search
+
+    return search.SearchIndex()
+
+
+@st.cache_resource
+def get_session_store():
+    return session.SessionStore()
+
+
+@st.cache_resource
+def get_suggestions():
+    return suggestions.SuggestionService(shared=shared("suggestions", suggestions.TTL))
+
+
+@st.cache_resource
+def get_rollups():
+    return analytics.FileRollups()
+
+
+@st.cache_resource
+def get_mood_model():
+    """The trained mood classifier, or ``None`` to score with the formula."""
+    import mood_model
+    return mood_model.load_default()
+
+
+def secrets():
+    """``st.secrets`` as a dict, empty when no secrets file exists."""
+    try:
+        return dict(st.secrets)
+    except FileNotFoundError:
+        return {}
+
+
+@st.cache_resource
+def get_chat_provider():
+    return chat.get_provider(secrets())
+
+
+def current_user():
+    return st.session_state.get("name", "Anonymous")
+
+
+def current_session():
+    """This browser session's ``session.SessionData``."""
+    return st.session_state.session
@@ -0,0 +1,247 @@
+"""Columnar Parquet copies of the datasets and of the app's own records.
+
+    python storage.py import     # convert everything that changed
+    python storage.py info       # list the stored tables
+
+Each table lives under ``data/parquet/<table>/`` with typed columns
+(dictionary-encoded moods, int8 hours, boolean activity), so analytics read
+only the columns they need from memory-mapped files instead of re-parsing
+CSV text:
+
+- ``wellness`` and ``journal``: the bundled CSV datasets, one file each.
+- ``checkins``: mood checks from ``history.db``, partitioned by
+  ``month=YYYY-MM`` and appended incrementally by row id.
+- ``feedback``: one file per feedback CSV, partitioned by month; rotated
+  files are converted once, the active file on every import.
+
+``load`` falls back to parsing the source CSV when a dataset has not been
+imported yet, so callers work either way.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import threading
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+import feedback
+import history
+import locks
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PARQUET_DIR = os.path.join("data", "parquet")
+
+MOOD = pa.dictionary(pa.int8(), pa.string())
+
+DATASET_SCHEMA = pa.schema([
+    ("journal_text", pa.string()),
+    ("sleep_hours", pa.int8()),
+    ("screen_time", pa.int8()),
+    ("physical_activity", pa.bool_()),
+    ("mood", MOOD),
+])
+CHECKIN_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("user", pa.string()),
+    ("created_at", pa.timestamp("s")),
+    ("mood", MOOD),
+    ("mood_score", pa.float64()),
+    ("risk", MOOD),
+    ("sleep_hours", pa.int8()),
+    ("screen_time", pa.int8()),
+    ("outdoor_time", pa.int16()),
+    ("exercise", MOOD),
+    ("journal_entry", pa.string()),
+])
+FEEDBACK_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("date", pa.date32()),
+    ("rating", pa.int8()),
+    ("feedback", pa.string()),
+])
+
+# Source CSVs of the bundled datasets; ``journal`` has only the text column
+DATASETS = {
+    "wellness": os.path.join(ROOT, "StudentWelllness.csv"),
+    "journal": os.path.join(ROOT, "journal_text.csv"),
+}
+
+_PART = re.compile(r"part-(\d+)-(\d+)\.parquet$")
+_write_lock = threading.Lock()
+
+
+def table_dir(name, root=PARQUET_DIR):
+    return os.path.join(root, name)
+
+
+def _write(table, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def _with_month(table, column):
+    """Add the ``month`` partition column (``YYYY-MM``) derived from ``column``."""
+    return table.append_column("month", pc.strftime(table[column], format="%Y-%m"))
+
+
+def _write_partitioned(table, name, basename, root=PARQUET_DIR):
+    """Write ``table`` as ``<name>/month=<M>/<basename>``, one file per month."""
+    table = _with_month(table, "created_at" if "created_at" in table.column_names else "date")
+    for month in pc.unique(table["month"]).to_pylist():
+        part = table.filter(pc.equal(table["month"], month)).drop_columns(["month"])
+        _write(part, os.path.join(table_dir(name, root), f"month={month}", basename))
+
+
+# ========= CSV import path ========
+def read_dataset_csv(path):
+    """Parse a dataset CSV into ``DATASET_SCHEMA`` columns (those present)."""
+    with open(path, encoding="utf-8-sig") as f:
+        header = f.readline().strip().split(",")
+    fields = [f for f in DATASET_SCHEMA if f.name in header]
+    table = pv.read_csv(path, convert_options=pv.ConvertOptions(
+        column_types={f.name: (pa.string() if f.name == "mood" else f.type) for f in fields},
+        true_values=["Yes"],
+        false_values=["No"],
+    ))
+    if "mood" in table.column_names:
+        table = table.set_column(table.column_names.index("mood"), "mood", table["mood"].cast(MOOD))
+    return table.select([f.name for f in fields])
+
+
+def read_feedback_csv(path):
+    """Parse a feedback CSV, with or without the header row older files lack."""
+    with open(path, encoding="utf-8") as f:
+        has_header = f.readline().strip().split(",") == feedback.HEADER
+    return pv.read_csv(path, read_options=pv.ReadOptions(
+        column_names=feedback.HEADER, skip_rows=1 if has_header else 0,
+    ), convert_options=pv.ConvertOptions(column_types=FEEDBACK_SCHEMA))
+
+
+# ========= Import ========
+def import_dataset(name, root=PARQUET_DIR):
+    """Convert one bundled dataset if its CSV is newer than the Parquet copy."""
+    src = DATASETS[name]
+    dst = os.path.join(table_dir(name, root), f"{name}.parquet")
+    if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src):
+        return 0
+    table = read_dataset_csv(src)
+    _write(table, dst)
+    return table.num_rows
+
+
+def import_checkins(store, root=PARQUET_DIR, batch=100_000):
+    """Append mood checks recorded since the last import."""
+    last = max(
+        (int(m.group(2)) for m in map(_PART.search, glob.glob(
+            os.path.join(table_dir("checkins", root), "*", "part-*.parquet"))) if m),
+        default=0,
+    )
+    added = 0
+    while True:
+        rows = store.since(last, batch)
+        if not rows:
+            return added
+        columns = {f.name: [row[f.name] for row in rows] for f in CHECKIN_SCHEMA}
+        columns["created_at"] = pa.array(columns["created_at"]).cast(pa.timestamp("s"))
+        table = pa.table(columns, schema=CHECKIN_SCHEMA)
+        first, last = rows[0]["id"], rows[-1]["id"]
+        _write_partitioned(table, "checkins", f"part-{first:012d}-{last:012d}.parquet", root)
+        added += len(rows)
+
+
+def import_feedback(directory=feedback.FEEDBACK_DIR, root=PARQUET_DIR):
+    """Convert rotated feedback files once and the active file every time."""
+    stem, ext = os.path.splitext(feedback.FEEDBACK_FILE)
+    active = os.path.join(directory, feedback.FEEDBACK_FILE)
+    added = 0
+    if not os.path.isdir(directory):
+        return added
+    with locks.file_lock(active + ".lock"):
+        for path in sorted(glob.glob(os.path.join(directory, f"{stem}*{ext}"))):
+            basename = os.path.basename(path)[:-len(ext)] + ".parquet"
+            existing = glob.glob(os.path.join(table_dir("feedback", root), "*", basename))
+            if path != active and existing and min(map(os.path.getmtime, existing)) >= os.path.getmtime(path):
+                continue
+            for old in existing:
+                os.remove(old)
+            if not os.path.getsize(path):
+                continue
+            table = read_feedback_csv(path)
+            if table.num_rows:
+                _write_partitioned(table, "feedback", basename, root)
+                added += table.num_rows
+    return added
+
+
+def import_all(store=None, root=PARQUET_DIR):
+    """Import every table; returns ``{table: rows written}``."""
+    with _write_lock:
+        counts = {name: import_dataset(name, root) for name in DATASETS}
+        counts["checkins"] = import_checkins(store or history.HistoryStore(), root)
+        counts["feedback"] = import_feedback(root=root)
+    return counts
+
+
+# ========= Reads ========
+def read(name, columns=None, filters=None, root=PARQUET_DIR):
+    """Arrow table for ``name``, reading only ``columns`` and matching ``filters``.
+
+    Files are memory-mapped; ``filters`` use the ``pyarrow.parquet`` DNF form,
+    e.g. ``[("month", ">=", "2026-01")]`` skips whole partitions.
+    """
+    path = table_dir(name, root)
+    if not os.path.isdir(path):
+        if name in DATASETS:
+            table = read_dataset_csv(DATASETS[name])
+            return table.select(columns) if columns else table
+        raise FileNotFoundError(f"No Parquet table {name!r} under {root}; run `python storage.py import`")
+    return pq.read_table(path, columns=columns, filters=filters, memory_map=True, partitioning="hive")
+
+
+def stamp(name, root=PARQUET_DIR):
+    """``[mtime_ns, bytes]`` of the newest file and total size behind ``read(name)``.
+
+    Cheap to compute; it changes whenever the rows ``read`` returns may have.
+    """
+    path = table_dir(name, root)
+    if os.path.isdir(path):
+        files = [os.stat(p) for p in glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)]
+    else:
+        files = [os.stat(DATASETS[name])]
+    return [max((f.st_mtime_ns for f in files), default=0), sum(f.st_size for f in files)]
+
+
+def load(name, columns=None, filters=None, root=PARQUET_DIR):
+    """``read`` as a pandas DataFrame; dictionary columns become categoricals."""
+    return read(name, columns, filters, root).to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the Parquet copies of the app's data.")
+    parser.add_argument("command", choices=["import", "info"])
+    parser.add_argument("--root", default=PARQUET_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        for name, rows in import_all(root=args.root).items():
+            print(f"{name:<10} {rows:>8} rows written")
+        return
+    for name in [*DATASETS, "checkins", "feedback"]:
+        path = table_dir(name, args.root)
+        if not os.path.isdir(path):
+            print(f"{name:<10} not imported", file=sys.stderr)
+            continue
+        meta = pq.ParquetDataset(path, partitioning="hive")
+        rows = sum(f.metadata.num_rows for f in meta.fragments)
+        print(f"{name:<10} {rows:>8} rows in {len(meta.files)} files: {meta.schema}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Local stand-in for the external services the app talks to.
+
+Serves a tiny Lottie animation for any ``*.json`` path, with an ETag and
+``304 Not Modified`` support, and an OpenAI-compatible streaming
+``POST /v1/chat/completions``, so asset fetching and the chat can be exercised
+offline. ``RespStub`` stands in for a Redis server for the shared cache:
+
+    python stub_server.py --port 8765 [--resp-port 6379]
+
+or from Python::
+
+    with StubServer(delay=0.05) as stub:
+        client.fetch_many([stub.url("/packages/a.json")])
+        chat.OpenAIProvider(api_key="stub", base_url=stub.url("/v1"))
+
+    with RespStub(max_bytes=2**20) as redis:
+        shared_cache.from_url(redis.url)
+"""
+import argparse
+import fnmatch
+import hashlib
+import json
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOTTIE = {"v": "5.7.4", "fr": 30, "ip": 0, "op": 60, "w": 200, "h": 200, "layers": []}
+CHAT_REPLY = (
+    "It sounds like a lot is on your plate. Try a ten minute walk outside, "
+    "then pick the one task that matters most today."
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.record(self.path)
+        if stub.delay:
+            time.sleep(stub.delay)
+        if not self.path.split("?")[0].endswith(".json"):
+            return self.send_body(404, b"{}")
+        body = json.dumps(LOTTIE).encode()
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self.send_body(304, b"", etag=etag)
+        self.send_body(200, body, etag=etag)
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.record(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.split("?")[0] != "/v1/chat/completions":
+            return self.send_body(404, b"{}")
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return self.send_body(400, b'{"error": {"message": "invalid JSON"}}')
+        if stub.delay:
+            time.sleep(stub.delay)
+        words = CHAT_REPLY.split(" ")[:request.get("max_tokens") or None]
+        chunks = [w if i == 0 else " " + w for i, w in enumerate(words)]
+        if not request.get("stream"):
+            return self.send_body(200, json.dumps(completion(request, "".join(chunks))).encode())
+
+        # Server-sent events, one chunk per word, closed with [DONE]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in chunks:
+            if stub.token_delay:
+                time.sleep(stub.token_delay)
+            self.send_event(completion_chunk(request, {"content": chunk}))
+        self.send_event(completion_chunk(request, {}, finish_reason="stop"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def send_event(self, data):
+        self.wfile.write(b"data: " + json.dumps(data).encode() + b"\n\n")
+        self.wfile.flush()
+
+    def send_body(self, status, body, etag=None, content_type="application/json"):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def completion(request, content):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+def completion_chunk(request, delta, finish_reason=None):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class StubServer:
+    """Threaded stub HTTP server bound to ``host``; port 0 picks a free one.
+
+    ``delay`` is added before every response; ``token_delay`` between the
+    streamed chat chunks.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, token_delay=0.0, handler=StubHandler):
+        self.delay = delay
+        self.token_delay = token_delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def record(self, path):
+        with self._lock:
+            self.requests.append(path)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Answers Redis protocol commands from ``self.server.stub``."""
+
+    def handle(self):
+        stub = self.server.stub
+        while True:
+            try:
+                args = self.read_command()
+            except (ValueError, ConnectionError):
+                return
+            if args is None:
+                return
+            if stub.delay:
+                time.sleep(stub.delay)
+            try:
+                reply = stub.execute(args)
+            except Exception as e:
+                self.wfile.write(b"-ERR %s\r\n" % str(e).encode())
+                continue
+            self.wfile.write(encode(reply))
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command, as sent by redis-cli or telnet
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+
+def encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(r) for r in reply)
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RespStub:
+    """In-memory Redis stand-in: strings with expiry, LRU eviction past ``max_bytes``.
+
+    Supports the commands ``shared_cache.RedisBackend`` sends, plus ``PING``,
+    ``DBSIZE`` and ``FLUSHDB``.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, max_bytes=64 * 2**20, delay=0.0):
+        self.max_bytes = max_bytes
+        self.delay = delay
+        self.evicted = 0
+        self._data = OrderedDict()   # key -> (expires or None, value), least recent first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.server = RespServer((host, port), RespHandler)
+        self.server.stub = self
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def execute(self, args):
+        name = args[0].decode().upper()
+        with self._lock:
+            return getattr(self, f"cmd_{name.lower()}", self.cmd_unknown)(*args[1:])
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.time():
+            self._pop(key)
+            return None
+        return entry
+
+    def _pop(self, key):
+        _, value = self._data.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    def cmd_unknown(self, *args):
+        raise ValueError("unknown command")
+
+    def cmd_ping(self, *args):
+        return "PONG"
+
+    def cmd_auth(self, *args):
+        return "OK"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_get(self, key):
+        entry = self._live(key)
+        if entry is None:
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def cmd_set(self, key, value, *options):
+        expires = None
+        for option, amount in zip(options[::2], options[1::2]):
+            if option.upper() in (b"PX", b"EX"):
+                expires = time.time() + int(amount) / (1000 if option.upper() == b"PX" else 1)
+        if key in self._data:
+            self._pop(key)
+        self._data[key] = (expires, value)
+        self._bytes += len(key) + len(value)
+        while self._bytes > self.max_bytes and len(self._data) > 1:
+            self._pop(next(iter(self._data)))
+            self.evicted += 1
+        return "OK"
+
+    def cmd_del(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self._live(key) is not None:
+                self._pop(key)
+                deleted += 1
+        return deleted
+
+    def cmd_scan(self, cursor, *options):
+        # One pass returns everything; cursor "0" ends the iteration
+        pattern = dict(zip(options[::2], options[1::2])).get(b"MATCH", b"*").decode()
+        keys = [k for k in list(self._data) if self._live(k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+        return [b"0", keys]
+
+    def cmd_dbsize(self):
+        return len(self._data)
+
+    def cmd_flushdb(self, *args):
+        self._data.clear()
+        self._bytes = 0
+        return "OK"
+
+    def cmd_info(self, *sections):
+        info = (f"used_memory:{self._bytes}\r\nevicted_keys:{self.evicted}\r\n"
+                f"db0:keys={len(self._data)},expires=0\r\n")
+        return info.encode()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait per request")
+    parser.add_argument("--token-delay", type=float, default=0.0,
+                        help="seconds between streamed chat chunks")
+    parser.add_argument("--resp-port", type=int, help="also serve a Redis stand-in on this port")
+    args = parser.parse_args(argv)
+    stub = StubServer(args.host, args.port, args.delay, args.token_delay)
+    print(f"Stub server on {stub.base_url}")
+    if args.resp_port is not None:
+        redis = RespStub(args.host, args.resp_port).start()
+        print(f"Redis stand-in on {redis.url}")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Wellness Guide suggestions behind a two-tier cache with request coalescing.
+
+Suggestions depend only on a few discrete inputs, normalized into a
+``SuggestionKey`` (risk, gender, lifestyle, age bucket, high stress), so the
+whole key space is a few hundred entries. ``SuggestionService`` looks a key up
+in an in-process LRU, then in an on-disk store (``<digest>.json`` files with
+a TTL and an entry cap), and only then calls the generator. Concurrent
+requests for the same missing key wait on the first one instead of each
+generating it. Given a ``shared`` cache (see ``shared_cache``), that takes
+the place of the on-disk store, so every server process shares one copy.
+
+Cached values are shared between sessions, so lists are frozen to tuples.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join("data", "cache", "suggestions")
+MEMORY_SIZE = 256
+TTL = 24 * 3600      # seconds before a stored suggestion is regenerated
+MAX_ENTRIES = 1000   # stored suggestions kept on disk
+WAIT_TIMEOUT = 30    # seconds a coalesced request waits for the generator
+
+SuggestionKey = namedtuple("SuggestionKey", "risk gender lifestyle age_bucket high_stress")
+
+AGE_BUCKETS = ((18, "under 18"), (25, "18-24"), (35, "25-34"), (50, "35-49"))
+HIGH_STRESS = 7
+
+# (time, activity) per risk level; anything else gets the "Low" routine
+ROUTINES = {
+    "High": (
+        ("7:00 AM", "Gentle wake-up with sunlight exposure"),
+        ("7:15 AM", "5-minute stretching or yoga"),
+        ("8:00 AM", "Balanced breakfast with protein"),
+        ("12:00 PM", "Short walk in nature (10-15 min)"),
+        ("3:00 PM", "Mindfulness break (5 min deep breathing)"),
+        ("6:30 PM", "Light dinner with vegetables"),
+        ("8:30 PM", "Digital detox (no screens)"),
+        ("9:30 PM", "Relaxing bedtime routine"),
+    ),
+    "Moderate": (
+        ("6:30 AM", "Morning sunlight + hydration"),
+        ("7:00 AM", "15-minute movement (yoga/walk)"),
+        ("8:00 AM", "Protein-rich breakfast"),
+        ("12:30 PM", "Balanced lunch with greens"),
+        ("3:00 PM", "Quick stretch or walk"),
+        ("6:00 PM", "Exercise (30-45 min)"),
+        ("8:00 PM", "Screen-free wind down"),
+        ("10:00 PM", "Bedtime routine"),
+    ),
+    "Low": (
+        ("6:00 AM", "Morning workout or run"),
+        ("7:00 AM", "Healthy breakfast with complex carbs"),
+        ("12:00 PM", "Nutrient-dense lunch"),
+        ("5:00 PM", "Intensive exercise session"),
+        ("7:00 PM", "Light, early dinner"),
+        ("9:00 PM", "Reading or creative activity"),
+        ("10:30 PM", "Relaxation before sleep"),
+    ),
+}
+
+NUTRITION_PLANS = {
+    "female": (
+        "<strong>Breakfast:</strong> Greek yogurt with berries and nuts",
+        "<strong>Lunch:</strong> Salmon salad with leafy greens and quinoa",
+        "<strong>Dinner:</strong> Grilled chicken with roasted vegetables",
+        "<strong>Snacks:</strong> Hummus with veggies, hard-boiled eggs",
+        "<strong>Hydration:</strong> 2L water + herbal teas",
+    ),
+    "default": (
+        "<strong>Breakfast:</strong> Oatmeal with protein powder and banana",
+        "<strong>Lunch:</strong> Chicken rice bowl with mixed vegetables",
+        "<strong>Dinner:</strong> Lean beef with sweet potato and broccoli",
+        "<strong>Snacks:</strong> Protein shake, mixed nuts",
+        "<strong>Hydration:</strong> 3L water + green tea",
+    ),
+}
+
+# Stress-level tips: stress_level >= HIGH_STRESS, or manageable
+STRESS_TIPS = {
+    True: (
+        "High stress detected. Try these techniques:",
+        (
+            "5-minute box breathing exercise",
+            "Progressive muscle relaxation",
+            "Nature walk without devices",
+            "Journaling for 10 minutes",
+            "Guided meditation (try Headspace or Calm)",
+        ),
+    ),
+    False: (
+        "Your stress levels seem manageable. Maintenance tips:",
+        (
+            "Daily 5-minute mindfulness practice",
+            "Gratitude journaling",
+            "Regular exercise",
+            "Social connections",
+            "Hobby time",
+        ),
+    ),
+}
+
+
+def normalize_gender(gender):
+    """``female``, ``male`` or ``other`` for the Welcome page's answer."""
+    gender = (gender or "").strip().lower()
+    gender = {"woman": "female", "man": "male"}.get(gender, gender)
+    return gender if gender in ("female", "male") else "other"
+
+
+def nutrition_branch(gender):
+    """Key of ``NUTRITION_PLANS`` (and of the meal templates) for a gender."""
+    return "female" if normalize_gender(gender) == "female" else "default"
+
+
+def suggestion_key(risk, gender, lifestyle, age, stress_level):
+    """Normalize the Wellness Guide inputs into a cache key."""
+    risk = risk if risk in ROUTINES else "Low"
+    gender = normalize_gender(gender)
+    age_bucket = next((label for limit, label in AGE_BUCKETS if int(age) < limit), "50+")
+    return SuggestionKey(
+        risk, gender, (lifestyle or "Balanced").strip().lower(), age_bucket,
+        int(stress_level) >= HIGH_STRESS,
+    )
+
+
+def template_suggestions(key):
+    """Suggestions from the built-in templates."""
+    headline, tips = STRESS_TIPS[key.high_stress]
+    return {
+        "routine": ROUTINES[key.risk],
+        "nutrition": NUTRITION_PLANS[nutrition_branch(key.gender)],
+        "stress_headline": headline,
+        "stress_tips": tips,
+    }
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _freeze(v) for k, v in value.items()}
+    return value
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SuggestionService:
+    """Generate suggestions once per key and serve them from memory or disk.
+
+    ``generator`` maps a ``SuggestionKey`` to a JSON-serializable dict; bump
+    ``version`` when its output changes so stored entries are not reused.
+    """
+
+    def __init__(self, generator=template_suggestions, version=1, cache_dir=CACHE_DIR,
+                 memory_size=MEMORY_SIZE, ttl=TTL, max_entries=MAX_ENTRIES,
+                 wait_timeout=WAIT_TIMEOUT, shared=None):
+        self.generator = generator
+        self.version = version
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.shared = shared
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "generated": 0, "coalesced": 0}
+        self._memory = OrderedDict()   # key -> (expires, value), least recent first
+        self._inflight = {}            # key -> Future for the running generation
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Suggestions for ``key``; generates them at most once across threads."""
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached[0] > now:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return cached[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result(timeout=self.wait_timeout)
+
+        try:
+            value, created = self._load(key)
+            tier = "disk_hits"
+            if value is None:
+                raw = self.generator(key)
+                created = time.time()
+                self._store(key, raw, created)
+                value = _freeze(raw)
+                tier = "generated"
+            with self._lock:
+                self.stats[tier] += 1
+                self._memory[key] = (created + self.ttl, value)
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.memory_size:
+                    self._memory.popitem(last=False)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def clear(self):
+        """Drop every cached suggestion, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    # ----- disk (or shared) tier -----
+    def _digest(self, key):
+        return hashlib.sha256(json.dumps([self.version, *key]).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{self._digest(key)}.json")
+
+    def _load(self, key):
+        if self.shared is not None:
+            entry = self.shared.get(self._digest(key))
+            if entry is None:
+                return None, None
+        else:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None, None
+        if time.time() - entry["created"] > self.ttl:
+            return None, None
+        return _freeze(entry["value"]), entry["created"]
+
+    def _store(self, key, value, created):
+        entry = {"key": list(key), "version": self.version, "created": created, "value": value}
+        if self.shared is not None:
+            self.shared.set(self._digest(key), entry, ttl=self.ttl)
+            return
+        try:
+            _write_atomic(self._path(key), json.dumps(entry).encode())
+            self._evict()
+        except OSError as e:
+            log.warning("Could not store suggestions for %s: %s", key, e)
+
+    def _evict(self):
+        """Delete the oldest stored entries beyond ``max_entries``."""
+        entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
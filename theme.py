@@ -0,0 +1,270 @@
+"""Colour palettes and the global stylesheet shared by every page.
+
+Each palette is compiled once per process into a content-hashed file under
+``static/`` that Streamlit serves at ``app/static/``. Pages then only send a
+short ``<link>`` tag on each rerun instead of the whole stylesheet. When
+static serving is disabled the compiled CSS is inlined instead.
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+THEME_ENV = "NATUREMIND_THEME"
+
+# ========= Themes ========
+THEMES = {
+    # Dark mode
+    "forest": {
+        "bg_color": "#0a1a0f",       # Dark forest green
+        "card_bg": "#1a2a1a",        # Darker green
+        "text_color": "#e0f0e0",     # Soft mint
+        "accent_color": "#4cc9a8",   # Teal
+        "warning_color": "#ff7597",  # Coral
+        "moderate_color": "#FFC107", # Yellow
+        "button_bg": "#3a8a5f",      # Sage green
+        "button_hover": "#2a6a4f",
+        "button_text": "#ffffff",
+        "female_color": "#ffb6c1",   # Light pink
+        "male_color": "#89cff0",     # Light blue
+    },
+    # Light mode
+    "meadow": {
+        "bg_color": "#f4f9f1",       # Morning mist
+        "card_bg": "#ffffff",
+        "text_color": "#1f3325",     # Deep moss
+        "accent_color": "#2a9d7f",   # Pine teal
+        "warning_color": "#d6456b",  # Berry
+        "moderate_color": "#e0a100", # Amber
+        "button_bg": "#3a8a5f",      # Sage green
+        "button_hover": "#2a6a4f",
+        "button_text": "#ffffff",
+        "female_color": "#e58a9a",   # Rose
+        "male_color": "#4f9fd6",     # Sky blue
+    },
+}
+DEFAULT_THEME = "forest"
+THEME = os.environ.get(THEME_ENV, DEFAULT_THEME)
+if THEME not in THEMES:
+    raise ValueError(f"Unknown theme {THEME!r}; choose one of {', '.join(THEMES)}")
+
+# Active palette, used for inline colours in the pages
+palette = THEMES[THEME]
+bg_color = palette["bg_color"]
+card_bg = palette["card_bg"]
+text_color = palette["text_color"]
+accent_color = palette["accent_color"]
+warning_color = palette["warning_color"]
+button_bg = palette["button_bg"]
+button_text = palette["button_text"]
+female_color = palette["female_color"]
+male_color = palette["male_color"]
+
+RISK_COLORS = {
+    "Low": accent_color,
+    "Moderate": palette["moderate_color"],
+    "High": warning_color
+}
+
+# str.format template; braces that belong to CSS are doubled
+STYLESHEET = """\
+:root {{
+    --primary-color: {accent_color};
+    --background-color: {bg_color};
+    --card-bg: {card_bg};
+    --text-color: {text_color};
+    --warning-color: {warning_color};
+    --female-color: {female_color};
+    --male-color: {male_color};
+}}
+    
+body {{ 
+    background-color: {bg_color}; 
+    color: {text_color}; 
+}}
+.stApp {{ 
+    background-color: {bg_color}; 
+    color: {text_color}; 
+}}
+.stTextInput>div>div>input, .stTextArea>div>div>textarea {{
+    background-color: {card_bg};
+    color: {text_color};
+    border-color: {accent_color};
+    border-radius: 12px;
+}}
+.stSelectbox>div>div>select {{
+    background-color: {card_bg};
+    color: {text_color};
+    border-radius: 12px;
+}}
+.stSlider>div>div>div>div {{
+    background-color: {accent_color};
+}}
+.stButton>button {{
+    background-color: {button_bg};
+    color: {button_text};
+    border: none;
+    border-radius: 12px;
+    padding: 8px 16px;
+    font-weight: 500;
+    transition: all 0.3s ease;
+}}
+.stButton>button:hover {{
+    background-color: {button_hover};
+    color: white;
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}}
+.chat-message {{
+    padding: 12px;
+    border-radius: 12px;
+    margin: 6px 0;
+    max-width: 80%;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+}}
+.user-message {{
+    background-color: {card_bg};
+    margin-left: auto;
+    border-bottom-right-radius: 4px;
+}}
+.bot-message {{
+    background-color: {bg_color};
+    border: 1px solid {accent_color};
+    margin-right: auto;
+    border-bottom-left-radius: 4px;
+}}
+.suggestion-card {{
+    background-color: {card_bg};
+    border-radius: 12px;
+    padding: 16px;
+    margin: 12px 0;
+    border-left: 4px solid {accent_color};
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+}}
+.warning-card {{
+    background-color: {card_bg};
+    border-radius: 12px;
+    padding: 16px;
+    margin: 12px 0;
+    border-left: 4px solid {warning_color};
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+}}
+.routine-item {{
+    display: flex;
+    margin-bottom: 10px;
+    align-items: center;
+    background-color: {card_bg};
+    padding: 10px;
+    border-radius: 8px;
+}}
+.routine-time {{
+    width: 80px;
+    font-weight: bold;
+    color: {accent_color};
+}}
+.routine-activity {{
+    flex-grow: 1;
+    padding-left: 15px;
+    border-left: 2px solid {button_bg};
+}}
+.gender-tabs {{
+    display: flex;
+    margin-bottom: 20px;
+    border-radius: 12px;
+    overflow: hidden;
+    background-color: {card_bg};
+}}
+.gender-tab {{
+    flex: 1;
+    text-align: center;
+    padding: 10px;
+    cursor: pointer;
+    transition: all 0.3s;
+}}
+.gender-tab.active {{
+    background-color: {accent_color};
+    color: white;
+}}
+.question-card {{
+    background-color: {card_bg};
+    border-radius: 12px;
+    padding: 16px;
+    margin: 8px 0;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+    transition: all 0.3s;
+    cursor: pointer;
+    border-left: 4px solid {accent_color};
+}}
+.question-card:hover {{
+    transform: translateY(-3px);
+    box-shadow: 0 6px 16px rgba(0,0,0,0.3);
+}}
+.cycle-phase {{
+    background-color: {female_color}30;
+    padding: 8px 12px;
+    border-radius: 20px;
+    display: inline-block;
+    margin: 4px 0;
+    font-size: 0.8rem;
+    color: {text_color};
+}}
+.card-row {{
+    display: flex;
+    gap: 16px;
+}}
+.card-row > .result-card {{
+    flex: 1;
+    min-width: 0;
+}}
+.result-card {{
+    background-color: {card_bg};
+    padding: 15px;
+    border-radius: 12px;
+    margin-bottom: 15px;
+    border-left: 4px solid {accent_color};
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+}}
+"""
+
+
+# ========= Compilation ========
+def compile_stylesheet(name):
+    """CSS for theme ``name`` and the content-hashed file name it is stored as."""
+    css = STYLESHEET.format(**THEMES[name])
+    digest = hashlib.sha256(css.encode()).hexdigest()[:12]
+    return css, f"theme-{name}-{digest}.css"
+
+
+@lru_cache(maxsize=None)
+def build(name=THEME):
+    """Compile ``name`` once per process and write it to ``static/`` if missing.
+
+    Returns ``(href, css)``.
+    """
+    css, filename = compile_stylesheet(name)
+    path = os.path.join(STATIC_DIR, filename)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp, path)
+    return f"{STATIC_URL}/{filename}", css
+
+
+@lru_cache(maxsize=None)
+def theme_markup(name=THEME, static=True):
+    """The markdown sent per rerun: a ``<link>`` tag, or inline CSS as a fallback."""
+    href, css = build(name)
+    if static:
+        return f'<link rel="stylesheet" href="{href}">'
+    return f"<style>\n{css}\n</style>"
+
+
+def apply_theme():
+    """Attach the active theme's stylesheet to the current page."""
+    static = bool(st.get_option("server.enableStaticServing"))
+    st.markdown(theme_markup(THEME, static), unsafe_allow_html=True)
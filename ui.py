@@ -0,0 +1,127 @@
+"""Rendering helpers shared by the pages."""
+import functools
+import hmac
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+
+import assets
+import metrics
+from state import current_session, secrets, shared
+
+ADMIN_ENV = "NATUREMIND_ADMIN_PASSWORD"
+DEBUG_ENV = "NATUREMIND_DEBUG"
+DEBUG_RERUNS = 10  # script runs kept for the debug panel, per session
+
+
+@st.cache_resource
+def get_animation_cache():
+    cache = assets.AnimationCache(shared=shared("lottie", assets.MAX_AGE))
+    cache.prefetch(assets.LOTTIE_URLS.values())
+    return cache
+
+
+def load_lottie_url(url):
+    with metrics.span("lottie"):
+        return get_animation_cache().get(url)
+
+
+def st_lottie(anim, **kwargs):
+    with metrics.span("lottie.render"):
+        from streamlit_lottie import st_lottie
+        return st_lottie(anim, **kwargs)
+
+
+def _traced(func):
+    """Trace ``func`` as a rerun of its own (``<page>:<function>``) when it
+    reruns alone as a fragment; within a full script run it is part of that run."""
+    name = f"{func.__module__.rpartition('.')[2]}:{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if metrics.current() is not None:
+            return func(*args, **kwargs)
+        with metrics.rerun(name, current_session().id) as run:
+            if debug_enabled():
+                debug_reruns().append(run)
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def fragment(func):
+    """``st.fragment`` where available: widget changes inside ``func`` rerun
+    only ``func`` instead of the whole page. Older Streamlit falls back to
+    ``st.experimental_fragment`` or a plain call."""
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(_traced(func)) if decorator else func
+
+
+def poll(interval):
+    """Rerun the decorated function every ``interval`` seconds while it returns True.
+
+    Uses an auto-refreshing fragment where available, so only the function
+    reruns; otherwise sleeps and reruns the whole script.
+    """
+    def decorate(func):
+        decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+        if decorator:
+            return decorator(run_every=interval)(_traced(func))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if func(*args, **kwargs):
+                time.sleep(interval)
+                st.rerun()
+        return wrapper
+    return decorate
+
+
+def admin_password():
+    return secrets().get("ADMIN_PASSWORD") or os.environ.get(ADMIN_ENV)
+
+
+def require_admin():
+    """True once this session has unlocked the admin pages; otherwise shows
+    the password form (or how to enable admin pages) and returns False."""
+    password = admin_password()
+    if not password:
+        st.info(f"Set ADMIN_PASSWORD in .streamlit/secrets.toml or {ADMIN_ENV} to enable this page.")
+        return False
+    if st.session_state.get("is_admin"):
+        return True
+    with st.form("admin_login"):
+        attempt = st.text_input("Admin password", type="password")
+        if st.form_submit_button("Unlock"):
+            if hmac.compare_digest(attempt.encode(), password.encode()):
+                st.session_state.is_admin = True
+                st.rerun()
+            st.error("Incorrect password.")
+    return False
+
+
+def debug_enabled():
+    """Debug panel on: ``NATUREMIND_DEBUG=1`` or ``?debug=1`` in the URL."""
+    return os.environ.get(DEBUG_ENV) == "1" or st.query_params.get("debug") == "1"
+
+
+def debug_reruns():
+    """This session's recent ``metrics.Rerun`` records, newest last."""
+    if "debug_reruns" not in st.session_state:
+        st.session_state.debug_reruns = deque(maxlen=DEBUG_RERUNS)
+    return st.session_state.debug_reruns
+
+
+def debug_panel(reruns):
+    """Sidebar breakdown of the recent script runs, newest first."""
+    with st.sidebar.expander("⏱️ Rerun timings"):
+        for run in reversed(reruns):
+            if run.seconds is None:
+                continue
+            lines = [f"{run.page:<20} {run.seconds * 1e3:8.1f} ms  "
+                     f"{datetime.fromtimestamp(run.started):%H:%M:%S}"]
+            lines += [f"{'  ' * (depth + 1) + name:<20} {seconds * 1e3:8.1f}"
+                      for name, depth, seconds in run.spans]
+            st.code("\n".join(lines), language=None)
@@ -0,0 +1,27 @@
+"""Page registry: sidebar label -> page module exposing ``render()``."""
+from views import analytics, chat, feedback, mood_check, search, welcome, wellness_guide
+
+PAGES = {
+    "🌱 Welcome": welcome,
+    "📊 Mood Check": mood_check,
+    "Wellness Guide": wellness_guide,
+    "💬 Wellness Chat": chat,
+    "📝 Feedback": feedback,
+    "📈 Cohort Analytics": analytics,
+    "🔎 Journal Search": search,
+}
+DEFAULT_PAGE = next(iter(PAGES))
+
+
+def page_module(page):
+    return PAGES.get(page, PAGES[DEFAULT_PAGE])
+
+
+def page_name(page):
+    """Short name of the page's module, used as a metrics label."""
+    return page_module(page).__name__.rpartition(".")[2]
+
+
+def render(page):
+    """Render only the selected page."""
+    page_module(page).render()
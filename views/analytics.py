@@ -0,0 +1,109 @@
+"""Page: Cohort Analytics - admin-only trends over all check-ins, feedback and the dataset."""
+from datetime import date, timedelta
+
+import streamlit as st
+
+import components
+import metrics
+from state import get_habits, get_history, get_rollups
+from theme import accent_color
+from ui import require_admin
+
+PERIODS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
+
+
+def render():
+    st.title("📈 Cohort Analytics")
+    if not require_admin():
+        return
+
+    import altair as alt
+    import numpy as np
+    import pandas as pd
+
+    import habits
+
+    # Fold in feedback and dataset rows written since the last view
+    rollups = get_rollups()
+    with metrics.span("rollups.refresh"):
+        rollups.refresh()
+    history = get_history()
+
+    components.show(components.suggestion_card("🗓️ Moods per Day"))
+    days = PERIODS[st.selectbox("Period", list(PERIODS))]
+    today = date.today()
+    moods = pd.DataFrame(
+        [dict(row) for row in history.mood_distribution(today - timedelta(days=days - 1), today + timedelta(days=1))],
+        columns=["day", "mood", "checks"],
+    )
+    if moods.empty:
+        st.info("No mood checks in this period yet.")
+    else:
+        with metrics.span("chart.moods"):
+            st.altair_chart(alt.Chart(moods).mark_bar().encode(
+                x=alt.X("day:T", title="Day"),
+                y=alt.Y("checks:Q", title="Checks"),
+                color=alt.Color("mood:N", title="Mood"),
+            ), use_container_width=True)
+
+    components.show(components.suggestion_card("😴 Sleep and Screen Time by Risk Band"))
+    risk_habits = pd.DataFrame(
+        [dict(row, source="App check-ins") for row in history.risk_habits()] +
+        [dict(row, source="Wellness dataset") for row in rollups.dataset_risk_habits()],
+        columns=["source", "risk", "checks", "sleep_hours", "screen_time"],
+    )
+    st.dataframe(
+        risk_habits.rename(columns={
+            "source": "Source", "risk": "Risk", "checks": "Entries",
+            "sleep_hours": "Avg sleep (h)", "screen_time": "Avg screen time (h)",
+        }).round(2),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        components.show(components.suggestion_card("⭐ Feedback Ratings"))
+        histogram = rollups.rating_histogram()
+        total = sum(histogram.values())
+        st.metric(
+            "Average rating",
+            f"{sum(r * n for r, n in histogram.items()) / total:.2f}" if total else "—",
+            f"{total} submissions",
+            delta_color="off",
+        )
+        ratings = pd.DataFrame({"rating": list(histogram), "submissions": list(histogram.values())})
+        with metrics.span("chart.ratings"):
+            st.altair_chart(alt.Chart(ratings).mark_bar(color=accent_color).encode(
+                x=alt.X("rating:O", title="Rating"),
+                y=alt.Y("submissions:Q", title="Submissions"),
+            ), use_container_width=True)
+    with col2:
+        components.show(components.suggestion_card("🎒 Dataset Moods"))
+        dataset_moods = pd.DataFrame([dict(row) for row in rollups.dataset_moods()], columns=["mood", "students"])
+        with metrics.span("chart.dataset_moods"):
+            st.altair_chart(alt.Chart(dataset_moods).mark_arc().encode(
+                theta="students:Q",
+                color=alt.Color("mood:N", title="Mood"),
+            ), use_container_width=True)
+
+    components.show(components.suggestion_card("✅ Habit Adherence"))
+    with metrics.span("habits.cohort"):
+        cohort = get_habits().cohort(today - timedelta(days=days - 1), today + timedelta(days=1))
+        active = cohort[cohort.any(axis=1)]
+    if not len(active):
+        st.info("No habits tracked in this period yet.")
+        return
+    streaks = habits.streak(active)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Students tracking habits", f"{len(active)}")
+    with col2:
+        st.metric(f"On a streak of {habits.DAY_GOAL}+ habits a day", f"{(streaks > 0).mean():.0%}",
+                  f"median {int(np.median(streaks))} days", delta_color="off")
+    adherence = pd.DataFrame({"habit": habits.HABITS, "adherence": habits.adherence(active).mean(axis=0)})
+    with metrics.span("chart.habits"):
+        st.altair_chart(alt.Chart(adherence).mark_bar(color=accent_color).encode(
+            x=alt.X("adherence:Q", title="Share of days done", axis=alt.Axis(format="%")),
+            y=alt.Y("habit:N", title=None, sort=habits.HABITS),
+        ), use_container_width=True)
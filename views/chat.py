@@ -0,0 +1,77 @@
+"""Page: Wellness Chat - streamed replies from the configured chat provider."""
+import logging
+import time
+
+import streamlit as st
+
+import chat
+import components
+import metrics
+from state import current_session, current_user, get_chat_provider, get_session_store
+
+log = logging.getLogger(__name__)
+
+REDRAW_INTERVAL = 0.05  # seconds between redraws of the streaming reply
+
+
+def render():
+    st.title("💬 Wellness Chat")
+
+    st.radio(
+        "Companion",
+        list(chat.COMPANIONS),
+        format_func=lambda g: chat.COMPANIONS[g],
+        key="chat_gender",
+        horizontal=True,
+    )
+
+    session = current_session()
+    store = get_session_store()
+    conversation = chat.Conversation(store.get(session.key("chat"), []), session.chat_summary)
+    if conversation.summary:
+        st.caption("Earlier messages have been summarized to keep the conversation short.")
+    if conversation.turns:
+        components.show(*(components.chat_message(t["role"], t["content"]) for t in conversation.turns))
+
+    prompt = st.chat_input("How are you feeling today?")
+    if not prompt:
+        return
+
+    components.show(components.chat_message("user", prompt))
+    conversation.add("user", prompt)
+    system = chat.SYSTEM_PROMPT.format(
+        companion=chat.COMPANIONS[st.session_state.chat_gender],
+        name=current_user(),
+        mood=session.mood.mood,
+        risk=session.mood.risk,
+    )
+    messages = conversation.messages(system)
+    session.chat_summary = conversation.summary
+
+    with metrics.span("chat.reply"):
+        reply = stream_reply(get_chat_provider(), messages)
+    if reply:
+        conversation.add("assistant", reply)
+    store.put(session.key("chat"), conversation.turns)
+
+
+def stream_reply(provider, messages):
+    """Draw the reply as it streams in and return the full text."""
+    placeholder = st.empty()
+    parts = []
+    last_draw = 0.0
+    try:
+        for chunk in provider.stream(messages):
+            parts.append(chunk)
+            now = time.monotonic()
+            if now - last_draw >= REDRAW_INTERVAL:
+                placeholder.markdown(components.chat_bubble("assistant", "".join(parts) + " ▌"),
+                                     unsafe_allow_html=True)
+                last_draw = now
+    except Exception as e:
+        log.warning("Chat provider %s failed: %s", provider.name, e)
+        placeholder.error("The companion is unavailable right now. Please try again in a moment.")
+        return None
+    reply = "".join(parts)
+    placeholder.markdown(components.chat_message("assistant", reply), unsafe_allow_html=True)
+    return reply
@@ -0,0 +1,39 @@
+"""Page 4: Feedback - rating and comments, written through the feedback sink."""
+import streamlit as st
+
+import assets
+import feedback as feedback_sink
+import metrics
+from ui import load_lottie_url, st_lottie
+
+
+def render():
+    st.title("💌 Share Your Thoughts")
+    
+    anim = load_lottie_url(assets.LOTTIE_URLS["feedback"])
+    if anim:
+        st_lottie(anim, height=150, key="feedback_anim")
+    
+    with st.form("feedback_form"):
+        st.markdown(f"""
+        <div class="result-card">
+            <p>Your feedback helps us grow and improve NatureMind.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        rating = st.slider("How would you rate your experience?", 1, 5, 4)
+        feedback = st.text_area("What did you like or what could be improved?")
+        
+        if st.form_submit_button("Submit Feedback"):
+            with metrics.span("feedback.submit"):
+                feedback_sink.get_sink().submit(
+                    st.session_state.get("name", "Anonymous"),
+                    rating,
+                    feedback
+                )
+            
+            st.success("Thank you for your feedback! 🌸")
+            
+            confetti_anim = load_lottie_url(assets.LOTTIE_URLS["confetti"])
+            if confetti_anim:
+                st_lottie(confetti_anim, height=200, key="confetti")
@@ -0,0 +1,158 @@
+"""Page 2: Mood Check - journal entry and lifestyle factors to mood analysis."""
+import streamlit as st
+
+import assets
+import components
+import jobs
+import metrics
+import session
+from state import current_session, current_user, get_history, get_jobs, get_mood_model, get_session_store
+from ui import load_lottie_url, poll, st_lottie
+
+POLL_INTERVAL = 0.5  # seconds between checks on a running analysis
+
+
+def render():
+    st.title("🌼 Mood Check-In")
+    st.write(f"Hello, {st.session_state.get('name', 'friend')}! Let's see how you're doing today.")
+    
+    # An analysis submitted on an earlier run is still in progress
+    if st.session_state.get("analysis_job"):
+        analysis_status()
+        return
+    if st.session_state.get("analysis_error"):
+        st.error(st.session_state.pop("analysis_error"))
+    
+    mood_data = current_session().mood
+    
+    # Check if mood analysis has been done
+    if st.session_state.mood_analyzed:
+        # Get values from session state
+        mood = mood_data.mood
+        mood_score = mood_data.mood_score
+        risk = mood_data.risk
+        mood_color = mood_data.mood_color
+        
+        st.success("Analysis complete!")
+        
+        # Display results in cards
+        components.show(components.card_row(
+            components.result_card("Your Mood", mood, mood_color),
+            components.result_card("Wellness Score", f"{mood_score:.2f}"),
+            components.result_card("Burnout Risk", risk, mood_color),
+        ))
+        
+        # Show appropriate animation
+        anim_urls = {
+            "Low": assets.LOTTIE_URLS["mood_low"],
+            "Moderate": assets.LOTTIE_URLS["mood_moderate"],
+            "High": assets.LOTTIE_URLS["mood_high"]
+        }
+        anim = load_lottie_url(anim_urls.get(risk, anim_urls["Moderate"]))
+        if anim:
+            st_lottie(anim, height=150, key="mood_anim")
+        
+        # Add navigation buttons
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("View Wellness Suggestions", use_container_width=True):
+                st.session_state.page = "Wellness Guide"
+                st.rerun()
+        with col2:
+            if st.button("Do Another Check-In", use_container_width=True):
+                st.session_state.mood_analyzed = False
+                st.rerun()
+    
+    # Mood check form (only show if not analyzed or doing another check-in)
+    if not st.session_state.mood_analyzed:
+        with st.form("mood_form"):
+            st.subheader("Daily Reflection")
+            journal_entry = st.text_area(
+                "How are you feeling today? What's on your mind?",
+                height=150,
+                value=get_session_store().get(current_session().key("journal"), "")
+            )
+            
+            st.subheader("Lifestyle Factors")
+            col1, col2 = st.columns(2)
+            with col1:
+                sleep_hours = st.slider(
+                    "😴 Hours slept",
+                    0, 12, 
+                    mood_data.sleep_hours
+                )
+                screen_time = st.slider(
+                    "📱 Screen time (hours)",
+                    0, 16,
+                    mood_data.screen_time
+                )
+            with col2:
+                outdoor_time = st.slider(
+                    "🌳 Time in nature (minutes)",
+                    0, 240,
+                    mood_data.outdoor_time
+                )
+                exercise = st.selectbox(
+                    "🏃 Movement today",
+                    session.EXERCISE_LEVELS,
+                    index=session.EXERCISE_LEVELS.index(mood_data.exercise)
+                )
+            
+            if st.form_submit_button("Analyze My Mood"):
+                if journal_entry.strip():
+                    entry = {
+                        "journal_entry": journal_entry,
+                        "sleep_hours": sleep_hours,
+                        "screen_time": screen_time,
+                        "outdoor_time": outdoor_time,
+                        "exercise": exercise
+                    }
+                    # Keep the answers in the form if the analysis has to be retried
+                    mood_data.update(entry)
+                    get_session_store().put(current_session().key("journal"), journal_entry)
+                    try:
+                        job = get_jobs().submit(analyze, entry, get_mood_model())
+                    except jobs.QueueFull:
+                        st.warning("Lots of people are checking in right now. Please try again in a few seconds.")
+                    else:
+                        st.session_state.analysis_job = job.id
+                        st.rerun()
+                else:
+                    st.warning("Please share how you're feeling to get your mood analysis")
+
+
+def analyze(entry, classifier):
+    """Score a check-in; runs on a ``jobs`` worker thread."""
+    import scoring
+    
+    with metrics.span("scoring"):
+        result = scoring.score_entry(
+            entry["journal_entry"], entry["sleep_hours"], entry["screen_time"],
+            entry["outdoor_time"], entry["exercise"],
+            classifier=classifier
+        )
+    return dict(entry, **result)
+
+
+@poll(POLL_INTERVAL)
+def analysis_status():
+    """Show progress until the analysis job finishes, then store its result."""
+    queue = get_jobs()
+    job = queue.get(st.session_state.analysis_job)
+    status = job.status if job else jobs.FAILED
+    if status in (jobs.PENDING, jobs.RUNNING):
+        st.info("🌱 Analyzing your reflection...")
+        return True
+    
+    queue.pop(st.session_state.pop("analysis_job"))
+    if status == jobs.DONE:
+        result = job.result()
+        current_session().mood.update(result)
+        st.session_state.mood_analyzed = True
+        with metrics.span("history.record"):
+            get_history().record(current_user(), result)
+    elif status == jobs.TIMED_OUT:
+        st.session_state.analysis_error = "The analysis took too long. Please try again."
+    else:
+        st.session_state.analysis_error = "Something went wrong while analyzing your entry. Please try again."
+    st.rerun()
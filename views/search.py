@@ -0,0 +1,55 @@
+"""Page: Journal Search - admin-only full-text search over every journal entry."""
+import streamlit as st
+
+import components
+import metrics
+from state import get_history, get_search_index
+from ui import require_admin
+
+SOURCE_LABELS = {"checkins": "App check-ins", "wellness": "Wellness dataset", "journal": "Journal dataset"}
+RESULTS = 10
+
+
+def hit_card(hit):
+    return components.suggestion_card(
+        f"{SOURCE_LABELS[hit.source]} #{hit.ref} · {hit.score:.2f}", hit.text
+    )
+
+
+def render():
+    st.title("🔎 Journal Search")
+    if not require_admin():
+        return
+
+    import search
+
+    # Index entries written since the last view
+    index = get_search_index()
+    with metrics.span("search.update"):
+        index.update(get_history())
+
+    query = st.text_input("Search journal entries", placeholder="e.g. overwhelmed by deadlines")
+    sources = st.multiselect("Sources", search.SOURCES, default=search.SOURCES,
+                             format_func=SOURCE_LABELS.get)
+    st.caption(f"{index.count:,} entries indexed")
+    if not query or not sources:
+        return
+
+    with metrics.span("search.query"):
+        hits = index.search(query, RESULTS, sources)
+    if not hits:
+        st.info("No entries match that search.")
+        return
+    for hit in hits:
+        components.show(hit_card(hit))
+        if st.button("Similar entries", key=f"similar_{hit.doc}"):
+            st.session_state.search_similar = hit.doc
+
+    doc = st.session_state.get("search_similar")
+    if doc is not None and doc < index.count:
+        source = index.document(doc)
+        components.show(components.suggestion_card("🧭 Entries Like", source.text))
+        with metrics.span("search.similar"):
+            similar = index.similar(source.text, RESULTS, sources, exclude=doc)
+        for hit in similar:
+            components.show(hit_card(hit))
@@ -0,0 +1,38 @@
+"""Page 1: Welcome - collects name, age, gender and lifestyle."""
+import streamlit as st
+
+import assets
+from ui import load_lottie_url, st_lottie
+
+
+def render():
+    st.title("🌿 Welcome to NatureMind")
+    st.markdown(f"""
+    <div class="result-card">
+        <p style="font-size: 16px;">Find your balance with our nature-inspired wellness companion. 
+        Track your mood, get personalized suggestions, and discover wellness insights tailored just for you.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    anim = load_lottie_url(assets.LOTTIE_URLS["welcome"])
+    if anim:
+        st_lottie(anim, height=200, key="welcome_anim")
+    
+    with st.form("user_info"):
+        st.subheader("Let's get started")
+        name = st.text_input("What's your name?")
+        age = st.slider("Your age", 10, 100, 25)
+        gender = st.selectbox("Your gender", ["Female", "Male", "Non-binary", "Prefer not to say"])
+        lifestyle = st.selectbox("How would you describe your lifestyle?", 
+                              ["Mostly indoors", "Balanced", "Very active outdoors"])
+        
+        if st.form_submit_button("Continue to Mood Check"):
+            if name:
+                st.session_state.name = name
+                st.session_state.age = age
+                st.session_state.gender = gender
+                st.session_state.lifestyle = lifestyle
+                st.session_state.page = "📊 Mood Check"
+                st.rerun()
+            else:
+                st.warning("Please enter your name")
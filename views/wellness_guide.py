@@ -0,0 +1,379 @@
+"""Page 3: Wellness Guide - routine, sleep, nutrition and mindfulness tabs."""
+from datetime import date, timedelta
+from html import escape
+
+import streamlit as st
+
+import assets
+import components
+import meals
+import metrics
+import suggestions
+from state import current_session, current_user, get_habits, get_history, get_meal_plans, get_suggestions
+from theme import accent_color, warning_color
+from ui import fragment, load_lottie_url, st_lottie
+
+
+SLEEP_ISSUES = ["Difficulty falling asleep", "Waking up at night", "Not feeling rested", "Snoring"]
+
+
+def render():
+    st.title(f"🌿 Personalized Wellness Guide for {st.session_state.get('name', 'you')}")
+    
+    # Get user data
+    name = st.session_state.get("name", "friend")
+    mood_data = current_session().mood
+    risk = mood_data.risk
+    age = st.session_state.get("age", 30)
+    lifestyle = st.session_state.get("lifestyle", "Balanced")
+    
+    # Header with animation
+    anim = load_lottie_url(assets.LOTTIE_URLS["guide_header"])
+    if anim:
+        st_lottie(anim, height=120, key="guide_header")
+    
+    # Wellness Score Dashboard
+    components.show(components.dashboard_card(
+        risk, age, lifestyle,
+        mood_data.mood_color,
+        mood_data.mood_score
+    ))
+    
+    # Tab system for different wellness aspects
+    tab1, tab2, tab3, tab4 = st.tabs(["🌱 Daily Routine", "💤 Sleep", "🍎 Nutrition", "🧘 Mindfulness"])
+    
+    with tab1:
+        routine_tab()
+        habit_tracker()
+    
+    with tab2:
+        st.subheader("Sleep Optimization")
+        sleep_tab()
+    
+    with tab3:
+        nutrition_tab(name)
+        meal_planner()
+    
+    with tab4:
+        stress_assessment()
+        guided_meditation()
+    
+    # Progress tracking
+    components.show(components.suggestion_card("📊 Your Wellness Progress"))
+    
+    progress = get_history().progress(current_user())
+    improvement = progress["improvement"]
+    progress_cols = st.columns(3)
+    with progress_cols[0]:
+        st.metric(
+            "Current Streak",
+            f"{progress['streak']} days",
+            "1 day" if progress["checked_in_today"] else None
+        )
+    with progress_cols[1]:
+        st.metric("Weekly Goals", f"{progress['days_this_week']}/7 completed")
+    with progress_cols[2]:
+        st.metric(
+            "Improvement",
+            "—" if improvement is None else f"{improvement:+.0%}",
+            None if improvement is None else
+            f"{progress['score_this_week'] - progress['score_last_week']:+.2f} score from last week"
+        )
+    
+    # Navigation buttons
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔙 Back to Mood Check", use_container_width=True):
+            st.session_state.page = "📊 Mood Check"
+            st.rerun()
+    with col2:
+        if st.button("💌 Give Feedback", use_container_width=True):
+            st.session_state.page = "📝 Feedback"
+            st.rerun()
+
+
+def guide_suggestions(stress_level=None):
+    """Cached suggestions for this session's inputs."""
+    state = st.session_state
+    if stress_level is None:
+        stress_level = state.get("stress_level", 5)
+    key = suggestions.suggestion_key(
+        current_session().mood.risk,
+        state.get("gender"),
+        state.get("lifestyle", "Balanced"),
+        state.get("age", 30),
+        stress_level,
+    )
+    with metrics.span("suggestions"):
+        return get_suggestions().get(key)
+
+
+def routine_tab():
+    st.subheader("Personalized Daily Routine")
+    
+    # Time-based routine suggestions, sent as one element
+    components.show(
+        components.suggestion_card(
+            "⏰ Suggested Daily Schedule",
+            "Based on your risk level and lifestyle, here's an optimal daily routine:"
+        ),
+        components.routine(guide_suggestions()["routine"])
+    )
+
+
+@fragment
+def habit_tracker():
+    # Habit tracker; today's ticks are saved per user, one byte per day
+    components.show(components.suggestion_card(
+        "📊 Weekly Habit Tracker",
+        "Tick the wellness habits you kept today:"
+    ))
+    
+    import habits
+    
+    store = get_habits()
+    user = current_user()
+    today = date.today()
+    saved = store.day(user, today)
+    keys = [f"habit_{today}_{i}" for i in range(len(habits.HABITS))]
+    for i, key in enumerate(keys):
+        st.session_state.setdefault(key, bool(saved >> i & 1))
+    
+    cols = st.columns(3)
+    for i, habit in enumerate(habits.HABITS):
+        with cols[i%3]:
+            st.checkbox(habit, key=keys[i])
+    ticked = sum(st.session_state[key] << i for i, key in enumerate(keys))
+    if ticked != saved:
+        with metrics.span("habits.record"):
+            store.record(user, today, ticked)
+    
+    with metrics.span("habits.stats"):
+        masks = store.masks(user, habits.history_start(today), today + timedelta(days=1))
+        figures = habits.summary(masks)
+    cols = st.columns(2)
+    with cols[0]:
+        st.metric("Habit streak", f"{figures['streak']} days",
+                  help=f"Days in a row with at least {habits.DAY_GOAL} of the {len(habits.HABITS)} habits")
+    with cols[1]:
+        st.metric("This week", f"{figures['week']:.0%}", help="Share of habits done over the last 7 days")
+    st.dataframe(
+        [
+            {"Habit": habit, "Streak (days)": streak, "Last 30 days": f"{recent:.0%}",
+             "Last 90 days": f"{overall:.0%}"}
+            for habit, streak, recent, overall in zip(
+                habits.HABITS, figures["habit_streaks"], figures["adherence_30"], figures["adherence"])
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+@fragment
+def sleep_tab():
+    # Logging a night and the chart that shows it rerun together
+    sleep_assessment()
+    sleep_chart()
+
+
+def sleep_assessment():
+    # Sleep quality assessment; the form starts from the last night logged
+    user = current_user()
+    last = get_history().last_logged_night(user) or {}
+    defaults = {
+        "sleep_log_night": date.today(),
+        "sleep_log_quality": last.get("quality") or 3,
+        "sleep_log_hours": float(last.get("hours", current_session().mood.sleep_hours)),
+        "sleep_log_issues": [i for i in last.get("issues", []) if i in SLEEP_ISSUES],
+    }
+    for key, value in defaults.items():
+        st.session_state.setdefault(key, value)
+    
+    with st.expander("🔍 Assess Your Sleep Quality"):
+        with st.form("sleep_log"):
+            night = st.date_input("Night ending on", max_value=date.today(), key="sleep_log_night")
+            sleep_quality = st.slider("How would you rate your sleep quality?", 1, 5, key="sleep_log_quality")
+            sleep_duration = st.number_input("Hours of sleep:", min_value=0.0, max_value=14.0, step=0.5,
+                                             key="sleep_log_hours")
+            sleep_issues = st.multiselect("Do you experience any of these?", SLEEP_ISSUES,
+                                          key="sleep_log_issues")
+            submitted = st.form_submit_button("Save Night & Get Recommendations")
+        
+        if submitted:
+            with metrics.span("sleep.record"):
+                get_history().record_sleep(user, night, sleep_duration, sleep_quality, sleep_issues)
+            if sleep_quality <= 2 or sleep_duration < 6 or sleep_issues:
+                st.warning("Your sleep needs improvement. Try these:")
+                st.markdown("""
+                - Maintain consistent sleep schedule
+                - Avoid screens 1 hour before bed
+                - Keep bedroom cool and dark
+                - Limit caffeine after 2pm
+                - Try relaxation techniques before bed
+                """)
+            else:
+                st.success("Your sleep habits look good! Keep it up.")
+
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def sleep_stats(user, version, today):
+    """Rolling sleep statistics; ``version`` changes with every new entry."""
+    import sleep
+    
+    end = today + timedelta(days=1)
+    rows = get_history().sleep_nights(user, sleep.history_start(end), end)
+    return sleep.frame([dict(row) for row in rows], end)
+
+
+@metrics.timed("chart.sleep")
+def sleep_chart():
+    # Sleep tracker visualization
+    components.show(components.suggestion_card("📈 Your Sleep Patterns"))
+    
+    import altair as alt
+    
+    import sleep
+    
+    user = current_user()
+    stats = sleep_stats(user, get_history().sleep_version(user), date.today())
+    summary = sleep.summary(stats)
+    if not summary[max(sleep.WINDOWS)]["nights"]:
+        st.info("Log a night or complete a mood check to start tracking your sleep.")
+    
+    cols = st.columns(len(sleep.WINDOWS))
+    for col, (window, figures) in zip(cols, summary.items()):
+        with col:
+            logged = figures["nights"] > 0
+            st.metric(
+                f"{window}-night average",
+                f"{figures['mean']:.1f} h" if logged else "—",
+                f"±{figures['std']:.1f} h, {figures['consistency']:.0f}% consistent" if logged else None,
+                delta_color="off"
+            )
+    
+    period = st.radio("Show", sleep.WINDOWS, format_func=lambda w: f"{w} nights",
+                      horizontal=True, key="sleep_period")
+    chart_data = stats.iloc[-period:].reset_index()[["night", "hours", "mean_7"]]
+    bars = alt.Chart(chart_data).mark_bar().encode(
+        x=alt.X("night:T", title=None),
+        y=alt.Y("hours:Q", title="Hours"),
+        color=alt.condition(
+            alt.datum.hours >= sleep.TARGET_HOURS,
+            alt.value(accent_color),
+            alt.value(warning_color))
+    )
+    trend = alt.Chart(chart_data).mark_line(color=warning_color).encode(
+        x="night:T",
+        y=alt.Y("mean_7:Q", title="Hours"),
+    )
+    st.altair_chart((bars + trend).properties(width=600), use_container_width=True)
+
+
+def nutrition_tab(name):
+    st.subheader("Nutrition Guidance")
+    
+    # Personalized nutrition plan
+    components.show(components.suggestion_card(
+        f"🍽️ {escape(name)}'s Nutrition Plan",
+        "Based on your age, gender and activity level:",
+        guide_suggestions()["nutrition"]
+    ))
+
+
+@fragment
+def meal_planner():
+    # Meal planner: one editable grid, saved per user as the cells that changed
+    with st.expander("📅 Weekly Meal Planner"):
+        import pandas as pd
+        
+        store = get_meal_plans()
+        user = current_user()
+        library = meals.templates(st.session_state.get("gender"))
+        stored = store.plan(user)  # None until the first save
+        st.session_state.setdefault("meal_plan_version", 0)
+        
+        template = st.selectbox("Start from a template", list(library), key="meal_template")
+        if st.button("Use Template"):
+            with metrics.span("meals.save"):
+                changed = store.save(user, meals.diff(stored or {}, library[template]))
+            st.session_state.meal_plan_version += 1
+            st.success(f"{template} template applied ({changed} dishes changed).")
+            stored = store.plan(user)
+        
+        plan = next(iter(library.values())) if stored is None else stored
+        grid = pd.DataFrame(
+            [[plan.get((day, meal), "") for meal in meals.MEALS] for day in meals.DAYS],
+            index=pd.Index(meals.DAYS, name="Day"),
+            columns=meals.MEALS,
+        )
+        with st.form("meal_plan"):
+            edited = st.data_editor(
+                grid,
+                key=f"meal_plan_{st.session_state.meal_plan_version}",
+                num_rows="fixed",
+                use_container_width=True,
+            )
+            submitted = st.form_submit_button("Save Meal Plan")
+        
+        if submitted:
+            edited_plan = {
+                (day, meal): value.strip() if isinstance(value, str) else ""
+                for day, row in edited.iterrows()
+                for meal, value in row.items()
+            }
+            with metrics.span("meals.save"):
+                changed = store.save(user, meals.diff(stored or {}, edited_plan))
+            st.session_state.meal_plan_version += 1
+            st.success(f"Meal plan saved ({changed} dishes changed)!")
+
+
+@fragment
+def stress_assessment():
+    st.subheader("Mindfulness & Stress Management")
+    
+    # Stress assessment
+    components.show(components.suggestion_card("😌 Stress Level Assessment"))
+    
+    stress_level = st.slider("Rate your current stress level (1-10)", 1, 10, 5, key="stress_level")
+    
+    tips = guide_suggestions(stress_level)
+    if stress_level >= suggestions.HIGH_STRESS:
+        st.warning(tips["stress_headline"])
+    else:
+        st.success(tips["stress_headline"])
+    st.markdown("\n".join(f"- {tip}" for tip in tips["stress_tips"]))
+
+
+@fragment
+def guided_meditation():
+    # Guided meditation player
+    components.show(components.suggestion_card(
+        "🎧 Quick Meditation",
+        "Take a 3-minute break with this breathing exercise:"
+    ))
+    
+    meditation_type = st.radio(
+        "Choose meditation type:",
+        ["Box Breathing", "Body Scan", "Mindfulness", "Loving-Kindness"],
+        horizontal=True
+    )
+    
+    if st.button("Start Guided Meditation"):
+        st.audio("https://www.soundhelix.com/examples/mp3/SoundHelix-Song-1.mp3")  # Placeholder
+        
+        with st.expander("Meditation Instructions"):
+            if meditation_type == "Box Breathing":
+                st.write("""
+                1. Inhale for 4 seconds
+                2. Hold for 4 seconds
+                3. Exhale for 4 seconds
+                4. Hold for 4 seconds
+                5. Repeat for 3 minutes
+                """)
+            elif meditation_type == "Body Scan":
+                st.write("""
+                1. Focus on your toes, notice sensations
+                2. Slowly move attention up through your body
+                3. Notice areas of tension without judgment
+                4. Breathe into tense areas
+                """)